@@ -0,0 +1,302 @@
+# app/core/activity_events.py
+"""
+최근 활동 피드 (activity_events 컬렉션)
+
+/api/activity/* 는 board/comments/users를 매번 훑어 합치는 대신
+쓰기 시점에 만들어 둔 활동 문서를 (created_at, _id) 역순 범위 조회 한 번으로 읽습니다.
+
+- 게시글 작성(create_post), 회원가입 인증(verify_code)은 활동 문서를 하나씩 추가합니다.
+- 댓글 활동은 기존 /recent-comments와 같이 게시글마다 가장 최근 댓글 하나만 보여주므로
+  게시글별 문서 하나를 최신 댓글 내용으로 덮어씁니다.
+- 문서는 응답 형식(payload) 그대로 저장하고, created_at TTL 인덱스로 ACTIVITY_RETENTION이 지나면 삭제됩니다.
+- (type, source_id) 유니크 인덱스로 같은 원본이 중복 기록되지 않아 백필을 여러 번 실행해도 안전합니다.
+
+기존 데이터는 아래 명령으로 채웁니다.
+
+    python -m app.core.activity_events
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.core.etag import collection_versions
+from app.core.date_migration import created_since, to_utc_naive
+from app.core.loaders import post_loader
+from app.core.response_cache import activity_cache, cached_response
+from app.core.activity_stream import activity_stream
+from app.utils.pagination import encode_cursor, decode_cursor
+import asyncio
+import pytz
+
+# 서울 타임존 객체 생성
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# 활동 보관 기간 (기존 최근 30일 조회 범위와 동일, TTL 인덱스 기준)
+ACTIVITY_RETENTION = timedelta(days=30)
+
+# 댓글 미리보기 길이
+COMMENT_PREVIEW_LENGTH = 60
+
+SIGNUP_TITLE = "연구의숲에 가입했습니다"
+
+# 백필 시 한 번에 전송할 bulk_write 크기
+BACKFILL_BATCH_SIZE = 500
+
+# 댓글 활동에 필요한 게시글 필드
+EVENT_POST_PROJECTION = {"title": 1, "board": 1, "subcategory": 1, "prefix": 1}
+
+def _board_name(post: dict) -> str:
+    # 연구 카테고리는 세부 카테고리 이름을 사용
+    board_name = post.get("board", "일반")
+    if board_name == "연구" and post.get("subcategory"):
+        board_name = post.get("subcategory")
+    return board_name
+
+def _post_event(post: dict) -> dict:
+    return {
+        "type": "post",
+        "source_id": str(post["_id"]),
+        "created_at": post.get("created_at") or to_utc_naive(post.get("date")),
+        "payload": {
+            "type": "post",
+            "title": post.get("title", "제목 없음"),
+            "author": post.get("writer", "익명"),
+            "date": post.get("date"),
+            "board": _board_name(post),
+            "prefix": post.get("prefix", ""),
+            "post_id": str(post["_id"])
+        }
+    }
+
+def _comment_event(post: dict, comment: dict) -> dict:
+    content = (comment.get("content") or "").strip()
+    preview = content[:COMMENT_PREVIEW_LENGTH] + "..." if len(content) > COMMENT_PREVIEW_LENGTH else content
+    return {
+        "type": "comment",
+        "source_id": comment["post_id"],  # 게시글마다 최신 댓글 하나
+        "created_at": comment.get("created_at") or to_utc_naive(comment.get("date")),
+        "payload": {
+            "type": "comment",
+            "title": post.get("title", "제목 없음"),
+            "author": comment.get("writer", "익명"),
+            "date": comment.get("date"),
+            "board": _board_name(post),
+            "prefix": post.get("prefix", ""),
+            "post_id": comment["post_id"],
+            "comment_id": str(comment["_id"]),
+            "content": preview,
+            "parent_comment_id": comment.get("parent_comment_id")
+        }
+    }
+
+def _signup_event(user: dict) -> dict:
+    # users.created_at은 UTC naive로 저장되어 있음
+    created_at_seoul = user["created_at"].replace(tzinfo=pytz.UTC).astimezone(seoul_tz)
+    return {
+        "type": "signup",
+        "source_id": str(user["_id"]),
+        "created_at": user["created_at"],
+        "payload": {
+            "type": "signup",
+            "title": SIGNUP_TITLE,
+            "author": user.get("name", "익명"),
+            "date": created_at_seoul.isoformat(),
+            "role": user.get("role", "")
+        }
+    }
+
+def _event_filter(event: dict) -> dict:
+    # 더 최근 활동이 이미 기록되어 있으면 덮어쓰지 않음 (댓글 활동 동시 기록 대비)
+    return {"type": event["type"], "source_id": event["source_id"], "created_at": {"$lte": event["created_at"]}}
+
+def _upsert(event: dict) -> UpdateOne:
+    return UpdateOne(_event_filter(event), {"$set": event}, upsert=True)
+
+async def _write(db, event: dict):
+    try:
+        await db["activity_events"].update_one(_event_filter(event), {"$set": event}, upsert=True)
+    except DuplicateKeyError:
+        # 같은 원본의 더 최근 활동이 있음
+        return
+    collection_versions.bump("activity_events")
+    activity_stream.publish({"type": "activity", "activity": event["payload"]})
+
+async def record_post_created(db, post: dict):
+    await _write(db, _post_event(post))
+
+async def record_posts_created(db, posts: List[dict]):
+    """일괄 등록된 게시글 활동을 bulk_write로 한 번에 기록합니다."""
+    operations = [_upsert(_post_event(post)) for post in posts]
+    for start in range(0, len(operations), BACKFILL_BATCH_SIZE):
+        await db["activity_events"].bulk_write(operations[start:start + BACKFILL_BATCH_SIZE], ordered=False)
+    collection_versions.bump("activity_events")
+    # 일괄 등록은 활동이 많으므로 하나씩 보내지 않고 다시 받도록 알림
+    activity_stream.publish({"type": "resync"})
+
+async def record_comment_created(db, comment: dict, loaders=None):
+    """
+    댓글 활동을 기록합니다.
+    loaders(app.core.loaders.RequestLoaders)를 넘기면 같은 요청에서 이미 읽은 게시글을 다시 조회하지 않습니다.
+    """
+    if loaders is not None:
+        post = await loaders.posts.load(comment["post_id"])
+    else:
+        post = await post_loader(db, projection=EVENT_POST_PROJECTION).load(comment["post_id"])
+    if post:
+        await _write(db, _comment_event(post, comment))
+
+async def record_signup(db, user: dict):
+    if user.get("created_at"):
+        await _write(db, _signup_event(user))
+
+async def update_post_events(db, post: dict):
+    """게시글 제목/말머리/게시판이 바뀌면 게시글/댓글 활동에 반영합니다."""
+    result = await db["activity_events"].update_many(
+        {"type": {"$in": ["post", "comment"]}, "payload.post_id": str(post["_id"])},
+        {"$set": {
+            "payload.title": post.get("title", "제목 없음"),
+            "payload.board": _board_name(post),
+            "payload.prefix": post.get("prefix", "")
+        }}
+    )
+    if result.modified_count:
+        collection_versions.bump("activity_events")
+
+async def remove_post_events(db, post_id: str):
+    await db["activity_events"].delete_many({"payload.post_id": post_id})
+    collection_versions.bump("activity_events")
+    activity_stream.publish({"type": "activity_removed", "post_id": post_id})
+
+async def refresh_comment_event(db, post_id: str, deleted_comment_id: str):
+    """삭제된 댓글이 게시글의 최신 댓글 활동이면 남은 최신 댓글로 바꾸거나 지웁니다."""
+    event = await db["activity_events"].find_one({"type": "comment", "source_id": post_id})
+    if not event or event["payload"].get("comment_id") != deleted_comment_id:
+        return
+
+    latest = await db["comments"].find_one(
+        {"post_id": post_id, "created_at": {"$gte": datetime.utcnow() - ACTIVITY_RETENTION}},
+        sort=[("created_at", -1)]
+    )
+    await db["activity_events"].delete_one({"_id": event["_id"]})
+    collection_versions.bump("activity_events")
+    if latest:
+        await record_comment_created(db, latest)
+    else:
+        activity_stream.publish({"type": "activity_removed", "post_id": post_id, "activity_type": "comment"})
+
+async def fetch_events(db, event_type: Optional[str], cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    활동을 (created_at, _id) 내림차순으로 한 페이지 조회하고 다음 커서를 반환합니다.
+    event_type이 None이면 게시글/회원가입 활동을 함께 조회합니다. (/recent)
+    """
+    query = {
+        "type": event_type if event_type else {"$in": ["post", "signup"]},
+        "created_at": {"$gte": datetime.utcnow() - ACTIVITY_RETENTION}
+    }
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            last_created_at = datetime.fromisoformat(position["d"])
+            last_oid = ObjectId(position["id"])
+        except Exception:
+            raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+        query["$or"] = [
+            {"created_at": {"$lt": last_created_at}},
+            {"created_at": last_created_at, "_id": {"$lt": last_oid}}
+        ]
+
+    events = await db["activity_events"].find(
+        query,
+        projection={"payload": 1, "created_at": 1}
+    ).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor({"d": events[-1]["created_at"].isoformat(), "id": str(events[-1]["_id"])})
+
+    return [event["payload"] for event in events], next_cursor
+
+@cached_response(activity_cache, "activity_events", key_params=("event_type", "limit"))
+async def fetch_first_page(db, event_type: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """첫 페이지는 모든 방문자에게 같으므로 짧게 캐시합니다. (활동이 기록되면 즉시 무효화)"""
+    return await fetch_events(db, event_type, None, limit)
+
+async def backfill_activity_events(db) -> int:
+    """최근 ACTIVITY_RETENTION 기간의 게시글/댓글/회원가입으로 activity_events를 채웁니다."""
+    since = datetime.utcnow() - ACTIVITY_RETENTION
+    operations = []
+    written = 0
+
+    async def flush():
+        nonlocal operations, written
+        if operations:
+            try:
+                result = await db["activity_events"].bulk_write(operations, ordered=False)
+                written += result.upserted_count + result.modified_count
+            except BulkWriteError as e:
+                # 이미 더 최근 활동이 기록된 항목은 중복 키로 건너뜀
+                written += e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+            operations = []
+
+    posts = {}
+    async for post in db["board"].find({**created_since(since), "deleted": {"$ne": True}}):
+        posts[str(post["_id"])] = post
+        operations.append(_upsert(_post_event(post)))
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            await flush()
+
+    # 게시글별 최신 댓글 (댓글이 달린 게시글은 30일보다 오래되었을 수 있음)
+    latest_comments = db["comments"].aggregate([
+        {"$match": created_since(since)},
+        {"$sort": {"created_at": -1}},
+        {"$group": {"_id": "$post_id", "latest_comment": {"$first": "$$ROOT"}}},
+        {"$replaceRoot": {"newRoot": "$latest_comment"}}
+    ])
+    comments = await latest_comments.to_list(length=None)
+
+    # 위에서 읽지 않은 게시글은 $in 쿼리 한 번으로 조회
+    loader = post_loader(db, projection=EVENT_POST_PROJECTION)
+    missing_ids = [comment["post_id"] for comment in comments if comment["post_id"] not in posts]
+    for post_id, post in zip(missing_ids, await loader.load_many(missing_ids)):
+        posts[post_id] = post
+
+    for comment in comments:
+        post = posts.get(comment["post_id"])
+        if post is None:
+            continue
+        operations.append(_upsert(_comment_event(post, comment)))
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            await flush()
+
+    async for user in db["users"].find({"created_at": {"$gte": since}, "is_active": True}):
+        operations.append(_upsert(_signup_event(user)))
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            await flush()
+
+    await flush()
+    collection_versions.bump("activity_events")
+    return written
+
+async def backfill_if_empty(db=None):
+    """activity_events가 비어 있으면 (최초 배포 시) 백필합니다. 서버 시작 시 백그라운드로 실행됩니다."""
+    if db is None:
+        from app.core.database import db
+
+    try:
+        if await db["activity_events"].estimated_document_count() == 0:
+            written_count = await backfill_activity_events(db)
+            print(f"✅ 최근 활동 피드 백필: {written_count}개 활동")
+    except Exception as e:
+        print(f"❌ 최근 활동 피드 백필 오류: {e}")
+
+# 직접 실행 시 백필 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 최근 활동 피드 백필 시작...")
+    written_count = asyncio.run(backfill_activity_events(db))
+    print(f"✅ 최근 활동 피드 백필 완료: {written_count}개 활동")
@@ -0,0 +1,99 @@
+# app/core/activity_stream.py
+"""
+최근 활동 실시간 전송 (/ws/activity)
+
+activity_events에 활동이 기록되면 publish()가 메시지를 한 번만 JSON으로 직렬화해
+모든 구독자의 전송 큐에 넣습니다. 구독자마다 전송 작업이 큐를 비우므로
+느린 클라이언트가 쓰기 요청이나 다른 구독자를 막지 않습니다.
+큐가 ACTIVITY_STREAM_QUEUE_SIZE를 넘을 만큼 밀린 구독자는 연결을 끊습니다 (재연결 시 스냅샷을 다시 받음).
+
+메시지 형식
+- {"type": "snapshot", "recent": [...], "comments": [...]}    연결 직후 현재 목록
+- {"type": "activity", "activity": {...}}                      새 활동 (댓글 활동은 같은 post_id 항목을 대체)
+- {"type": "activity_removed", "post_id": "..."}              게시글 삭제로 사라진 활동 (해당 게시글의 모든 활동)
+- {"type": "activity_removed", "post_id": "...", "activity_type": "comment"}  게시글의 댓글 활동만 사라짐
+- {"type": "resync"}                                           일괄 등록 등으로 활동이 많이 바뀜 (다시 연결해 스냅샷을 받음)
+
+프로세스 메모리 기반이므로 다른 인스턴스에서 기록된 활동은 전달되지 않습니다. (단일 인스턴스 배포 전제)
+"""
+
+from typing import Awaitable, Callable, Dict
+from fastapi import WebSocket
+from app.core.config import settings
+import asyncio
+import json
+
+class _Subscriber:
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self.task = None
+
+class ActivityBroadcaster:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[WebSocket, _Subscriber] = {}
+
+        self.published_count = 0
+        self.dropped_count = 0
+
+    async def subscribe(self, websocket: WebSocket, load_snapshot: Callable[[], Awaitable[dict]]):
+        """
+        구독자로 먼저 등록한 뒤 스냅샷을 조회해 보내고, 그동안 쌓인 활동부터 이어서 전송합니다.
+        (스냅샷 조회 중 기록된 활동은 스냅샷과 겹칠 수 있지만 빠지지는 않습니다.)
+        """
+        subscriber = _Subscriber(websocket, self.queue_size)
+        self._subscribers[websocket] = subscriber
+        try:
+            snapshot = await load_snapshot()
+            await websocket.send_text(json.dumps(snapshot, ensure_ascii=False, default=str))
+        except Exception:
+            self.unsubscribe(websocket)
+            raise
+        if websocket in self._subscribers:
+            subscriber.task = asyncio.create_task(self._pump(subscriber))
+
+    def unsubscribe(self, websocket: WebSocket):
+        subscriber = self._subscribers.pop(websocket, None)
+        if subscriber and subscriber.task and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+
+    async def _pump(self, subscriber: _Subscriber):
+        try:
+            while True:
+                text = await subscriber.queue.get()
+                await subscriber.websocket.send_text(text)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # 연결이 끊어진 경우 제거
+            self.unsubscribe(subscriber.websocket)
+
+    def publish(self, message: dict):
+        """메시지를 한 번 직렬화해 모든 구독자 큐에 넣습니다. (대기하지 않음)"""
+        if not self._subscribers:
+            return
+        self.published_count += 1
+        text = json.dumps(message, ensure_ascii=False, default=str)
+        for websocket, subscriber in list(self._subscribers.items()):
+            try:
+                subscriber.queue.put_nowait(text)
+            except asyncio.QueueFull:
+                self.dropped_count += 1
+                self.unsubscribe(websocket)
+                asyncio.ensure_future(self._close_slow(websocket))
+
+    async def _close_slow(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=4008, reason="Too slow")
+        except Exception:
+            pass
+
+    def metrics(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published_count,
+            "dropped_slow_subscribers": self.dropped_count
+        }
+
+activity_stream = ActivityBroadcaster(queue_size=settings.ACTIVITY_STREAM_QUEUE_SIZE)
@@ -0,0 +1,383 @@
+# app/core/attachments.py
+"""
+게시글/댓글 첨부파일 저장소 (GridFS)
+
+첨부파일은 GridFS 버킷(attachments.files / attachments.chunks)에 청크 단위로 저장하고
+게시글/댓글 문서에는 첨부파일 ID 목록(attachments)만 보관합니다.
+- 업로드는 요청 본문(multipart/form-data)을 받는 대로 파싱해 바로 GridFS에 쓰므로
+  파일 전체를 메모리나 임시 파일에 올리지 않고, 크기 제한도 읽는 도중에 확인합니다.
+- 파일 metadata에 업로더(owner_id)와 연결된 게시글(post_id)을 기록합니다.
+  게시글이 삭제되면 cascade 작업이 post_id로 첨부파일을 함께 지웁니다.
+- 본문/댓글에 base64(data URI)로 들어온 이미지는 저장 시 첨부파일로 옮기고 다운로드 URL로 바꿉니다.
+
+기존 문서에 인라인으로 저장된 이미지는 아래 명령으로 옮깁니다.
+
+    python -m app.core.attachments
+"""
+
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from app.core.config import settings
+import asyncio
+import base64
+import binascii
+import re
+
+BUCKET_NAME = "attachments"
+
+# 다운로드 URL (게시글 본문의 인라인 이미지를 이 URL로 바꿉니다)
+ATTACHMENT_URL = "/api/attachments/{id}"
+
+_DATA_URI_RE = re.compile(r"data:([\w.+-]+/[\w.+-]+);base64,([A-Za-z0-9+/=]+)")
+_ATTACHMENT_URL_RE = re.compile(re.escape(ATTACHMENT_URL).replace(re.escape("{id}"), r"([0-9a-f]{24})"))
+
+# 인라인 이미지 이전 시 한 번에 처리할 문서 수
+MIGRATION_BATCH_SIZE = 100
+
+# multipart 경계/헤더 등 파일 내용 외에 허용할 요청 본문 크기
+MULTIPART_OVERHEAD = 64 * 1024
+
+def get_bucket(db) -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(db, bucket_name=BUCKET_NAME)
+
+def _attachment_oid(attachment_id: str) -> Optional[ObjectId]:
+    try:
+        return ObjectId(attachment_id)
+    except Exception:
+        return None
+
+def attachment_info(file_doc: dict) -> dict:
+    """attachments.files 문서 -> API 응답 형식"""
+    attachment_id = str(file_doc["_id"])
+    metadata = file_doc.get("metadata") or {}
+    return {
+        "id": attachment_id,
+        "filename": file_doc.get("filename"),
+        "content_type": metadata.get("content_type"),
+        "length": file_doc.get("length"),
+        "url": ATTACHMENT_URL.format(id=attachment_id)
+    }
+
+async def store_stream(db, chunks, filename: str, content_type: str, owner_id: str, post_id: Optional[str] = None) -> dict:
+    """
+    비동기 청크 이터레이터를 GridFS에 저장하고 첨부파일 정보를 반환합니다.
+    ATTACHMENT_MAX_BYTES를 넘으면 저장 중인 파일을 지우고 413을 발생시킵니다.
+    """
+    grid_in = get_bucket(db).open_upload_stream(
+        filename,
+        metadata={"content_type": content_type, "owner_id": owner_id, "post_id": post_id}
+    )
+    length = 0
+    try:
+        async for chunk in chunks:
+            length += len(chunk)
+            if length > settings.ATTACHMENT_MAX_BYTES:
+                raise _too_large()
+            await grid_in.write(chunk)
+        await grid_in.close()
+    except BaseException:
+        await grid_in.abort()
+        raise
+
+    return {
+        "id": str(grid_in._id),
+        "filename": filename,
+        "content_type": content_type,
+        "length": length,
+        "url": ATTACHMENT_URL.format(id=str(grid_in._id))
+    }
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"첨부파일은 최대 {settings.ATTACHMENT_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+    )
+
+async def _multipart_events(body, boundary: bytes, max_bytes: int):
+    """
+    요청 본문 청크를 multipart 이벤트로 바꿉니다.
+    ("headers", 파트 헤더) / ("data", 파트 내용 조각) / ("end", None) 순서로 내보내며
+    본문이 max_bytes를 넘으면 더 읽지 않고 413을 발생시킵니다.
+    """
+    events = []
+    headers = {}
+    header_field = bytearray()
+    header_value = bytearray()
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    parser = MultipartParser(boundary, callbacks={
+        "on_part_begin": headers.clear,
+        "on_header_field": lambda data, start, end: header_field.extend(data[start:end]),
+        "on_header_value": lambda data, start, end: header_value.extend(data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": lambda: events.append(("headers", dict(headers))),
+        "on_part_data": lambda data, start, end: events.append(("data", bytes(data[start:end]))),
+        "on_part_end": lambda: events.append(("end", None))
+    })
+
+    received = 0
+    try:
+        async for chunk in body:
+            received += len(chunk)
+            if received > max_bytes:
+                raise _too_large()
+            parser.write(chunk)
+            while events:
+                yield events.pop(0)
+        parser.finalize()
+    except MultipartParseError:
+        raise HTTPException(status_code=400, detail="multipart 요청 본문을 해석할 수 없습니다.")
+    while events:
+        yield events.pop(0)
+
+async def store_multipart(db, body, content_type_header: Optional[str], owner_id: str) -> dict:
+    """
+    multipart/form-data 요청 본문 스트림(body)에서 file 필드를 찾아 받는 대로 GridFS에 저장합니다.
+    file 필드 앞뒤의 다른 필드는 읽고 버리며, 본문 전체가
+    ATTACHMENT_MAX_BYTES + MULTIPART_OVERHEAD를 넘으면 읽는 도중에 413을 발생시킵니다.
+    """
+    mime_type, options = parse_options_header(content_type_header or "")
+    boundary = options.get(b"boundary")
+    if mime_type.strip().lower() != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="multipart/form-data 형식으로 업로드해야 합니다.")
+
+    events = _multipart_events(body, boundary, settings.ATTACHMENT_MAX_BYTES + MULTIPART_OVERHEAD)
+
+    async def part_data():
+        async for kind, value in events:
+            if kind == "end":
+                return
+            yield value
+
+    try:
+        async for kind, value in events:
+            if kind != "headers":
+                continue
+            _, disposition = parse_options_header(value.get(b"content-disposition", b""))
+            if disposition.get(b"name") != b"file" or b"filename" not in disposition:
+                # 파일이 아닌 필드는 내용을 버림
+                async for _ in part_data():
+                    pass
+                continue
+            return await store_stream(
+                db,
+                part_data(),
+                disposition[b"filename"].decode("utf-8", "replace") or "attachment",
+                value.get(b"content-type", b"application/octet-stream").decode("latin-1"),
+                owner_id
+            )
+    finally:
+        await events.aclose()
+    raise HTTPException(status_code=400, detail="업로드할 파일(file)이 필요합니다.")
+
+async def _store_bytes(db, data: bytes, filename: str, content_type: str, owner_id: str, post_id: Optional[str]) -> dict:
+    async def single_chunk():
+        yield data
+    return await store_stream(db, single_chunk(), filename, content_type, owner_id, post_id)
+
+async def get_file(db, attachment_id: str) -> Optional[dict]:
+    oid = _attachment_oid(attachment_id)
+    if oid is None:
+        return None
+    return await db[f"{BUCKET_NAME}.files"].find_one({"_id": oid})
+
+async def claim_attachments(db, attachment_ids, owner_id: str, post_id: str) -> List[str]:
+    """
+    업로드한 첨부파일을 게시글에 연결하고 정규화된 ID 목록을 반환합니다.
+    본인이 올린 파일이 아니거나 다른 게시글에 이미 연결된 파일이 있으면 400을 발생시킵니다.
+    """
+    if not attachment_ids:
+        return []
+    if not isinstance(attachment_ids, list):
+        raise HTTPException(status_code=400, detail="attachments는 첨부파일 ID 목록이어야 합니다.")
+
+    oids = []
+    for attachment_id in attachment_ids:
+        oid = _attachment_oid(attachment_id)
+        if oid is None:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 첨부파일 ID입니다: {attachment_id}")
+        if oid not in oids:
+            oids.append(oid)
+
+    query = {
+        "_id": {"$in": oids},
+        "metadata.owner_id": owner_id,
+        "metadata.post_id": {"$in": [None, post_id]}
+    }
+    if await db[f"{BUCKET_NAME}.files"].count_documents(query) != len(oids):
+        raise HTTPException(status_code=400, detail="사용할 수 없는 첨부파일이 포함되어 있습니다.")
+
+    await db[f"{BUCKET_NAME}.files"].update_many(query, {"$set": {"metadata.post_id": post_id}})
+    return [str(oid) for oid in oids]
+
+async def release_attachments(db, attachment_ids, post_id: str):
+    """claim_attachments로 post_id에 연결한 첨부파일의 연결을 해제합니다. (게시글 저장 실패 시)"""
+    oids = [oid for oid in (_attachment_oid(attachment_id) for attachment_id in attachment_ids or []) if oid is not None]
+    if oids:
+        await db[f"{BUCKET_NAME}.files"].update_many(
+            {"_id": {"$in": oids}, "metadata.post_id": post_id},
+            {"$set": {"metadata.post_id": None}}
+        )
+
+async def delete_attachments(db, attachment_ids) -> int:
+    bucket = get_bucket(db)
+    deleted = 0
+    for attachment_id in attachment_ids or []:
+        oid = _attachment_oid(attachment_id)
+        if oid is None:
+            continue
+        try:
+            await bucket.delete(oid)
+            deleted += 1
+        except Exception:
+            pass
+    return deleted
+
+async def delete_post_attachments(db, post_id: str, limit: int) -> int:
+    """게시글(및 댓글)에 연결된 첨부파일을 최대 limit개 삭제합니다. (cascade 작업용)"""
+    files = await db[f"{BUCKET_NAME}.files"].find(
+        {"metadata.post_id": post_id},
+        projection={"_id": 1}
+    ).limit(limit).to_list(limit)
+    return await delete_attachments(db, [str(doc["_id"]) for doc in files])
+
+async def externalize_inline_images(db, text: str, owner_id: str, post_id: str) -> Tuple[str, List[str]]:
+    """
+    본문에 들어 있는 base64 data URI를 첨부파일로 저장하고 다운로드 URL로 바꿉니다.
+    (바뀐 본문, 새 첨부파일 ID 목록)을 반환합니다.
+    """
+    if not text or "data:" not in text:
+        return text, []
+
+    attachment_ids = []
+    parts = []
+    last_end = 0
+    for match in _DATA_URI_RE.finditer(text):
+        try:
+            data = base64.b64decode(match.group(2), validate=True)
+        except (binascii.Error, ValueError):
+            continue
+        content_type = match.group(1)
+        extension = content_type.split("/")[-1]
+        info = await _store_bytes(db, data, f"inline.{extension}", content_type, owner_id, post_id)
+        attachment_ids.append(info["id"])
+        parts.append(text[last_end:match.start()])
+        parts.append(info["url"])
+        last_end = match.end()
+
+    parts.append(text[last_end:])
+    return "".join(parts), attachment_ids
+
+def referenced_attachment_ids(text: Optional[str]) -> set:
+    """본문에 다운로드 URL로 들어 있는 첨부파일 ID 집합 (본문으로 옮긴 인라인 이미지 포함)"""
+    if not text:
+        return set()
+    return set(_ATTACHMENT_URL_RE.findall(text))
+
+async def externalize_comment_image(db, comment: dict, owner_id: str, post_id: str) -> List[str]:
+    """댓글의 image 필드가 data URI이면 첨부파일로 옮기고 image 필드를 제거합니다."""
+    image = comment.get("image")
+    if not isinstance(image, str) or not image.startswith("data:"):
+        return []
+    _, attachment_ids = await externalize_inline_images(db, image, owner_id, post_id)
+    if attachment_ids:
+        del comment["image"]
+    return attachment_ids
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더(bytes=start-end, bytes=start-, bytes=-suffix)를 (start, end) 포함 구간으로 변환합니다.
+    헤더가 없거나 여러 구간을 요청하면 None(전체 응답), 만족할 수 없는 구간이면 ValueError를 발생시킵니다.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise ValueError("empty suffix range")
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+            end = min(end, size - 1)
+    except ValueError:
+        raise ValueError("invalid range")
+
+    if start < 0 or start > end or start >= size:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+async def open_range(db, file_id: ObjectId, start: int, end: int):
+    """start~end(포함) 구간을 ATTACHMENT_READ_CHUNK 단위로 읽는 비동기 이터레이터"""
+    grid_out = await get_bucket(db).open_download_stream(file_id)
+    grid_out.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = await grid_out.read(min(settings.ATTACHMENT_READ_CHUNK, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+async def _scan_batches(collection, query: dict, projection: dict):
+    """query에 맞는 문서를 _id 순서로 MIGRATION_BATCH_SIZE개씩 돌려줍니다. (변환할 수 없는 문서를 다시 읽지 않음)"""
+    last_id = None
+    while True:
+        batch_query = dict(query)
+        if last_id is not None:
+            batch_query["_id"] = {"$gt": last_id}
+        docs = await collection.find(batch_query, projection=projection).sort("_id", 1).limit(MIGRATION_BATCH_SIZE).to_list(MIGRATION_BATCH_SIZE)
+        if not docs:
+            return
+        last_id = docs[-1]["_id"]
+        yield docs
+
+async def migrate_inline_images(db) -> dict:
+    """기존 게시글 본문/댓글 image의 인라인 이미지를 첨부파일로 옮깁니다."""
+    migrated = {"posts": 0, "comments": 0}
+
+    post_query = {"content": {"$regex": "data:[^;]+;base64,"}}
+    async for posts in _scan_batches(db["board"], post_query, {"content": 1, "writer_id": 1}):
+        for post in posts:
+            post_id = str(post["_id"])
+            content, attachment_ids = await externalize_inline_images(db, post["content"], post.get("writer_id"), post_id)
+            if not attachment_ids:
+                continue
+            await db["board"].update_one(
+                {"_id": post["_id"]},
+                {"$set": {"content": content}, "$addToSet": {"attachments": {"$each": attachment_ids}}}
+            )
+            migrated["posts"] += 1
+
+    comment_query = {"image": {"$regex": "^data:"}}
+    async for comments in _scan_batches(db["comments"], comment_query, {"image": 1, "writer_id": 1, "post_id": 1}):
+        for comment in comments:
+            attachment_ids = await externalize_comment_image(db, comment, comment.get("writer_id"), comment.get("post_id"))
+            if not attachment_ids:
+                continue
+            await db["comments"].update_one(
+                {"_id": comment["_id"]},
+                {"$unset": {"image": ""}, "$addToSet": {"attachments": {"$each": attachment_ids}}}
+            )
+            migrated["comments"] += 1
+
+    return migrated
+
+# 직접 실행 시 인라인 이미지 이전 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 인라인 이미지 -> 첨부파일 이전 시작...")
+    migrated_counts = asyncio.run(migrate_inline_images(db))
+    print(f"✅ 인라인 이미지 이전 완료: {migrated_counts}")
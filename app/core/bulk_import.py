@@ -0,0 +1,234 @@
+# app/core/bulk_import.py
+"""
+게시글 일괄 등록 (기존 게시판 이전용)
+
+create_post는 게시글마다 카운터 증가 + insert_one + 재조회를 하므로 수만 건을 옮기기에 느립니다.
+일괄 등록은
+- 게시판(카운터 키)별로 $inc: N 한 번으로 연속된 post_number 구간을 예약하고
+- ordered insert_many 배치로 저장하며
+- 저장한 문서를 다시 읽지 않고 항목별 결과(id, post_number 또는 error)를 반환합니다.
+본문의 인라인 이미지(data URI)와 attachments는 create_post와 같이 첨부파일로 저장/연결하며,
+저장되지 않은 항목의 첨부파일은 연결을 해제하고 인라인 이미지는 삭제합니다.
+기존 게시판에서 옮기는 항목이므로 writer/date가 있으면 그대로 보존합니다. (writer_id는 등록한 사용자,
+시간대가 없는 date는 서울 시간) 그래서 API는 BULK_IMPORT_USER_IDS에 등록된 사용자만 호출할 수 있습니다.
+
+배치 중 하나가 실패하면 (ordered이므로) 그 지점에서 멈추고 나머지 항목은 skipped로 보고합니다.
+예약했지만 사용하지 못한 post_number는 비어 있는 번호로 남습니다.
+"""
+
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.core.comment_counters import initial_counter_fields
+from app.core.search import index_posts
+from app.core.activity_events import record_posts_created
+from app.core.attachments import claim_attachments, delete_post_attachments, externalize_inline_images, release_attachments
+from app.core.date_migration import to_utc_naive
+from bson import ObjectId
+from fastapi import HTTPException
+from app.utils.text import make_excerpt
+import pytz
+
+# 서울 타임존 객체 생성
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+RESEARCH_CATEGORIES = ["연구자료", "제출자료", "제안서"]
+
+def prepare_post(post: dict, user: dict, now: datetime, keep_original: bool = False) -> str:
+    """
+    새 게시글 문서에 작성자/시간/기본 필드를 채우고 post_number 카운터 키를 반환합니다.
+    keep_original이 True이면 (일괄 등록) 항목에 있는 writer/date를 그대로 사용합니다.
+    필수 필드가 없으면 ValueError를 발생시킵니다.
+    """
+    if "board" not in post:
+        raise ValueError("게시판 유형(board)이 필요합니다.")
+    if "title" not in post or "content" not in post:
+        raise ValueError("제목과 내용은 필수입니다.")
+
+    original_date = post.get("date") if keep_original else None
+    if original_date is not None:
+        try:
+            created_at = datetime.fromisoformat(original_date)
+        except (TypeError, ValueError):
+            raise ValueError("date는 ISO 8601 형식의 문자열이어야 합니다.")
+        if created_at.tzinfo is None:
+            # 시간대가 없는 날짜는 기존 게시판과 같은 서울 시간으로 해석
+            created_at = seoul_tz.localize(created_at)
+        post["date"] = created_at.isoformat()
+        post["created_at"] = to_utc_naive(created_at)
+    else:
+        post["date"] = now.isoformat()  # 응답 호환용 문자열
+        post["created_at"] = now  # 조회/정렬용 BSON datetime
+
+    if not (keep_original and post.get("writer")):
+        post["writer"] = user["name"]
+    post["writer_id"] = user["id"]
+    post["views"] = 0
+    post["likes"] = 0
+    post["prefix"] = post.get("prefix", "")
+    post["excerpt"] = make_excerpt(post["content"])
+    post.update(initial_counter_fields())
+
+    if post["board"] in RESEARCH_CATEGORIES:
+        post["subcategory"] = post["board"]
+        post["board"] = "연구"
+
+    if post["board"] == "연구":
+        return f"{post['subcategory']}_post_number"
+    return f"{post['board']}_post_number"
+
+async def reserve_post_numbers(db, counter_key: str, count: int) -> int:
+    """카운터를 count만큼 한 번에 올리고 예약된 구간의 첫 번호를 반환합니다."""
+    counter = await db["counters"].find_one_and_update(
+        {"_id": counter_key},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"] - count + 1
+
+async def _attach_files(db, post: dict, user: dict) -> List[str]:
+    """
+    첨부파일 연결/인라인 이미지 이전이 필요한 항목만 _id를 미리 정해 처리합니다.
+    연결한(업로드된) 첨부파일 ID 목록을 반환합니다.
+    """
+    if not post.get("attachments") and "data:" not in post["content"]:
+        post["attachments"] = []
+        return []
+    post["_id"] = ObjectId()
+    post_id = str(post["_id"])
+    attachment_ids = await claim_attachments(db, post.get("attachments"), user["id"], post_id)
+    try:
+        post["content"], inline_ids = await externalize_inline_images(db, post["content"], user["id"], post_id)
+    except BaseException:
+        await _discard_files(db, post, attachment_ids)
+        raise
+    post["attachments"] = attachment_ids + inline_ids
+    return attachment_ids
+
+async def _discard_files(db, post: dict, claimed_ids: List[str]):
+    """
+    저장되지 않은 게시글의 첨부파일을 정리합니다.
+    업로드된 첨부파일은 연결만 해제하고(다시 사용할 수 있음), 본문에서 옮긴 인라인 이미지는 삭제합니다.
+    """
+    if "_id" not in post:
+        return
+    post_id = str(post["_id"])
+    await release_attachments(db, claimed_ids, post_id)
+    # 이 post_id로 남은 파일은 인라인 이미지뿐 (게시글이 저장되지 않았으므로)
+    while await delete_post_attachments(db, post_id, 100):
+        pass
+
+def parse_import_body(body: bytes, content_type: Optional[str]) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """
+    JSON 배열 또는 NDJSON 본문을 (항목, 오류) 목록으로 변환합니다.
+    NDJSON은 줄 단위로 해석하므로 잘못된 줄은 그 항목만 오류가 됩니다.
+    """
+    text = body.decode("utf-8-sig")
+    is_ndjson = "ndjson" in (content_type or "") or not text.lstrip().startswith("[")
+
+    if is_ndjson:
+        raw_items = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw_items.append(json.loads(line))
+            except ValueError:
+                raw_items.append(ValueError("JSON 형식이 올바르지 않습니다."))
+    else:
+        raw_items = json.loads(text)
+
+    items = []
+    for raw in raw_items:
+        if isinstance(raw, ValueError):
+            items.append((None, str(raw)))
+        elif not isinstance(raw, dict):
+            items.append((None, "각 항목은 JSON 객체여야 합니다."))
+        else:
+            items.append((raw, None))
+    return items
+
+async def import_posts(db, items: List[Tuple[Optional[dict], Optional[str]]], user: dict) -> dict:
+    """
+    parse_import_body 결과를 게시글로 저장하고 입력 순서대로 항목별 결과를 반환합니다.
+    결과 항목은 {"index", "status": "created"|"error"|"skipped", "id"?, "post_number"?, "error"?} 입니다.
+    """
+    results = [{"index": i} for i in range(len(items))]
+    now = datetime.now(seoul_tz)
+
+    # 1) 검증 + 카운터 키별로 묶기
+    prepared = []  # (index, post)
+    by_counter = {}
+    claimed = {}  # index -> 연결한 첨부파일 ID (저장 실패 시 정리용)
+    for i, (post, error) in enumerate(items):
+        if error is None:
+            try:
+                counter_key = prepare_post(post, user, now, keep_original=True)
+                claimed[i] = await _attach_files(db, post, user)
+            except (ValueError, KeyError, TypeError) as e:
+                error = str(e)
+            except HTTPException as e:
+                error = e.detail
+        if error is not None:
+            results[i].update({"status": "error", "error": error})
+            continue
+        prepared.append((i, post))
+        by_counter.setdefault(counter_key, []).append(post)
+
+    # 2) 카운터 키마다 post_number 구간 한 번에 예약
+    for counter_key, posts in by_counter.items():
+        first_number = await reserve_post_numbers(db, counter_key, len(posts))
+        for offset, post in enumerate(posts):
+            post["post_number"] = first_number + offset
+
+    # 3) ordered insert_many 배치 (insert_many가 각 문서에 _id를 채움)
+    inserted_posts = []
+    unsaved = []  # 저장되지 않은 항목 (첨부파일 정리용)
+    batch_size = settings.BULK_IMPORT_BATCH_SIZE
+    stopped = False
+    for start in range(0, len(prepared), batch_size):
+        batch = prepared[start:start + batch_size]
+        if stopped:
+            for i, post in batch:
+                results[i].update({"status": "skipped", "error": "앞선 항목 저장 실패로 중단되었습니다."})
+                unsaved.append((i, post))
+            continue
+
+        inserted_count = len(batch)
+        failed_error = None
+        try:
+            await db["board"].insert_many([post for _, post in batch], ordered=True)
+        except BulkWriteError as e:
+            inserted_count = e.details.get("nInserted", 0)
+            write_errors = e.details.get("writeErrors") or [{}]
+            failed_error = write_errors[0].get("errmsg", "저장 실패")
+            stopped = True
+
+        for position, (i, post) in enumerate(batch):
+            if position < inserted_count:
+                results[i].update({"status": "created", "id": str(post["_id"]), "post_number": post["post_number"]})
+                inserted_posts.append(post)
+            elif position == inserted_count:
+                results[i].update({"status": "error", "error": failed_error})
+                unsaved.append((i, post))
+            else:
+                results[i].update({"status": "skipped", "error": "앞선 항목 저장 실패로 중단되었습니다."})
+                unsaved.append((i, post))
+
+    for i, post in unsaved:
+        await _discard_files(db, post, claimed.get(i, []))
+
+    if inserted_posts:
+        await index_posts(db, inserted_posts)
+        await record_posts_created(db, inserted_posts)
+
+    created = len(inserted_posts)
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
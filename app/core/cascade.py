@@ -0,0 +1,179 @@
+# app/core/cascade.py
+"""
+게시글 삭제 cascade 작업
+
+DELETE /api/board/{post_id} 는 cascade_jobs 컬렉션에 작업을 등록하고
+게시글을 deleted=True로 표시(즉시 숨김)한 뒤 바로 응답합니다.
+cascade_worker가 백그라운드에서 댓글/좋아요/첨부파일을 CASCADE_BATCH_SIZE 단위로 지우고
+마지막으로 게시글 문서를 삭제합니다.
+
+작업 상태는 DB에 있으므로 서버가 중간에 죽어도 재시작 후 이어서 처리합니다.
+(삭제는 멱등이므로 같은 배치를 다시 실행해도 안전합니다.)
+"""
+
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.core.search import remove_post
+from app.core.activity_events import remove_post_events
+from app.core.attachments import BUCKET_NAME, delete_post_attachments
+import asyncio
+
+# 숨김 처리된 게시글을 제외하는 조건 (게시글 조회 쿼리에 합쳐서 사용)
+NOT_DELETED = {"deleted": {"$ne": True}}
+
+# 작업을 가져간 워커가 응답이 없을 때 다른 워커가 이어받기까지의 시간
+JOB_LEASE = timedelta(seconds=60)
+
+# 게시글에 딸린 데이터 컬렉션 -> 응답/상태에 사용할 이름
+DEPENDENT_COLLECTIONS = {
+    "comments": "comments",
+    "post_likes": "likes",
+    BUCKET_NAME: "attachments"
+}
+
+async def enqueue_post_deletion(db, post_oid: ObjectId, post_id: str) -> str:
+    """
+    cascade 작업을 등록한 뒤 게시글을 숨깁니다. 작업 ID를 반환합니다.
+    작업을 먼저 (post_id 기준 upsert로) 기록하므로 중간에 실패해도 숨김 처리된 게시글에는 항상 작업이 있고,
+    같은 게시글을 다시 삭제해도 작업은 하나만 남습니다.
+    """
+    now = datetime.utcnow()
+    job = await db["cascade_jobs"].find_one_and_update(
+        {"type": "delete_post", "post_id": post_id},
+        {"$setOnInsert": {
+            "status": "pending",
+            "deleted_counts": {name: 0 for name in DEPENDENT_COLLECTIONS.values()},
+            "created_at": now,
+            "updated_at": now,
+            "lease_until": None
+        }},
+        upsert=True,
+        projection={"_id": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    await db["board"].update_one(
+        {"_id": post_oid},
+        {"$set": {"deleted": True, "deleted_at": now}}
+    )
+    await remove_post(db, post_oid)
+    await remove_post_events(db, post_id)
+    cascade_worker.notify()
+    return str(job["_id"])
+
+async def get_job(db, job_id: str):
+    try:
+        oid = ObjectId(job_id)
+    except Exception:
+        return None
+    job = await db["cascade_jobs"].find_one({"_id": oid})
+    if job:
+        job["id"] = str(job["_id"])
+        del job["_id"]
+    return job
+
+class CascadeWorker:
+    def __init__(self, batch_size: int, poll_interval_sec: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval_sec
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = None
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def _claim_job(self, db):
+        now = datetime.utcnow()
+        return await db["cascade_jobs"].find_one_and_update(
+            {
+                "status": {"$in": ["pending", "running"]},
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]
+            },
+            {"$set": {"status": "running", "lease_until": now + JOB_LEASE, "updated_at": now}},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _delete_batch(self, db, collection_name: str, post_id: str) -> int:
+        if collection_name == BUCKET_NAME:
+            # GridFS 파일은 chunks까지 함께 지워야 하므로 버킷을 통해 삭제
+            return await delete_post_attachments(db, post_id, self.batch_size)
+        ids = await db[collection_name].find(
+            {"post_id": post_id},
+            projection={"_id": 1}
+        ).limit(self.batch_size).to_list(self.batch_size)
+        if not ids:
+            return 0
+        result = await db[collection_name].delete_many({"_id": {"$in": [doc["_id"] for doc in ids]}})
+        return result.deleted_count
+
+    async def run_job(self, db, job: dict):
+        post_id = job["post_id"]
+
+        for collection_name, count_name in DEPENDENT_COLLECTIONS.items():
+            while not self._stopping:
+                deleted = await self._delete_batch(db, collection_name, post_id)
+                if not deleted:
+                    break
+                now = datetime.utcnow()
+                await db["cascade_jobs"].update_one(
+                    {"_id": job["_id"]},
+                    {
+                        "$inc": {f"deleted_counts.{count_name}": deleted},
+                        "$set": {"lease_until": now + JOB_LEASE, "updated_at": now}
+                    }
+                )
+            if self._stopping:
+                # 남은 작업은 재시작 후 이어서 처리
+                await db["cascade_jobs"].update_one({"_id": job["_id"]}, {"$set": {"lease_until": None}})
+                return
+
+        try:
+            await db["board"].delete_one({"_id": ObjectId(post_id), "deleted": True})
+        except Exception:
+            pass
+
+        job = await db["cascade_jobs"].find_one_and_update(
+            {"_id": job["_id"]},
+            {"$set": {"status": "done", "lease_until": None, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        counts = job["deleted_counts"]
+        print(f"게시글 삭제 완료 - post_id: {post_id}, 댓글: {counts['comments']}개, 좋아요: {counts['likes']}개")
+
+    async def _run(self):
+        from app.core.database import db
+
+        while not self._stopping:
+            try:
+                job = await self._claim_job(db)
+                if job:
+                    await self.run_job(db, job)
+                    continue
+            except Exception as e:
+                print(f"❌ 게시글 삭제 작업 오류: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+cascade_worker = CascadeWorker(
+    batch_size=settings.CASCADE_BATCH_SIZE,
+    poll_interval_sec=settings.CASCADE_POLL_INTERVAL_SEC
+)
@@ -0,0 +1,257 @@
+# app/core/chat_archive.py
+"""
+오래된 채팅 메시지 압축 보관 (cold tier)
+
+CHAT_ARCHIVE_AFTER_DAYS보다 오래된 메시지를 채팅방별로 CHAT_ARCHIVE_BUCKET_SIZE개씩 묶어
+chat_archive 버킷 문서 하나에 zlib으로 압축해 저장하고 chat_messages에서 삭제합니다.
+메시지 문서 수백 개와 그 인덱스 항목(메시지당 3개)이 버킷 문서 하나와 인덱스 항목 3개로 줄어듭니다.
+
+버킷 문서
+    {room_id, count, codec: "zlib",
+     first_created_at, first_id, last_created_at, last_id,   # 버킷에 담긴 메시지의 (created_at, _id) 범위
+     data: zlib(BSON {"messages": [...room_id를 뺀 메시지...]})}
+
+채팅방마다 가장 오래된 메시지부터 순서대로 보관하므로 보관된 메시지는 항상 남아 있는 메시지보다 오래되었습니다.
+app.core.chat_history는 이 순서를 이용해 두 영역을 이어서 읽습니다. (커서 형식은 동일)
+읽음 처리(보관된 메시지 ID로도 가능)와 읽지 않은 수 재계산(app.core.chat_unread)도 보관 영역을 함께 봅니다.
+버킷은 가득 찬 경우에만 만들며, 모자란 나머지는 다음 실행 때까지 chat_messages에 남습니다.
+
+작업은 여러 번 실행해도 안전하고, 중단되면 이어서 처리합니다.
+- 버킷은 (room_id, first_id) 고유 인덱스로 한 번만 저장됩니다.
+- 채팅방을 처리하기 전에 마지막 버킷 범위 이하의 메시지(버킷 저장 후 삭제 전에 중단된 경우)를 먼저 삭제합니다.
+
+    python -m app.core.chat_archive
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson import Binary, ObjectId, decode, encode
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.core.date_migration import to_utc_naive
+import asyncio
+import zlib
+
+ARCHIVE_COLLECTION = "chat_archive"
+CODEC = "zlib"
+COMPRESSION_LEVEL = 6
+
+# 커서 메시지 ID의 생성 시각과 created_at의 최대 차이 (둘 다 전송 시점에 정해짐)
+ANCHOR_TIME_SLACK = timedelta(seconds=5)
+
+def message_sort_key(message: dict) -> Tuple[datetime, ObjectId]:
+    return to_utc_naive(message["created_at"]), message["_id"]
+
+def _encode_bucket(room_id: str, messages: List[dict]) -> dict:
+    stored = [{key: value for key, value in message.items() if key != "room_id"} for message in messages]
+    return {
+        "room_id": room_id,
+        "count": len(messages),
+        "codec": CODEC,
+        "first_created_at": messages[0]["created_at"],
+        "first_id": messages[0]["_id"],
+        "last_created_at": messages[-1]["created_at"],
+        "last_id": messages[-1]["_id"],
+        "data": Binary(zlib.compress(encode({"messages": stored}), COMPRESSION_LEVEL))
+    }
+
+def decode_bucket(bucket: dict) -> List[dict]:
+    """버킷의 메시지를 (created_at, _id) 오름차순으로 복원합니다."""
+    if bucket.get("codec") != CODEC:
+        raise ValueError(f"지원하지 않는 압축 형식입니다: {bucket.get('codec')}")
+    messages = decode(zlib.decompress(bucket["data"]))["messages"]
+    for message in messages:
+        message["room_id"] = bucket["room_id"]
+    return messages
+
+def _covered_by(last_created_at: datetime, last_id: ObjectId) -> dict:
+    """(created_at, _id)가 주어진 키 이하인 메시지 조건"""
+    return {
+        "$or": [
+            {"created_at": {"$lt": last_created_at}},
+            {"created_at": last_created_at, "_id": {"$lte": last_id}}
+        ]
+    }
+
+async def find_archived_message(db, room_id: str, oid: ObjectId) -> Optional[dict]:
+    """보관된 메시지를 ID로 찾습니다. (ID 생성 시각 근처 버킷만 압축 해제)"""
+    generated_at = oid.generation_time.replace(tzinfo=None)
+    buckets = db[ARCHIVE_COLLECTION].find({
+        "room_id": room_id,
+        "first_created_at": {"$lte": generated_at + ANCHOR_TIME_SLACK},
+        "last_created_at": {"$gte": generated_at - ANCHOR_TIME_SLACK}
+    })
+    async for bucket in buckets:
+        for message in decode_bucket(bucket):
+            if message["_id"] == oid:
+                return message
+    return None
+
+async def archived_page(
+    db,
+    room_id: str,
+    anchor: Optional[Tuple[datetime, ObjectId]],
+    count: int,
+    ascending: bool
+) -> List[dict]:
+    """
+    보관된 메시지 중 anchor 키 이후(ascending) 또는 이전(descending)의 메시지를 최대 count개,
+    해당 방향 순서로 반환합니다. anchor가 None이면 가장 최근(descending) 메시지부터 읽습니다.
+    """
+    if count <= 0:
+        return []
+
+    query = {"room_id": room_id}
+    if ascending:
+        if anchor:
+            query["last_created_at"] = {"$gte": anchor[0]}
+        order = [("last_created_at", 1), ("last_id", 1)]
+    else:
+        if anchor:
+            query["first_created_at"] = {"$lte": anchor[0]}
+        order = [("first_created_at", -1), ("first_id", -1)]
+
+    messages = []
+    async for bucket in db[ARCHIVE_COLLECTION].find(query).sort(order):
+        bucket_messages = decode_bucket(bucket)
+        if not ascending:
+            bucket_messages.reverse()
+        for message in bucket_messages:
+            if anchor:
+                key = message_sort_key(message)
+                if (ascending and key <= anchor) or (not ascending and key >= anchor):
+                    continue
+            messages.append(message)
+            if len(messages) >= count:
+                return messages
+    return messages
+
+async def count_archived(db, room_id: str, after: Optional[Tuple[datetime, ObjectId]], exclude_sender_id: str) -> int:
+    """보관된 메시지 중 after 키 이후이고 exclude_sender_id가 보내지 않은 메시지 수 (읽지 않은 수 재계산용)"""
+    query = {"room_id": room_id}
+    if after:
+        query["last_created_at"] = {"$gte": after[0]}
+
+    count = 0
+    async for bucket in db[ARCHIVE_COLLECTION].find(query):
+        for message in decode_bucket(bucket):
+            if message.get("sender_id") == exclude_sender_id:
+                continue
+            if after and message_sort_key(message) <= after:
+                continue
+            count += 1
+    return count
+
+async def _archive_room(db, room_id: str, cutoff: datetime, bucket_size: int) -> Tuple[int, int]:
+    """채팅방 하나의 오래된 메시지를 버킷으로 옮깁니다. (생성한 버킷 수, 옮긴 메시지 수)"""
+    # 이전 실행이 버킷 저장 후 메시지 삭제 전에 중단된 경우 정리
+    last_bucket = await db[ARCHIVE_COLLECTION].find_one(
+        {"room_id": room_id},
+        sort=[("last_created_at", -1), ("last_id", -1)],
+        projection={"last_created_at": 1, "last_id": 1}
+    )
+    if last_bucket:
+        await db["chat_messages"].delete_many({
+            "room_id": room_id,
+            **_covered_by(last_bucket["last_created_at"], last_bucket["last_id"])
+        })
+
+    buckets = 0
+    moved = 0
+    while True:
+        messages = await db["chat_messages"].find(
+            {"room_id": room_id, "created_at": {"$lt": cutoff}}
+        ).sort([("created_at", 1), ("_id", 1)]).limit(bucket_size).to_list(bucket_size)
+        if len(messages) < bucket_size:
+            break
+
+        try:
+            await db[ARCHIVE_COLLECTION].insert_one(_encode_bucket(room_id, messages))
+            buckets += 1
+        except DuplicateKeyError:
+            # 이미 저장된 버킷 (동시에 실행된 작업 등)
+            pass
+
+        result = await db["chat_messages"].delete_many({"_id": {"$in": [message["_id"] for message in messages]}})
+        moved += result.deleted_count
+
+    return buckets, moved
+
+async def _storage_stats(db, collection_name: str) -> dict:
+    try:
+        stats = await db.command("collStats", collection_name)
+    except Exception:
+        return {"count": 0, "size": 0, "storage_size": 0, "index_size": 0}
+    return {
+        "count": stats.get("count", 0),
+        "size": stats.get("size", 0),
+        "storage_size": stats.get("storageSize", 0),
+        "index_size": stats.get("totalIndexSize", 0)
+    }
+
+async def storage_report(db) -> dict:
+    """chat_messages + chat_archive의 문서 수/데이터 크기/인덱스 크기 합계"""
+    hot = await _storage_stats(db, "chat_messages")
+    archive = await _storage_stats(db, ARCHIVE_COLLECTION)
+    return {
+        "chat_messages": hot,
+        ARCHIVE_COLLECTION: archive,
+        "total": {key: hot[key] + archive[key] for key in hot}
+    }
+
+async def archive_old_messages(db=None, older_than_days: Optional[int] = None, bucket_size: Optional[int] = None) -> dict:
+    """
+    older_than_days보다 오래된 메시지를 채팅방별 압축 버킷으로 옮기고
+    작업 전후의 저장 공간/인덱스 크기를 반환합니다.
+    """
+    if db is None:
+        from app.core.database import db
+
+    older_than_days = older_than_days or settings.CHAT_ARCHIVE_AFTER_DAYS
+    bucket_size = bucket_size or settings.CHAT_ARCHIVE_BUCKET_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+
+    before = await storage_report(db)
+
+    buckets = 0
+    moved = 0
+    room_ids = await db["chat_messages"].distinct("room_id", {"created_at": {"$lt": cutoff}})
+    for room_id in sorted(room_ids):
+        room_buckets, room_moved = await _archive_room(db, room_id, cutoff, bucket_size)
+        buckets += room_buckets
+        moved += room_moved
+
+    after = await storage_report(db)
+    return {
+        "rooms": len(room_ids),
+        "buckets_created": buckets,
+        "messages_archived": moved,
+        "before": before["total"],
+        "after": after["total"],
+        "detail": after
+    }
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
+        size /= 1024
+
+# 직접 실행 시 보관 작업
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print(f"🔧 {settings.CHAT_ARCHIVE_AFTER_DAYS}일보다 오래된 채팅 메시지 보관 시작...")
+    report = asyncio.run(archive_old_messages(db))
+    print(
+        f"✅ 채팅방 {report['rooms']}개: 메시지 {report['messages_archived']}개 -> "
+        f"버킷 {report['buckets_created']}개"
+    )
+    for key, label in (("count", "문서 수"), ("size", "데이터 크기"), ("storage_size", "저장 공간"), ("index_size", "인덱스 크기")):
+        before_value, after_value = report["before"][key], report["after"][key]
+        if key == "count":
+            print(f"📊 {label}: {before_value} -> {after_value}")
+        else:
+            print(f"📊 {label}: {_format_bytes(before_value)} -> {_format_bytes(after_value)} "
+                  f"({_format_bytes(before_value - after_value)} 감소)")
+    print("ℹ️ 저장 공간(storageSize)은 WiredTiger가 빈 공간을 재사용하므로 compact 전에는 바로 줄지 않을 수 있습니다.")
@@ -0,0 +1,118 @@
+# app/core/chat_history.py
+"""
+채팅 메시지 keyset 페이지네이션
+
+메시지는 (room_id, created_at, _id) 순서로 정렬되며 커서는 메시지 ID 문자열입니다.
+created_at이 같은 메시지도 _id로 순서가 고정되므로 페이지 경계에서 중복/누락이 없습니다.
+
+- before=<message_id>: 해당 메시지보다 오래된 메시지 (위로 스크롤)
+- after=<message_id>: 해당 메시지보다 새로운 메시지 (재연결 후 놓친 메시지 따라잡기)
+- 둘 다 없으면 최신 메시지
+
+REST(/api/chat/room/{room_id}/messages)와 WebSocket(sync)이 같은 형식으로 응답합니다.
+
+    {"messages": [...오래된 것부터...], "has_more": bool}
+
+메시지는 serialize_message 형식(_id 문자열, created_at 서울 시간 ISO 8601)이며
+WebSocket new_message와 메시지 전송 응답도 같은 형식을 사용합니다.
+before 방향은 messages[0]["_id"], after 방향은 messages[-1]["_id"](new_message는 _id)를 다음 커서로 사용합니다.
+
+오래된 메시지는 app.core.chat_archive가 압축 버킷으로 옮겨 두므로 chat_messages에서 모자란 부분은
+보관 영역에서 이어서 읽습니다. 커서가 보관된 메시지를 가리켜도 같은 방식으로 동작합니다.
+"""
+
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.chat_archive import archived_page, find_archived_message, message_sort_key
+from app.core.date_migration import to_utc_naive
+import pytz
+
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# 정렬 키 (room_id, created_at, _id) 인덱스와 같은 순서
+ASCENDING_ORDER = [("created_at", 1), ("_id", 1)]
+DESCENDING_ORDER = [("created_at", -1), ("_id", -1)]
+
+async def _anchor(db, room_id: str, message_id: str) -> Tuple[dict, bool]:
+    """커서(메시지 ID)가 가리키는 메시지와 보관(chat_archive)된 메시지인지 여부"""
+    try:
+        oid = ObjectId(message_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 메시지 커서입니다.")
+
+    anchor = await db["chat_messages"].find_one(
+        {"_id": oid, "room_id": room_id},
+        projection={"created_at": 1}
+    )
+    if anchor:
+        return anchor, False
+
+    anchor = await find_archived_message(db, room_id, oid)
+    if not anchor:
+        raise HTTPException(status_code=400, detail="유효하지 않은 메시지 커서입니다.")
+    return anchor, True
+
+def _keyset(anchor: dict, op: str) -> dict:
+    return {
+        "$or": [
+            {"created_at": {op: anchor["created_at"]}},
+            {"created_at": anchor["created_at"], "_id": {op: anchor["_id"]}}
+        ]
+    }
+
+def serialize_message(message: dict) -> dict:
+    """REST/WebSocket 공통 메시지 형식: _id는 문자열, created_at은 서울 시간 ISO 8601 문자열"""
+    message["_id"] = str(message["_id"])
+    created_at = to_utc_naive(message.get("created_at"))
+    if created_at is not None:
+        message["created_at"] = pytz.UTC.localize(created_at).astimezone(seoul_tz).isoformat()
+    return message
+
+async def fetch_messages(
+    db,
+    room_id: str,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None
+) -> Tuple[List[dict], bool]:
+    """
+    메시지 한 페이지를 오래된 것부터 정렬해 반환합니다.
+    has_more는 같은 방향으로 더 가져올 메시지가 있는지 여부입니다.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="before와 after는 함께 사용할 수 없습니다.")
+
+    anchor, anchor_archived = await _anchor(db, room_id, before or after) if (before or after) else (None, False)
+    anchor_key = message_sort_key(anchor) if anchor else None
+
+    # 보관된 메시지는 모두 chat_messages의 메시지보다 오래되었으므로
+    # 이후 방향은 보관 영역 -> chat_messages, 이전 방향은 chat_messages -> 보관 영역 순서로 이어 읽습니다.
+    messages = []
+    if after:
+        order = ASCENDING_ORDER
+        if anchor_archived:
+            messages = await archived_page(db, room_id, anchor_key, limit + 1, ascending=True)
+        if len(messages) <= limit:
+            query = {"room_id": room_id}
+            if not anchor_archived:
+                query.update(_keyset(anchor, "$gt"))
+            remaining = limit + 1 - len(messages)
+            messages += await db["chat_messages"].find(query).sort(order).limit(remaining).to_list(remaining)
+    else:
+        order = DESCENDING_ORDER
+        if not anchor_archived:
+            query = {"room_id": room_id}
+            if anchor:
+                query.update(_keyset(anchor, "$lt"))
+            messages = await db["chat_messages"].find(query).sort(order).limit(limit + 1).to_list(limit + 1)
+        if len(messages) <= limit:
+            # chat_messages가 모자라면 보관 영역에서 이어서 읽음 (보관된 메시지가 없으면 빈 조회 한 번)
+            messages += await archived_page(db, room_id, anchor_key, limit + 1 - len(messages), ascending=False)
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if order is DESCENDING_ORDER:
+        messages.reverse()
+
+    return [serialize_message(message) for message in messages], has_more
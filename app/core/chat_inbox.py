@@ -0,0 +1,100 @@
+# app/core/chat_inbox.py
+"""
+채팅방 목록(inbox) 조회
+
+채팅방 문서에 참여자 배열 participants([user1_id, user2_id], room_id와 같은 정렬 순서)를 두고
+(participants, last_message_at, _id) 멀티키 인덱스 하나로 "내 채팅방을 최근 메시지 순으로" 조회합니다.
+user1_id/user2_id 양쪽을 $or로 찾을 필요가 없습니다. (user1_id/user2_id/이름 필드는 그대로 유지)
+
+목록은 (last_message_at, _id) 내림차순 keyset 커서로 페이지를 나눕니다.
+메시지가 없는 채팅방(last_message_at = null)은 가장 뒤에 옵니다.
+
+participants가 없는 기존 채팅방은 아래 마이그레이션으로 채웁니다.
+여러 번 실행해도 안전하며 서버 시작 시 백그라운드로 실행됩니다.
+
+    python -m app.core.chat_inbox
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from app.utils.pagination import decode_cursor, encode_cursor
+import asyncio
+
+INBOX_ORDER = [("last_message_at", -1), ("_id", -1)]
+
+def room_participants(user1_id: str, user2_id: str) -> List[str]:
+    """create_room_id와 같은 순서(작은 ID를 앞에)의 참여자 배열"""
+    return sorted([user1_id, user2_id])
+
+def _after_position(cursor: str) -> dict:
+    position = decode_cursor(cursor)
+    try:
+        last_oid = ObjectId(position["id"])
+        last_message_at = datetime.fromisoformat(position["d"]) if position.get("d") else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+
+    if last_message_at is None:
+        # null 구간 안에서는 _id 순서만 남음
+        return {"last_message_at": None, "_id": {"$lt": last_oid}}
+    return {
+        "$or": [
+            {"last_message_at": {"$lt": last_message_at}},
+            {"last_message_at": last_message_at, "_id": {"$lt": last_oid}},
+            {"last_message_at": None}
+        ]
+    }
+
+async def fetch_inbox(db, user_id: str, cursor: Optional[str], limit: Optional[int]) -> Tuple[List[dict], Optional[str]]:
+    """
+    user_id의 채팅방을 최근 메시지 순으로 한 페이지 조회하고 다음 커서를 반환합니다.
+    limit이 None이면 나머지 채팅방을 모두 반환합니다. (기존 /rooms 응답 호환용)
+    """
+    query = {"participants": user_id}
+    if cursor:
+        query.update(_after_position(cursor))
+
+    if limit is None:
+        return await db["chat_rooms"].find(query).sort(INBOX_ORDER).to_list(length=None), None
+
+    rooms = await db["chat_rooms"].find(query).sort(INBOX_ORDER).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(rooms) > limit:
+        rooms = rooms[:limit]
+        last = rooms[-1]
+        last_message_at = last.get("last_message_at")
+        next_cursor = encode_cursor({
+            "d": last_message_at.isoformat() if last_message_at else None,
+            "id": str(last["_id"])
+        })
+
+    return rooms, next_cursor
+
+async def migrate_participants(db=None) -> int:
+    """participants가 없는 채팅방에 [user1_id, user2_id]를 채웁니다. 수정된 채팅방 수를 반환합니다."""
+    if db is None:
+        from app.core.database import db
+
+    try:
+        # user1_id < user2_id로 저장되므로 room_participants와 같은 순서
+        result = await db["chat_rooms"].update_many(
+            {"participants": {"$exists": False}},
+            [{"$set": {"participants": ["$user1_id", "$user2_id"]}}]
+        )
+        if result.modified_count:
+            print(f"✅ 채팅방 participants 마이그레이션: {result.modified_count}개 채팅방")
+        return result.modified_count
+    except Exception as e:
+        print(f"❌ 채팅방 participants 마이그레이션 오류: {e}")
+        return 0
+
+# 직접 실행 시 마이그레이션 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 채팅방 participants 마이그레이션 시작...")
+    modified_count = asyncio.run(migrate_participants(db))
+    print(f"✅ 마이그레이션 완료: {modified_count}개 채팅방")
@@ -0,0 +1,144 @@
+# app/core/chat_read_state.py
+"""
+채팅 읽음 상태 (참여자별 읽음 워터마크)
+
+메시지마다 is_read를 바꾸지 않고 채팅방 문서에 참여자별로 마지막으로 읽은 메시지의 정렬 키를 둡니다.
+
+- chat_rooms.read_state: {user_id: {"created_at": datetime, "message_id": ObjectId}}
+- chat_rooms.last_message_id: 채팅방의 마지막 메시지 ID (읽음 처리 시 최신 메시지까지 읽었는지 판단)
+
+메시지 정렬 키 (created_at, _id)가 워터마크 이하이면 읽은 메시지입니다.
+워터마크는 $max로만 갱신하므로 이전 메시지를 다시 조회해도 뒤로 가지 않습니다.
+(필드 순서가 같은 문서끼리는 created_at, message_id 순으로 비교됩니다.)
+읽지 않은 메시지 수(app.core.chat_unread)와 응답의 is_read/읽음 표시는 이 워터마크에서 계산합니다.
+
+기존 메시지의 is_read 값은 아래 마이그레이션으로 워터마크로 옮긴 뒤 제거합니다.
+처리된 채팅방/메시지는 다시 처리하지 않으므로 여러 번 실행해도 안전하고, 중단되면 이어서 처리합니다.
+서버 시작 시 백그라운드로 실행되며 직접 실행할 수도 있습니다.
+
+    python -m app.core.chat_read_state
+"""
+
+from typing import List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.core.date_migration import to_utc_naive
+import asyncio
+
+# 한 번에 처리할 채팅방 수
+MIGRATION_BATCH_SIZE = 200
+
+def message_key(message: dict) -> dict:
+    """메시지의 워터마크 값 (created_at, message_id 순서 유지)"""
+    return {
+        "created_at": to_utc_naive(message["created_at"]),
+        "message_id": ObjectId(str(message["_id"]))
+    }
+
+def watermark_of(room: dict, user_id: str) -> Optional[dict]:
+    return (room.get("read_state") or {}).get(user_id)
+
+def after_watermark(watermark: Optional[dict]) -> dict:
+    """워터마크 이후(읽지 않은) 메시지 조건. 워터마크가 없으면 모든 메시지"""
+    if not watermark:
+        return {}
+    return {
+        "$or": [
+            {"created_at": {"$gt": watermark["created_at"]}},
+            {"created_at": watermark["created_at"], "_id": {"$gt": watermark["message_id"]}}
+        ]
+    }
+
+def is_read_by(message: dict, watermark: Optional[dict]) -> bool:
+    if not watermark:
+        return False
+    key = message_key(message)
+    return (key["created_at"], key["message_id"]) <= (watermark["created_at"], watermark["message_id"])
+
+def attach_read_flags(messages: List[dict], room: dict) -> List[dict]:
+    """응답 호환용 is_read: 받는 사람(보낸 사람이 아닌 참여자)의 워터마크 기준"""
+    for message in messages:
+        readers = [user_id for user_id in (room["user1_id"], room["user2_id"]) if user_id != message.get("sender_id")]
+        message["is_read"] = all(is_read_by(message, watermark_of(room, user_id)) for user_id in readers)
+    return messages
+
+def serialize_read_state(room: dict) -> dict:
+    """읽음 표시용 {user_id: 마지막으로 읽은 메시지 ID}"""
+    return {
+        user_id: str(watermark["message_id"])
+        for user_id, watermark in (room.get("read_state") or {}).items()
+        if watermark
+    }
+
+async def _latest_message(db, query: dict) -> Optional[dict]:
+    return await db["chat_messages"].find_one(
+        query,
+        sort=[("created_at", -1), ("_id", -1)],
+        projection={"created_at": 1}
+    )
+
+async def _migrate_room(db, room: dict) -> Optional[UpdateOne]:
+    update = {}
+    for user_id in (room["user1_id"], room["user2_id"]):
+        # 상대방이 보낸 메시지 중 읽음 처리된 가장 최근 메시지까지 읽은 것으로 봅니다.
+        last_read = await _latest_message(db, {
+            "room_id": room["room_id"],
+            "sender_id": {"$ne": user_id},
+            "is_read": True
+        })
+        if last_read:
+            update.setdefault("$max", {})[f"read_state.{user_id}"] = message_key(last_read)
+
+    if "last_message_id" not in room:
+        latest = await _latest_message(db, {"room_id": room["room_id"]})
+        update["$set"] = {"last_message_id": latest["_id"] if latest else None}
+
+    return UpdateOne({"_id": room["_id"]}, update) if update else None
+
+async def migrate_read_flags(db=None) -> int:
+    """
+    chat_messages.is_read를 채팅방 워터마크로 옮기고 메시지의 is_read 필드를 제거합니다.
+    워터마크가 옮겨진 채팅방 수를 반환합니다.
+    """
+    if db is None:
+        from app.core.database import db
+
+    migrated = 0
+    try:
+        # 1) is_read가 남아 있는 채팅방과 last_message_id가 없는 채팅방의 워터마크 설정
+        room_ids = set(await db["chat_messages"].distinct("room_id", {"is_read": {"$exists": True}}))
+        async for room in db["chat_rooms"].find({"last_message_id": {"$exists": False}}, projection={"room_id": 1}):
+            room_ids.add(room["room_id"])
+
+        room_ids = sorted(room_ids)
+        for start in range(0, len(room_ids), MIGRATION_BATCH_SIZE):
+            batch_room_ids = room_ids[start:start + MIGRATION_BATCH_SIZE]
+            rooms = await db["chat_rooms"].find(
+                {"room_id": {"$in": batch_room_ids}},
+                projection={"room_id": 1, "user1_id": 1, "user2_id": 1, "last_message_id": 1}
+            ).to_list(length=None)
+            operations = [operation for operation in [await _migrate_room(db, room) for room in rooms] if operation]
+            if operations:
+                await db["chat_rooms"].bulk_write(operations, ordered=False)
+                migrated += len(operations)
+
+            # 2) 워터마크를 옮긴 채팅방의 메시지에서만 is_read 제거 (중단되면 남은 채팅방을 다시 처리)
+            await db["chat_messages"].update_many(
+                {"room_id": {"$in": batch_room_ids}, "is_read": {"$exists": True}},
+                {"$unset": {"is_read": ""}}
+            )
+
+        if migrated:
+            print(f"✅ 채팅 읽음 상태 마이그레이션: {migrated}개 채팅방")
+    except Exception as e:
+        print(f"❌ 채팅 읽음 상태 마이그레이션 오류: {e}")
+
+    return migrated
+
+# 직접 실행 시 마이그레이션 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 채팅 is_read -> 읽음 워터마크 마이그레이션 시작...")
+    migrated_count = asyncio.run(migrate_read_flags(db))
+    print(f"✅ 마이그레이션 완료: {migrated_count}개 채팅방")
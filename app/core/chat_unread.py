@@ -0,0 +1,258 @@
+# app/core/chat_unread.py
+"""
+채팅방(chat_rooms) 문서에 참여자별 읽지 않은 메시지 수를 유지/복구하는 모듈
+
+- chat_rooms.unread_counts: {user_id: 읽지 않은 메시지 수}
+- chat_unread_totals: {_id: user_id, total: 모든 채팅방의 읽지 않은 메시지 합계} (배지용)
+
+메시지를 보내면 상대방 카운터를 last_message 갱신과 같은 update로 증가시키고 (app.core.chat_writer),
+마지막 메시지까지 읽으면 읽음 워터마크(app.core.chat_read_state)와 함께 내 카운터를 0으로 되돌리면서
+그만큼 합계에서 뺍니다. (합계는 0 아래로 내려가지 않음)
+채팅방 목록과 배지 API는 chat_messages를 세지 않고 위 필드만 읽습니다.
+카운터가 어긋났거나 기존 데이터가 있으면 아래 명령으로 워터마크 기준으로 다시 계산합니다. (보관된 메시지 포함)
+재계산은 계산하는 동안 바뀌지 않은 채팅방/합계만 조건부로 고치므로 서비스 중에 실행해도 됩니다.
+
+    python -m app.core.chat_unread
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.core.chat_archive import count_archived
+from app.core.chat_read_state import after_watermark, message_key, watermark_of
+from app.core.date_migration import to_utc_naive
+import asyncio
+
+# 재계산 시 한 번에 전송할 bulk_write 크기
+REPAIR_BATCH_SIZE = 500
+
+# 재계산 중 바뀐 채팅방/합계를 다시 시도하는 횟수
+RECONCILE_ATTEMPTS = 3
+
+ROOM_PROJECTION = {
+    "room_id": 1, "user1_id": 1, "user2_id": 1, "read_state": 1, "last_message_id": 1, "last_message_at": 1
+}
+
+def participants(room: dict) -> list:
+    return [room["user1_id"], room["user2_id"]]
+
+def initial_unread_fields(user1_id: str, user2_id: str) -> dict:
+    """새 채팅방 생성 시 넣어 둘 카운터 기본값"""
+    return {"unread_counts": {user1_id: 0, user2_id: 0}}
+
+def unread_increment(room: dict, sender_id: str) -> dict:
+    """메시지 전송 시 채팅방 update에 합칠 $inc (보낸 사람을 제외한 참여자)"""
+    return {f"unread_counts.{user_id}": 1 for user_id in participants(room) if user_id != sender_id}
+
+async def mark_room_read(db, room_id: str, user_id: str, message: dict) -> int:
+    """
+    user_id가 message까지 읽었다고 기록합니다. (채팅방 문서 update 한 번)
+    message가 채팅방의 마지막 메시지이면 카운터도 0으로 만들고 배지 합계에서 그만큼 뺍니다.
+    읽음 처리된 수를 반환합니다.
+    """
+    watermark = {"$max": {f"read_state.{user_id}": message_key(message)}}
+    previous = await db["chat_rooms"].find_one_and_update(
+        {"room_id": room_id, "last_message_id": message_key(message)["message_id"]},
+        {**watermark, "$set": {f"unread_counts.{user_id}": 0}},
+        projection={f"unread_counts.{user_id}": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not previous:
+        # 그 사이 새 메시지가 왔거나 이전 메시지까지만 읽음: 워터마크만 갱신 (카운터는 다음 읽음/재계산 때 맞춰짐)
+        await db["chat_rooms"].update_one({"room_id": room_id}, watermark)
+        return 0
+
+    count = previous.get("unread_counts", {}).get(user_id, 0)
+    if count > 0:
+        await decrement_total(db, user_id, count)
+    return count
+
+async def decrement_total(db, user_id: str, count: int):
+    """배지 합계에서 count만큼 뺍니다. 합계가 어긋나 count보다 작으면 0에서 멈춥니다."""
+    await db["chat_unread_totals"].update_one(
+        {"_id": user_id},
+        [{"$set": {"total": {"$max": [0, {"$subtract": [{"$ifNull": ["$total", 0]}, count]}]}}}]
+    )
+
+def unread_count(room: dict, user_id: str) -> int:
+    return (room.get("unread_counts") or {}).get(user_id, 0)
+
+async def total_unread(db, user_id: str) -> int:
+    """배지용 전체 읽지 않은 메시지 수 (_id 조회 한 번)"""
+    doc = await db["chat_unread_totals"].find_one({"_id": user_id})
+    return max(doc.get("total", 0), 0) if doc else 0
+
+def _snapshot_filter(room: dict) -> dict:
+    """재계산 중 메시지/읽음이 반영되지 않은 채팅방만 고치기 위한 조건"""
+    return {
+        "_id": room["_id"],
+        "last_message_id": room.get("last_message_id"),
+        "read_state": room.get("read_state")
+    }
+
+def _up_to_last_message(room: dict) -> dict:
+    """채팅방 문서에 반영된 마지막 메시지까지의 조건 (아직 반영 전인 메시지는 쓰기 경로의 $inc가 셈)"""
+    if not room.get("last_message_id") or not room.get("last_message_at"):
+        return {}
+    last_created_at = to_utc_naive(room["last_message_at"])
+    return {
+        "$or": [
+            {"created_at": {"$lt": last_created_at}},
+            {"created_at": last_created_at, "_id": {"$lte": room["last_message_id"]}}
+        ]
+    }
+
+async def _room_counts(db, room: dict) -> Dict[str, int]:
+    counts = {}
+    for user_id in participants(room):
+        conditions = [
+            condition for condition in (after_watermark(watermark_of(room, user_id)), _up_to_last_message(room))
+            if condition
+        ]
+        counts[user_id] = await db["chat_messages"].count_documents({
+            "room_id": room["room_id"],
+            "sender_id": {"$ne": user_id},
+            **({"$and": conditions} if conditions else {})
+        })
+
+        # 워터마크 이후의 메시지가 보관(chat_archive)되었으면 그것도 셈
+        watermark = watermark_of(room, user_id)
+        after = (watermark["created_at"], watermark["message_id"]) if watermark else None
+        counts[user_id] += await count_archived(db, room["room_id"], after, user_id)
+    return counts
+
+async def _reconcile_rooms(db, rooms: List[dict]) -> Tuple[int, List]:
+    """
+    채팅방 카운터를 다시 계산해 읽어 온 뒤로 바뀌지 않은 채팅방에만 기록합니다.
+    (수정된 수, 그 사이 바뀌어 다시 처리할 채팅방 _id 목록)을 반환합니다.
+    """
+    operations = [
+        UpdateOne(_snapshot_filter(room), {"$set": {"unread_counts": await _room_counts(db, room)}})
+        for room in rooms
+    ]
+    result = await db["chat_rooms"].bulk_write(operations, ordered=False)
+    if result.matched_count == len(rooms):
+        return result.modified_count, []
+
+    changed = [
+        room["_id"] for room in rooms
+        if not await db["chat_rooms"].find_one(_snapshot_filter(room), projection={"_id": 1})
+    ]
+    return result.modified_count, changed
+
+async def _reconcile_totals(db, user_ids: Optional[Set[str]] = None) -> int:
+    """
+    사용자별 배지 합계를 채팅방 카운터의 합으로 맞춥니다. (user_ids를 지정하면 해당 사용자만)
+    읽어 온 합계가 그 사이 바뀌지 않은 경우에만 덮어쓰고(compare-and-set), 바뀌었으면 다시 계산합니다.
+    """
+    totals_query = {"_id": {"$in": list(user_ids)}} if user_ids is not None else {}
+    totals = {doc["_id"]: doc.get("total") async for doc in db["chat_unread_totals"].find(totals_query)}
+
+    pipeline = [
+        {"$project": {"counts": {"$objectToArray": {"$ifNull": ["$unread_counts", {}]}}}},
+        {"$unwind": "$counts"},
+        {"$group": {"_id": "$counts.k", "total": {"$sum": "$counts.v"}}}
+    ]
+    if user_ids is not None:
+        pipeline.insert(0, {"$match": {"participants": {"$in": list(user_ids)}}})
+        pipeline.insert(3, {"$match": {"counts.k": {"$in": list(user_ids)}}})
+    sums = {row["_id"]: row["total"] async for row in db["chat_rooms"].aggregate(pipeline)}
+
+    fixed = 0
+    for user_id in set(totals) | set(sums):
+        for _ in range(RECONCILE_ATTEMPTS):
+            expected = sums.get(user_id, 0)
+            if totals.get(user_id, 0) == expected and user_id in totals:
+                break
+            if user_id in totals:
+                result = await db["chat_unread_totals"].update_one(
+                    {"_id": user_id, "total": totals[user_id]}, {"$set": {"total": expected}}
+                )
+                if result.matched_count:
+                    fixed += 1
+                    break
+            else:
+                try:
+                    await db["chat_unread_totals"].insert_one({"_id": user_id, "total": expected})
+                    fixed += 1
+                    break
+                except DuplicateKeyError:
+                    pass
+
+            # 그 사이 메시지/읽음 처리로 바뀜: 현재 값으로 다시 계산
+            doc = await db["chat_unread_totals"].find_one({"_id": user_id})
+            if doc:
+                totals[user_id] = doc.get("total")
+            rows = await db["chat_rooms"].aggregate([
+                {"$match": {"participants": user_id}},
+                {"$group": {"_id": None, "total": {"$sum": {"$ifNull": [f"$unread_counts.{user_id}", 0]}}}}
+            ]).to_list(1)
+            sums[user_id] = rows[0]["total"] if rows else 0
+
+    return fixed
+
+async def rebuild_unread_counters(db) -> int:
+    """
+    읽음 워터마크 이후의 메시지 수로 모든 채팅방 카운터와 사용자별 합계를 다시 계산합니다.
+    서비스 중에도 실행할 수 있도록 지우고 다시 쓰지 않고, 계산하는 동안 바뀌지 않은 문서만 조건부로 고칩니다.
+    수정된 채팅방 수를 반환합니다.
+    """
+    modified = 0
+    retry_ids = []
+    batch = []
+    rooms_cursor = db["chat_rooms"].find({}, projection=ROOM_PROJECTION)
+    async for room in rooms_cursor:
+        batch.append(room)
+        if len(batch) >= REPAIR_BATCH_SIZE:
+            batch_modified, changed = await _reconcile_rooms(db, batch)
+            modified += batch_modified
+            retry_ids += changed
+            batch = []
+    if batch:
+        batch_modified, changed = await _reconcile_rooms(db, batch)
+        modified += batch_modified
+        retry_ids += changed
+
+    # 재계산 중 메시지가 오가서 바뀐 채팅방은 현재 상태로 몇 번 더 시도
+    for _ in range(RECONCILE_ATTEMPTS):
+        if not retry_ids:
+            break
+        rooms = await db["chat_rooms"].find({"_id": {"$in": retry_ids}}, projection=ROOM_PROJECTION).to_list(length=None)
+        modified_count, retry_ids = await _reconcile_rooms(db, rooms) if rooms else (0, [])
+        modified += modified_count
+    if retry_ids:
+        print(f"⚠️ 채팅 카운터 재계산 중 계속 바뀐 채팅방 {len(retry_ids)}개는 건너뜀")
+
+    await _reconcile_totals(db)
+    return modified
+
+async def repair_rooms(db, room_ids: Iterable[str]) -> int:
+    """지정한 채팅방의 카운터와 참여자의 배지 합계만 다시 맞춥니다. (쓰기 경로의 채팅방 갱신이 실패했을 때)"""
+    rooms = await db["chat_rooms"].find(
+        {"room_id": {"$in": list(room_ids)}}, projection=ROOM_PROJECTION
+    ).to_list(length=None)
+    if not rooms:
+        return 0
+    modified, _ = await _reconcile_rooms(db, rooms)
+    await _reconcile_totals(db, {user_id for room in rooms for user_id in participants(room)})
+    return modified
+
+async def rebuild_if_missing(db=None):
+    """카운터가 없는 채팅방이 있으면 (최초 배포 시) 재계산합니다. 서버 시작 시 백그라운드로 실행됩니다."""
+    if db is None:
+        from app.core.database import db
+
+    try:
+        if await db["chat_rooms"].find_one({"unread_counts": {"$exists": False}}, projection={"_id": 1}):
+            modified_count = await rebuild_unread_counters(db)
+            print(f"✅ 채팅 읽지 않은 메시지 카운터 백필: {modified_count}개 채팅방")
+    except Exception as e:
+        print(f"❌ 채팅 카운터 백필 오류: {e}")
+
+# 직접 실행 시 백필/복구 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 채팅 읽지 않은 메시지 카운터 재계산 시작...")
+    modified_count = asyncio.run(rebuild_unread_counters(db))
+    print(f"✅ 채팅 카운터 재계산 완료: {modified_count}개 채팅방 수정됨")
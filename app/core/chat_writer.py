@@ -0,0 +1,235 @@
+# app/core/chat_writer.py
+"""
+채팅 메시지 group commit 쓰기 경로
+
+메시지마다 insert_one + chat_rooms.update_one(+ 배지 합계 update)을 순서대로 보내지 않고
+CHAT_WRITE_FLUSH_INTERVAL_MS 동안(또는 CHAT_WRITE_MAX_BATCH개까지) 모인 메시지를 채팅방에 상관없이
+
+1. chat_messages.insert_many(ordered=False) 한 번
+2. chat_rooms.bulk_write 한 번 (채팅방마다 마지막 메시지로만 last_message 갱신 + 읽지 않은 수 합산 $inc)
+3. chat_unread_totals.bulk_write 한 번 (사용자별 합산 $inc)
+
+으로 기록합니다. 보낸 사람(REST 응답 / WebSocket 브로드캐스트)은 자기 메시지가 포함된 배치가
+기록된 뒤에 응답을 받으므로, 응답을 받은 메시지는 저장된 메시지입니다.
+메시지 _id와 created_at은 제출 시점에 정하므로 채팅방 안의 순서는 제출 순서와 같습니다.
+
+채팅방/배지 합계 갱신이 실패하면 메시지는 이미 저장되었으므로 보낸 사람에게는 성공으로 응답하고,
+해당 채팅방의 마지막 메시지와 카운터를 chat_messages 기준으로 다시 맞추는 복구를 예약합니다.
+(복구도 실패하면 다음 배치 기록 뒤에 다시 시도합니다.)
+
+작업이 시작되지 않은 상태(스크립트 등)에서는 submit이 바로 기록합니다.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Tuple
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.core.chat_unread import repair_rooms, unread_increment
+import asyncio
+import pytz
+
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+class ChatWriteBatcher:
+    def __init__(self, flush_interval_ms: int, max_batch: int, db=None):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.db = db
+
+        # (메시지 문서, 채팅방 문서, 보낸 사람에게 알릴 future)
+        self.pending: List[Tuple[dict, dict, asyncio.Future]] = []
+
+        self.submitted_count = 0
+        self.written_count = 0
+        self.failed_count = 0
+        self.flush_count = 0
+        self.room_update_count = 0
+        self.repair_count = 0
+
+        # 마지막 메시지/카운터 갱신이 실패해 복구가 필요한 채팅방
+        self._repair_room_ids = set()
+
+        self._flush_requested = asyncio.Event()
+        self._stopping = False
+        self._task = None
+
+    def _database(self):
+        if self.db is None:
+            from app.core.database import db
+            return db
+        return self.db
+
+    async def submit(self, room: dict, sender_id: str, sender_name: str, message: str) -> dict:
+        """메시지를 다음 배치에 넣고 기록될 때까지 기다린 뒤 저장된 메시지 문서를 반환합니다."""
+        message_doc = {
+            "_id": ObjectId(),
+            "room_id": room["room_id"],
+            "sender_id": sender_id,
+            "sender_name": sender_name,
+            "message": message,
+            "created_at": datetime.now(seoul_tz)
+        }
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((message_doc, room, future))
+        self.submitted_count += 1
+
+        if self._task is None:
+            await self.flush()
+        elif len(self.pending) >= self.max_batch:
+            self._flush_requested.set()
+
+        await future
+        return message_doc
+
+    def _room_operations(self, batch) -> Tuple[List[UpdateOne], Dict[str, int]]:
+        """채팅방별로 마지막 메시지만 남기고 읽지 않은 수는 합산합니다."""
+        latest: Dict[str, dict] = {}
+        increments: Dict[str, Dict[str, int]] = {}
+        totals: Dict[str, int] = {}
+        for message_doc, room, _ in batch:
+            room_id = room["room_id"]
+            latest[room_id] = message_doc
+            room_increments = increments.setdefault(room_id, {})
+            for field in unread_increment(room, message_doc["sender_id"]):
+                room_increments[field] = room_increments.get(field, 0) + 1
+                user_id = field.split(".", 1)[1]
+                totals[user_id] = totals.get(user_id, 0) + 1
+
+        operations = []
+        for room_id, message_doc in latest.items():
+            update = {
+                "$set": {
+                    "last_message": message_doc["message"],
+                    "last_message_at": message_doc["created_at"],
+                    "last_message_id": message_doc["_id"]
+                }
+            }
+            if increments[room_id]:
+                update["$inc"] = increments[room_id]
+            operations.append(UpdateOne({"room_id": room_id}, update))
+        return operations, totals
+
+    async def flush(self):
+        if not self.pending:
+            return
+
+        db = self._database()
+        # await 이전에 버퍼를 교체하므로 기록 중 들어온 메시지는 다음 배치로 넘어갑니다.
+        batch, self.pending = self.pending, []
+
+        failed: Dict[int, Exception] = {}
+        written_indexes = set()
+        try:
+            try:
+                await db["chat_messages"].insert_many([message_doc for message_doc, _, _ in batch], ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    failed[error["index"]] = Exception(error.get("errmsg", "메시지 저장 실패"))
+            except Exception as e:
+                failed = {index: e for index in range(len(batch))}
+            written_indexes = {index for index in range(len(batch)) if index not in failed}
+
+            written = [batch[index] for index in sorted(written_indexes)]
+            if written:
+                try:
+                    room_operations, totals = self._room_operations(written)
+                    await db["chat_rooms"].bulk_write(room_operations, ordered=False)
+                    if totals:
+                        await db["chat_unread_totals"].bulk_write([
+                            UpdateOne({"_id": user_id}, {"$inc": {"total": count}}, upsert=True)
+                            for user_id, count in totals.items()
+                        ], ordered=False)
+                    self.room_update_count += len(room_operations)
+                except Exception as e:
+                    # 메시지는 저장되었으므로 응답은 성공으로 처리하고 채팅방 복구를 예약
+                    print(f"❌ 채팅방 마지막 메시지/카운터 갱신 실패 (복구 예약): {e}")
+                    self._repair_room_ids.update(room["room_id"] for _, room, _ in written)
+        except BaseException as e:
+            # 예상하지 못한 오류(취소 포함): 저장 여부를 모르는 메시지는 실패로 알림
+            error = e if isinstance(e, Exception) else Exception("메시지 기록이 중단되었습니다.")
+            for index in range(len(batch)):
+                if index not in written_indexes:
+                    failed.setdefault(index, error)
+            raise
+        finally:
+            # 어떤 경우에도 배치의 모든 future에 결과를 알려 보낸 사람이 무한히 기다리지 않게 함
+            for index, (_, _, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if index in failed:
+                    future.set_exception(failed[index])
+                else:
+                    future.set_result(None)
+
+            self.flush_count += 1
+            self.written_count += len(written_indexes)
+            self.failed_count += len(failed)
+
+        if self._repair_room_ids:
+            await self._repair(db)
+
+    async def _repair(self, db):
+        """갱신에 실패한 채팅방의 마지막 메시지를 chat_messages에서 다시 읽고 카운터/배지 합계를 다시 맞춥니다."""
+        room_ids, self._repair_room_ids = self._repair_room_ids, set()
+        try:
+            for room_id in room_ids:
+                latest = await db["chat_messages"].find_one(
+                    {"room_id": room_id}, sort=[("created_at", -1), ("_id", -1)]
+                )
+                if latest:
+                    await db["chat_rooms"].update_one({"room_id": room_id}, {"$set": {
+                        "last_message": latest["message"],
+                        "last_message_at": latest["created_at"],
+                        "last_message_id": latest["_id"]
+                    }})
+            await repair_rooms(db, room_ids)
+            self.repair_count += len(room_ids)
+        except Exception as e:
+            print(f"❌ 채팅방 복구 실패 (다음 배치 후 재시도): {e}")
+            self._repair_room_ids |= room_ids
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ 채팅 메시지 배치 기록 오류: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # 대기 중인 메시지까지 기록한 뒤 종료
+        if self._task is not None:
+            self._stopping = True
+            self._flush_requested.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def metrics(self) -> dict:
+        return {
+            "submitted": self.submitted_count,
+            "written": self.written_count,
+            "failed": self.failed_count,
+            "pending": len(self.pending),
+            "flushes": self.flush_count,
+            "room_updates": self.room_update_count,
+            "rooms_repaired": self.repair_count,
+            "pending_repairs": len(self._repair_room_ids),
+            "avg_batch_size": round(self.written_count / self.flush_count, 2) if self.flush_count else 0.0
+        }
+
+chat_writer = ChatWriteBatcher(
+    flush_interval_ms=settings.CHAT_WRITE_FLUSH_INTERVAL_MS,
+    max_batch=settings.CHAT_WRITE_MAX_BATCH
+)
@@ -0,0 +1,183 @@
+# app/core/comment_counters.py
+"""
+게시글(board) 문서에 비정규화된 댓글 카운터를 유지/복구하는 모듈
+
+- comment_count: 게시글의 전체 댓글 수 (답글 포함)
+- reply_count: 답글(parent_comment_id가 있는 댓글) 수
+- last_reply_at: 가장 최근 답글 작성 시간 (created_at)
+- recent_reply_dates: 최근 답글 작성 시간(created_at) 목록 (최대 RECENT_REPLY_LIMIT개)
+
+목록 API는 comments 컬렉션을 조회하지 않고 위 필드만 읽습니다.
+기존 데이터는 아래 명령으로 한 번 백필해야 합니다.
+
+    python -m app.core.comment_counters
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.core.date_migration import created_since, to_utc_naive
+import asyncio
+
+# 최근 답글 판단 기준 (최근 3일)
+RECENT_REPLY_WINDOW = timedelta(days=3)
+
+# 게시글 문서에 보관할 최근 답글 시간 개수
+# (가득 찬 게시글의 recentReplyCount는 attach_recent_reply_stats가 comments에서 다시 셈)
+RECENT_REPLY_LIMIT = 20
+
+# 백필 시 한 번에 전송할 bulk_write 크기
+REPAIR_BATCH_SIZE = 500
+
+def initial_counter_fields() -> dict:
+    """새 게시글 생성 시 넣어 둘 카운터 기본값"""
+    return {
+        "comment_count": 0,
+        "reply_count": 0,
+        "last_reply_at": None,
+        "recent_reply_dates": []
+    }
+
+def _post_oid(post_id: str):
+    try:
+        return ObjectId(post_id)
+    except Exception:
+        return None
+
+def _is_reply(comment: dict) -> bool:
+    return bool(comment.get("parent_comment_id"))
+
+async def apply_comment_created(db, post_id: str, comment: dict):
+    """댓글 생성 후 게시글 카운터를 원자적으로 증가시킵니다."""
+    oid = _post_oid(post_id)
+    if oid is None:
+        return
+
+    update = {"$inc": {"comment_count": 1}}
+    if _is_reply(comment):
+        update["$inc"]["reply_count"] = 1
+        update["$max"] = {"last_reply_at": comment["created_at"]}
+        update["$push"] = {
+            "recent_reply_dates": {
+                "$each": [comment["created_at"]],
+                "$sort": 1,
+                "$slice": -RECENT_REPLY_LIMIT
+            }
+        }
+
+    await db["board"].update_one({"_id": oid}, update)
+
+async def apply_comment_deleted(db, post_id: str, comment: dict):
+    """댓글 삭제 후 게시글 카운터를 원자적으로 감소시킵니다."""
+    oid = _post_oid(post_id)
+    if oid is None:
+        return
+
+    if not _is_reply(comment):
+        await db["board"].update_one({"_id": oid}, {"$inc": {"comment_count": -1}})
+        return
+
+    # 답글 삭제는 드물기 때문에 마지막 답글 시간만 한 번 다시 조회합니다.
+    latest_reply = await db["comments"].find_one(
+        {"post_id": post_id, "parent_comment_id": {"$exists": True, "$ne": None}},
+        sort=[("created_at", -1)],
+        projection={"created_at": 1}
+    )
+    await db["board"].update_one(
+        {"_id": oid},
+        {
+            "$inc": {"comment_count": -1, "reply_count": -1},
+            "$set": {"last_reply_at": latest_reply["created_at"] if latest_reply else None},
+            "$pull": {"recent_reply_dates": comment.get("created_at")}
+        }
+    )
+
+def attach_comment_stats(post: dict, include_recent: bool = False) -> dict:
+    """
+    게시글 문서에 저장된 카운터로 응답 필드(commentCount 등)를 채웁니다.
+    include_recent가 True이면 최근 3일 답글 정보(hasRecentReplies, recentReplyCount)도 추가합니다.
+    """
+    post["commentCount"] = post.get("comment_count", 0)
+
+    if include_recent:
+        cutoff = datetime.utcnow() - RECENT_REPLY_WINDOW
+        recent_dates = [to_utc_naive(date) for date in post.get("recent_reply_dates") or []]
+        recent_reply_count = sum(1 for date in recent_dates if date and date >= cutoff)
+        post["hasRecentReplies"] = recent_reply_count > 0
+        post["recentReplyCount"] = recent_reply_count
+
+    return post
+
+async def attach_recent_reply_stats(db, posts: List[dict]) -> List[dict]:
+    """
+    attach_comment_stats(include_recent=True)를 적용하고, 보관된 최근 답글 시간이 RECENT_REPLY_LIMIT개로
+    가득 찬 게시글(최근 3일 답글이 그보다 많을 수 있음)만 comments에서 한 번의 집계로 정확히 다시 셉니다.
+    """
+    cutoff = datetime.utcnow() - RECENT_REPLY_WINDOW
+    saturated = []
+    for post in posts:
+        attach_comment_stats(post, include_recent=True)
+        if post["recentReplyCount"] >= RECENT_REPLY_LIMIT:
+            saturated.append(post)
+
+    if saturated:
+        pipeline = [
+            {"$match": {
+                "post_id": {"$in": [post["id"] for post in saturated]},
+                "parent_comment_id": {"$exists": True, "$ne": None},
+                **created_since(cutoff)
+            }},
+            {"$group": {"_id": "$post_id", "count": {"$sum": 1}}}
+        ]
+        counts = {row["_id"]: row["count"] async for row in db["comments"].aggregate(pipeline)}
+        for post in saturated:
+            post["recentReplyCount"] = max(post["recentReplyCount"], counts.get(post["id"], 0))
+
+    return posts
+
+async def rebuild_comment_counters(db) -> int:
+    """
+    comments 컬렉션을 기준으로 모든 게시글의 카운터를 다시 계산합니다.
+    카운터가 어긋났을 때 복구용으로도 사용합니다. 수정된 게시글 수를 반환합니다.
+    """
+    stats = {}
+    comments_cursor = db["comments"].find(
+        {},
+        projection={"post_id": 1, "parent_comment_id": 1, "created_at": 1}
+    ).sort("created_at", 1)
+
+    async for comment in comments_cursor:
+        entry = stats.setdefault(comment.get("post_id"), initial_counter_fields())
+        entry["comment_count"] += 1
+        if _is_reply(comment):
+            entry["reply_count"] += 1
+            entry["last_reply_at"] = comment.get("created_at")
+            entry["recent_reply_dates"].append(comment.get("created_at"))
+            del entry["recent_reply_dates"][:-RECENT_REPLY_LIMIT]
+
+    modified = 0
+    operations = []
+    posts_cursor = db["board"].find({}, projection={"_id": 1})
+    async for post in posts_cursor:
+        fields = stats.get(str(post["_id"]), initial_counter_fields())
+        operations.append(UpdateOne({"_id": post["_id"]}, {"$set": fields}))
+
+        if len(operations) >= REPAIR_BATCH_SIZE:
+            result = await db["board"].bulk_write(operations, ordered=False)
+            modified += result.modified_count
+            operations = []
+
+    if operations:
+        result = await db["board"].bulk_write(operations, ordered=False)
+        modified += result.modified_count
+
+    return modified
+
+# 직접 실행 시 백필/복구 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 게시글 댓글 카운터 재계산 시작...")
+    modified_count = asyncio.run(rebuild_comment_counters(db))
+    print(f"✅ 댓글 카운터 재계산 완료: {modified_count}개 게시글 수정됨")
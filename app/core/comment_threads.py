@@ -0,0 +1,166 @@
+# app/core/comment_threads.py
+"""
+댓글 스레드 구조 관리
+
+각 댓글은 다음 필드를 가집니다.
+- root_id: 최상위 댓글이면 None, 답글이면 스레드의 최상위 댓글 ID
+- depth: 최상위 댓글 0, 답글은 부모 depth + 1
+- thread_reply_count: (최상위 댓글만) 스레드에 달린 답글 수
+
+최상위 댓글은 (post_id, root_id=None)으로, 스레드의 답글은 (post_id, root_id)로
+(created_at, _id) 순서의 커서 페이지네이션으로 조회합니다.
+
+root_id가 없는 기존 댓글은 서버 시작 시 자동으로 백필되며, 아래 명령으로 직접 다시 계산할 수도 있습니다.
+
+    python -m app.core.comment_threads
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from pymongo import UpdateOne
+from fastapi import HTTPException
+from app.utils.pagination import encode_cursor, decode_cursor
+import asyncio
+
+# 백필 시 한 번에 전송할 bulk_write 크기
+BACKFILL_BATCH_SIZE = 500
+
+def thread_fields(parent_comment: Optional[dict]) -> dict:
+    """새 댓글에 넣을 스레드 필드 (parent_comment가 없으면 최상위 댓글)"""
+    if not parent_comment:
+        return {"root_id": None, "depth": 0, "thread_reply_count": 0}
+    return {
+        "root_id": parent_comment.get("root_id") or str(parent_comment["_id"]),
+        "depth": parent_comment.get("depth", 0) + 1
+    }
+
+async def apply_reply_created(db, comment: dict):
+    if comment.get("root_id"):
+        await db["comments"].update_one(
+            {"_id": ObjectId(comment["root_id"])},
+            {"$inc": {"thread_reply_count": 1}}
+        )
+
+async def apply_reply_deleted(db, comment: dict):
+    if comment.get("root_id"):
+        await db["comments"].update_one(
+            {"_id": ObjectId(comment["root_id"]), "thread_reply_count": {"$gt": 0}},
+            {"$inc": {"thread_reply_count": -1}}
+        )
+
+async def fetch_thread_page(db, query: dict, cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """query에 맞는 댓글을 (created_at, _id) 오름차순으로 한 페이지 조회하고 다음 커서를 반환합니다."""
+    query = dict(query)
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            last_created_at = datetime.fromisoformat(position["d"]) if position["d"] is not None else None
+            last_oid = ObjectId(position["id"])
+        except Exception:
+            raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+        if last_created_at is None:
+            # created_at이 없는 댓글(마이그레이션 전)은 오름차순에서 가장 앞에 오므로 _id로만 이어서 읽음
+            query["$or"] = [
+                {"created_at": None, "_id": {"$gt": last_oid}},
+                {"created_at": {"$ne": None}}
+            ]
+        else:
+            query["$or"] = [
+                {"created_at": {"$gt": last_created_at}},
+                {"created_at": last_created_at, "_id": {"$gt": last_oid}}
+            ]
+
+    comments = await db["comments"].find(query).sort([("created_at", 1), ("_id", 1)]).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        last_created_at = comments[-1].get("created_at")
+        next_cursor = encode_cursor({
+            "d": last_created_at.isoformat() if last_created_at else None,
+            "id": str(comments[-1]["_id"])
+        })
+
+    for comment in comments:
+        comment["id"] = str(comment["_id"])
+        del comment["_id"]
+
+    return comments, next_cursor
+
+def build_thread_tree(roots: List[dict], replies: List[dict]) -> List[dict]:
+    """최상위 댓글과 (작성 시간 오름차순) 답글 목록을 parent_comment_id 기준 트리로 묶습니다."""
+    comment_dict = {}
+    for comment in roots + replies:
+        comment["replies"] = []
+        comment_dict[comment["id"]] = comment
+
+    for reply in replies:
+        parent = comment_dict.get(reply.get("parent_comment_id"))
+        if parent is not None:
+            parent["replies"].append(reply)
+
+    return roots
+
+async def backfill_thread_fields(db) -> int:
+    """parent_comment_id를 따라 모든 댓글의 root_id/depth/thread_reply_count를 다시 계산합니다."""
+    parents = {}
+    async for comment in db["comments"].find({}, projection={"parent_comment_id": 1}):
+        parents[str(comment["_id"])] = comment.get("parent_comment_id")
+
+    def resolve(comment_id: str) -> Tuple[Optional[str], int]:
+        depth = 0
+        current = comment_id
+        seen = set()
+        while parents.get(current) and parents[current] in parents and current not in seen:
+            seen.add(current)
+            current = parents[current]
+            depth += 1
+        if current == comment_id:
+            return None, 0
+        return current, depth
+
+    resolved = {comment_id: resolve(comment_id) for comment_id in parents}
+    reply_counts = {}
+    for root_id, _ in resolved.values():
+        if root_id:
+            reply_counts[root_id] = reply_counts.get(root_id, 0) + 1
+
+    modified = 0
+    operations = []
+    for comment_id, (root_id, depth) in resolved.items():
+        fields = {"root_id": root_id, "depth": depth}
+        if root_id is None:
+            fields["thread_reply_count"] = reply_counts.get(comment_id, 0)
+        operations.append(UpdateOne({"_id": ObjectId(comment_id)}, {"$set": fields}))
+
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            result = await db["comments"].bulk_write(operations, ordered=False)
+            modified += result.modified_count
+            operations = []
+
+    if operations:
+        result = await db["comments"].bulk_write(operations, ordered=False)
+        modified += result.modified_count
+
+    return modified
+
+async def backfill_if_missing(db=None):
+    """root_id 필드가 없는 댓글이 있으면 (최초 배포 시) 백필합니다. 서버 시작 시 백그라운드로 실행됩니다."""
+    if db is None:
+        from app.core.database import db
+
+    try:
+        if await db["comments"].find_one({"root_id": {"$exists": False}}, projection={"_id": 1}):
+            modified_count = await backfill_thread_fields(db)
+            print(f"✅ 댓글 스레드 필드 백필: {modified_count}개 댓글")
+    except Exception as e:
+        print(f"❌ 댓글 스레드 필드 백필 오류: {e}")
+
+# 직접 실행 시 백필 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 댓글 스레드 필드 백필 시작...")
+    modified_count = asyncio.run(backfill_thread_fields(db))
+    print(f"✅ 댓글 스레드 필드 백필 완료: {modified_count}개 댓글 수정됨")
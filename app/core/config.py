@@ -12,6 +12,47 @@ class Settings:
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     DATABASE_NAME = os.getenv("DATABASE_NAME", "research_forest")
 
+    # 조회수 write-behind 버퍼 설정
+    # 조회수는 최대 VIEW_FLUSH_INTERVAL_MS 동안 메모리에만 있다가 한 번에 기록됩니다 (유실 허용 구간).
+    VIEW_FLUSH_INTERVAL_MS = int(os.getenv("VIEW_FLUSH_INTERVAL_MS", "1000"))
+    VIEW_FLUSH_MAX_EVENTS = int(os.getenv("VIEW_FLUSH_MAX_EVENTS", "500"))
+    VIEW_COOLDOWN_MAX_ENTRIES = int(os.getenv("VIEW_COOLDOWN_MAX_ENTRIES", "100000"))
+
+    # 단일 게시글 조회 캐시 설정
+    POST_CACHE_MAX_ENTRIES = int(os.getenv("POST_CACHE_MAX_ENTRIES", "1000"))
+    POST_CACHE_TTL_SEC = float(os.getenv("POST_CACHE_TTL_SEC", "30"))
+
+    # 게시글 삭제 cascade 작업 설정
+    CASCADE_BATCH_SIZE = int(os.getenv("CASCADE_BATCH_SIZE", "500"))
+    CASCADE_POLL_INTERVAL_SEC = float(os.getenv("CASCADE_POLL_INTERVAL_SEC", "5"))
+
+    # 게시글 일괄 등록 설정
+    BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+    BULK_IMPORT_MAX_ITEMS = int(os.getenv("BULK_IMPORT_MAX_ITEMS", "50000"))
+    # 일괄 등록을 사용할 수 있는 사용자 ID (쉼표로 구분, 비어 있으면 아무도 사용할 수 없음)
+    BULK_IMPORT_USER_IDS = [user_id.strip() for user_id in os.getenv("BULK_IMPORT_USER_IDS", "").split(",") if user_id.strip()]
+
+    # /api/activity/* 응답 캐시 설정
+    # TTL이 지나면 ACTIVITY_CACHE_STALE_SEC 동안은 이전 응답을 반환하며 백그라운드에서 갱신합니다.
+    ACTIVITY_CACHE_TTL_SEC = float(os.getenv("ACTIVITY_CACHE_TTL_SEC", "5"))
+    ACTIVITY_CACHE_STALE_SEC = float(os.getenv("ACTIVITY_CACHE_STALE_SEC", "30"))
+
+    # /ws/activity 구독자별 전송 대기 메시지 수 (넘으면 느린 클라이언트로 보고 연결 종료)
+    ACTIVITY_STREAM_QUEUE_SIZE = int(os.getenv("ACTIVITY_STREAM_QUEUE_SIZE", "100"))
+
+    # 채팅 메시지 group commit 설정
+    # CHAT_WRITE_FLUSH_INTERVAL_MS 동안 또는 CHAT_WRITE_MAX_BATCH개까지 모인 메시지를 한 번에 기록합니다.
+    CHAT_WRITE_FLUSH_INTERVAL_MS = int(os.getenv("CHAT_WRITE_FLUSH_INTERVAL_MS", "5"))
+    CHAT_WRITE_MAX_BATCH = int(os.getenv("CHAT_WRITE_MAX_BATCH", "500"))
+
+    # 오래된 채팅 메시지 압축 보관 설정 (python -m app.core.chat_archive)
+    CHAT_ARCHIVE_AFTER_DAYS = int(os.getenv("CHAT_ARCHIVE_AFTER_DAYS", "90"))
+    CHAT_ARCHIVE_BUCKET_SIZE = int(os.getenv("CHAT_ARCHIVE_BUCKET_SIZE", "200"))
+
+    # 첨부파일(GridFS) 설정
+    ATTACHMENT_MAX_BYTES = int(os.getenv("ATTACHMENT_MAX_BYTES", str(20 * 1024 * 1024)))
+    ATTACHMENT_READ_CHUNK = int(os.getenv("ATTACHMENT_READ_CHUNK", str(256 * 1024)))
+
     SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
     ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
@@ -1,134 +1,105 @@
 # app/core/database_setup.py
 """
-채팅 기능을 위한 MongoDB 데이터베이스 스키마 및 인덱스 설정
-"""
-
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.core.config import settings
-import asyncio
-
-async def setup_chat_database():
-    """채팅 관련 데이터베이스 컬렉션 및 인덱스 설정"""
-
-    from app.core.database import db
-
-    print("🔧 채팅 데이터베이스 설정 시작...")
-
-    try:
-        # 1. chat_rooms 컬렉션 설정
-        print("📁 chat_rooms 컬렉션 설정 중...")
-
-        # room_id에 유니크 인덱스 생성 (중복 방지)
-        try:
-            await db.chat_rooms.create_index("room_id", unique=True)
-            print("✅ room_id 유니크 인덱스 생성")
-        except Exception as e:
-            print(f"ℹ️ room_id 인덱스 이미 존재")
-
-        # 사용자별 채팅방 검색을 위한 복합 인덱스
-        try:
-            await db.chat_rooms.create_index([("user1_id", 1), ("user2_id", 1)])
-            print("✅ 사용자 복합 인덱스 생성")
-        except Exception as e:
-            print(f"ℹ️ 사용자 복합 인덱스 이미 존재")
-
-        # 최근 메시지 순 정렬을 위한 인덱스
-        try:
-            await db.chat_rooms.create_index([("last_message_at", -1)])
-            print("✅ 메시지 시간 인덱스 생성")
-        except Exception as e:
-            print(f"ℹ️ 메시지 시간 인덱스 이미 존재")
-
-        print("✅ chat_rooms 인덱스 생성 완료")
-
-
-        # 2. chat_messages 컬렉션 설정
-        print("📁 chat_messages 컬렉션 설정 중...")
-
-        # 채팅방별 메시지 조회를 위한 인덱스
-        try:
-            await db.chat_messages.create_index([("room_id", 1), ("created_at", 1)])
-            print("✅ 메시지 조회 인덱스 생성")
-        except Exception as e:
-            print(f"ℹ️ 메시지 조회 인덱스 이미 존재")
-
-        # 읽지 않은 메시지 카운트를 위한 인덱스
-        try:
-            await db.chat_messages.create_index([("room_id", 1), ("sender_id", 1), ("is_read", 1)])
-            print("✅ 읽지 않은 메시지 인덱스 생성")
-        except Exception as e:
-            print(f"ℹ️ 읽지 않은 메시지 인덱스 이미 존재")
+MongoDB 인덱스 마이그레이션 러너
 
-        # 메시지 생성 시간순 정렬 인덱스
-        try:
-            await db.chat_messages.create_index([("created_at", -1)])
-            print("✅ 메시지 시간순 인덱스 생성")
-        except Exception as e:
-            print(f"ℹ️ 메시지 시간순 인덱스 이미 존재")
+app/core/indexes.py 의 INDEX_REGISTRY와 실제 인덱스를 비교해서
+- 없는 인덱스는 백그라운드로 생성하고
+- 레지스트리에 없는 인덱스와 옵션이 다른 인덱스는 보고만 합니다 (자동 삭제하지 않음).
 
-        print("✅ chat_messages 인덱스 생성 완료")
+서버 시작 시 자동 실행되며, 배포 전에 아래처럼 변경 사항만 확인할 수 있습니다.
 
+    python -m app.core.database_setup --dry-run
+"""
 
-        # 3. 기존 users 컬렉션 확인
-        print("👤 users 컬렉션 확인 중...")
+from pymongo import IndexModel
+from app.core.indexes import INDEX_REGISTRY, INDEX_OPTIONS, index_name
+import argparse
+import asyncio
 
-        # 사용자 검색을 위한 인덱스 (이미 있을 수 있음)
+async def diff_collection_indexes(db, collection_name: str, specs: list) -> dict:
+    """한 컬렉션의 선언된 인덱스와 실제 인덱스를 비교합니다."""
+    existing = {}
+    if collection_name in await db.list_collection_names():
+        async for index in db[collection_name].list_indexes():
+            existing[index["name"]] = index
+
+    declared = {}
+    for spec in specs:
+        declared[index_name(spec["keys"])] = spec
+
+    missing = [spec for name, spec in declared.items() if name not in existing]
+    extra = [name for name in existing if name not in declared and name != "_id_"]
+    changed = []
+    for name, spec in declared.items():
+        if name not in existing:
+            continue
+        for option in INDEX_OPTIONS:
+            if spec.get(option) != existing[name].get(option):
+                changed.append((name, option, existing[name].get(option), spec.get(option)))
+
+    return {"missing": missing, "extra": extra, "changed": changed}
+
+async def reconcile_indexes(db=None, dry_run: bool = False) -> bool:
+    """
+    INDEX_REGISTRY 기준으로 인덱스를 맞춥니다.
+    dry_run이면 차이만 출력하고 아무것도 생성하지 않습니다.
+    모든 누락 인덱스가 정상 생성되면(또는 dry_run이면) True를 반환합니다.
+    """
+    if db is None:
+        from app.core.database import db
+
+    print(f"🔧 인덱스 점검 시작{' (dry-run)' if dry_run else ''}...")
+    ok = True
+
+    for collection_name, specs in INDEX_REGISTRY.items():
+        diff = await diff_collection_indexes(db, collection_name, specs)
+
+        for spec in diff["missing"]:
+            options = {option: spec[option] for option in INDEX_OPTIONS if option in spec}
+            print(f"  + {collection_name}.{index_name(spec['keys'])} {options or ''}")
+        for name in diff["extra"]:
+            print(f"  ? {collection_name}.{name} (레지스트리에 없음, 유지)")
+        for name, option, current, expected in diff["changed"]:
+            print(f"  ~ {collection_name}.{name} {option}: {current} -> {expected} (수동 재생성 필요)")
+
+        if dry_run or not diff["missing"]:
+            continue
+
+        models = [
+            IndexModel(
+                spec["keys"],
+                name=index_name(spec["keys"]),
+                background=True,
+                **{option: value for option, value in spec.items() if option != "keys"}
+            )
+            for spec in diff["missing"]
+        ]
         try:
-            await db.users.create_index("email", unique=True)
-            print("✅ users 이메일 인덱스 확인/생성 완료")
+            await db[collection_name].create_indexes(models)
+            print(f"✅ {collection_name} 인덱스 {len(models)}개 생성")
         except Exception as e:
-            print(f"ℹ️ users 이메일 인덱스 이미 존재: {e}")
-
-
-        # 4. 데이터베이스 상태 확인
-        print("\n📊 데이터베이스 상태 확인:")
-
-        # 컬렉션 목록 출력
-        collections = await db.list_collection_names()
-        print(f"📁 생성된 컬렉션: {collections}")
+            # 유니크 인덱스는 기존 중복 데이터가 있으면 실패하므로 정리 후 다시 실행해야 합니다.
+            ok = False
+            print(f"❌ {collection_name} 인덱스 생성 실패: {e}")
 
-        # 인덱스 확인
-        chat_rooms_indexes = await db.chat_rooms.list_indexes().to_list(length=None)
-        chat_messages_indexes = await db.chat_messages.list_indexes().to_list(length=None)
-
-        print(f"🔍 chat_rooms 인덱스 수: {len(chat_rooms_indexes)}")
-        print(f"🔍 chat_messages 인덱스 수: {len(chat_messages_indexes)}")
-
-
-        # 5. 테스트 데이터 생성 (선택사항)
-        print("\n🧪 테스트 데이터 확인...")
-
-        chat_rooms_count = await db.chat_rooms.count_documents({})
-        chat_messages_count = await db.chat_messages.count_documents({})
-        users_count = await db.users.count_documents({})
-
-        print(f"👥 사용자 수: {users_count}")
-        print(f"💬 채팅방 수: {chat_rooms_count}")
-        print(f"📝 메시지 수: {chat_messages_count}")
-
-        print("\n✅ 채팅 데이터베이스 설정 완료!")
-        print("🚀 이제 채팅 기능을 사용할 수 있습니다!")
-
-        return True
-
-    except Exception as e:
-        print(f"❌ 데이터베이스 설정 오류: {e}")
-        return False
-
-    finally:
-        pass  # DB 연결은 앱 전체에서 공유하므로 여기서 닫지 않음
+    print("✅ 인덱스 점검 완료!")
+    return ok
 
 # 직접 실행 시 스크립트
 if __name__ == "__main__":
-    print("🗄️ 채팅 데이터베이스 초기화 스크립트")
+    parser = argparse.ArgumentParser(description="MongoDB 인덱스 마이그레이션")
+    parser.add_argument("--dry-run", action="store_true", help="생성하지 않고 차이만 출력")
+    args = parser.parse_args()
+
+    print("🗄️ 데이터베이스 인덱스 마이그레이션 스크립트")
     print("=" * 50)
 
-    result = asyncio.run(setup_chat_database())
+    result = asyncio.run(reconcile_indexes(dry_run=args.dry_run))
 
     if result:
         print("\n🎉 데이터베이스 설정이 완료되었습니다!")
         print("이제 서버를 시작할 수 있습니다:")
         print("python run_server.py")
     else:
-        print("\n😞 데이터베이스 설정에 실패했습니다.")
-        print("MongoDB 연결을 확인해주세요.")
+        print("\n😞 일부 인덱스 생성에 실패했습니다.")
+        print("MongoDB 연결과 중복 데이터를 확인해주세요.")
@@ -0,0 +1,144 @@
+# app/core/date_migration.py
+"""
+board/comments 날짜 필드 온라인 마이그레이션
+
+기존에는 date 필드에 서울 시간 ISO 문자열만 저장했습니다.
+이제 created_at(BSON datetime)을 함께 저장하고 범위 조회/정렬은 created_at으로 합니다.
+응답 호환을 위해 date 문자열은 계속 저장합니다.
+
+이 마이그레이션은
+- created_at이 없는 board/comments 문서에 date를 변환해 채우고
+- 게시글의 답글 카운터(last_reply_at, recent_reply_dates)에 남은 문자열도 datetime으로 바꿉니다.
+해석할 수 없는 date 문자열은 문서 _id의 생성 시각으로 대신하고 원래 문자열은 그대로 둡니다.
+마이그레이션이 끝나기 전까지 created_since()는 created_at이 없는 문서의 date 문자열도 함께 비교합니다.
+조건에 맞는 문서만 배치로 처리하므로 서비스 중에 여러 번 실행해도 안전하고, 중단되면 이어서 처리합니다.
+서버 시작 시 백그라운드로 실행되며 직접 실행할 수도 있습니다.
+
+    python -m app.core.date_migration
+"""
+
+from datetime import datetime
+from pymongo import UpdateOne
+import asyncio
+import pytz
+
+# 한 번에 처리할 문서 수
+MIGRATION_BATCH_SIZE = 500
+
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# created_at 마이그레이션이 끝났는지 여부 (끝나기 전에는 범위 조회에 date 문자열도 함께 비교)
+_migration_complete = False
+
+def to_utc_naive(value):
+    """ISO 문자열 또는 datetime을 UTC 기준 naive datetime(MongoDB가 돌려주는 형식)으로 변환합니다."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(pytz.UTC).replace(tzinfo=None)
+    return value
+
+def created_since(cutoff: datetime) -> dict:
+    """
+    created_at >= cutoff(UTC naive) 조건
+    마이그레이션이 끝나기 전에는 created_at이 없는 문서의 date 문자열(서울 시간 ISO)도 비교합니다.
+    """
+    if _migration_complete:
+        return {"created_at": {"$gte": cutoff}}
+    return {"$or": [
+        {"created_at": {"$gte": cutoff}},
+        {"created_at": {"$exists": False}, "date": {"$gte": pytz.UTC.localize(cutoff).astimezone(seoul_tz).isoformat()}}
+    ]}
+
+async def _latest_reply_at(db, post_id: str):
+    reply = await db["comments"].find_one(
+        {"post_id": post_id, "parent_comment_id": {"$exists": True, "$ne": None}},
+        sort=[("created_at", -1)],
+        projection={"created_at": 1}
+    )
+    return to_utc_naive(reply.get("created_at")) if reply else None
+
+async def _migrate_created_at(db, collection_name: str) -> int:
+    migrated = 0
+    while True:
+        docs = await db[collection_name].find(
+            {"created_at": {"$exists": False}, "date": {"$type": "string"}},
+            projection={"date": 1}
+        ).limit(MIGRATION_BATCH_SIZE).to_list(MIGRATION_BATCH_SIZE)
+        if not docs:
+            return migrated
+
+        operations = []
+        for doc in docs:
+            # 해석할 수 없는 날짜는 문서 _id의 생성 시각으로 대신함 (date 문자열은 그대로 남음)
+            created_at = to_utc_naive(doc["date"]) or doc["_id"].generation_time.replace(tzinfo=None)
+            operations.append(UpdateOne(
+                {"_id": doc["_id"], "created_at": {"$exists": False}},
+                {"$set": {"created_at": created_at}}
+            ))
+        result = await db[collection_name].bulk_write(operations, ordered=False)
+        migrated += result.modified_count
+
+async def _migrate_reply_counters(db) -> int:
+    migrated = 0
+    while True:
+        posts = await db["board"].find(
+            {"$or": [
+                {"last_reply_at": {"$type": "string"}},
+                {"recent_reply_dates": {"$type": "string"}}
+            ]},
+            projection={"last_reply_at": 1, "recent_reply_dates": 1}
+        ).limit(MIGRATION_BATCH_SIZE).to_list(MIGRATION_BATCH_SIZE)
+        if not posts:
+            return migrated
+
+        operations = []
+        for post in posts:
+            recent_dates = sorted(
+                date for date in (to_utc_naive(date) for date in post.get("recent_reply_dates") or []) if date is not None
+            )
+            last_reply_at = to_utc_naive(post.get("last_reply_at"))
+            if last_reply_at is None and post.get("last_reply_at") is not None:
+                # 해석할 수 없는 값은 null로 지우지 않고 가장 최근 답글 시간으로 대신함
+                last_reply_at = await _latest_reply_at(db, str(post["_id"])) or (recent_dates[-1] if recent_dates else None)
+            operations.append(UpdateOne(
+                {"_id": post["_id"]},
+                {"$set": {
+                    "last_reply_at": last_reply_at,
+                    "recent_reply_dates": recent_dates
+                }}
+            ))
+        result = await db["board"].bulk_write(operations, ordered=False)
+        migrated += result.modified_count
+
+async def migrate_dates(db=None) -> dict:
+    global _migration_complete
+    if db is None:
+        from app.core.database import db
+
+    try:
+        result = {
+            "board": await _migrate_created_at(db, "board"),
+            "comments": await _migrate_created_at(db, "comments"),
+            "reply_counters": await _migrate_reply_counters(db)
+        }
+    except Exception as e:
+        print(f"❌ 날짜 마이그레이션 오류: {e}")
+        return {}
+
+    _migration_complete = True
+
+    if any(result.values()):
+        print(f"✅ 날짜 마이그레이션: {result}")
+    return result
+
+# 직접 실행 시 마이그레이션 스크립트
+if __name__ == "__main__":
+    print("🔧 board/comments created_at 마이그레이션 시작...")
+    migrated_counts = asyncio.run(migrate_dates())
+    print(f"✅ 마이그레이션 완료: {migrated_counts}")
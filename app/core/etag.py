@@ -0,0 +1,142 @@
+# app/core/etag.py
+"""
+목록 API용 ETag / 조건부 GET
+
+컬렉션별 변경 카운터(collection_versions)를 쓰기 작업에서 올려 두고,
+ConditionalGetMiddleware가 등록된 GET 경로에 대해 다음과 같이 처리합니다.
+- 관련 컬렉션 버전 + 쿼리 문자열 + 로그인 토큰으로 약한 ETag를 만들고
+- If-None-Match가 일치하면 라우터를 실행하지 않고 바로 304를 반환합니다.
+- 그렇지 않으면 응답에 ETag를 붙이고, 응답 크기와 처리 시간을 기록해 304로 절약한 양을 추정합니다.
+
+버전은 프로세스 메모리에 있으며 프로세스 시작 ID가 ETag에 포함되므로 재시작하면 모두 무효화됩니다.
+여러 인스턴스로 실행하면 다른 인스턴스의 쓰기는 반영되지 않으므로 단일 인스턴스 배포를 전제로 합니다.
+조회수(app.core.view_buffer)는 매 주기 바뀌므로 버전을 올리지 않습니다. 버전을 올리면 목록 ETag가 거의 항상
+달라져 304가 나오지 않기 때문이며, 대신 304 응답의 조회수는 다음 게시글/댓글/좋아요 변경 때까지 늦게 반영됩니다.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+import hashlib
+import time
+import uuid
+
+class CollectionVersions:
+    def __init__(self):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, *collections: str):
+        for name in collections:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def tag(self, collections: Iterable[str]) -> str:
+        return ".".join(str(self._versions.get(name, 0)) for name in collections)
+
+collection_versions = CollectionVersions()
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # 약한 비교: W/ 접두사를 무시하고 비교
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+class ConditionalGetMiddleware:
+    """
+    ETag를 적용할 경로 -> 관련 컬렉션 목록을 받아 조건부 GET을 처리하는 ASGI 미들웨어
+
+        app.add_middleware(ConditionalGetMiddleware, routes={"/api/board/": ("board",)})
+    """
+
+    # 절약량 추정을 위해 기억해 둘 (경로, 쿼리)별 최근 응답 수
+    MAX_TRACKED_RESPONSES = 1000
+
+    def __init__(self, app, routes: Dict[str, Tuple[str, ...]]):
+        self.app = app
+        self.routes = routes
+
+        # (경로, 쿼리) -> (응답 바이트 수, 처리 시간 ms)
+        self._last_full: "OrderedDict[Tuple[str, str], Tuple[int, float]]" = OrderedDict()
+
+        self.full_count = 0
+        self.not_modified_count = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+        self.time_saved_ms = 0.0
+        middleware_instances.append(self)
+
+    def _make_etag(self, path: str, query: str, cookie: str) -> str:
+        digest = hashlib.sha1(f"{query}|{cookie}".encode("utf-8")).hexdigest()[:12]
+        version = collection_versions.tag(self.routes[path])
+        return f'W/"{collection_versions.boot_id}-{version}-{digest}"'
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
+        etag = self._make_etag(path, query, headers.get("cookie", ""))
+        key = (path, query)
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            self.not_modified_count += 1
+            size, elapsed_ms = self._last_full.get(key, (0, 0.0))
+            self.bytes_saved += size
+            self.time_saved_ms += elapsed_ms
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", etag.encode("latin-1")), (b"cache-control", b"no-cache")]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        started = time.perf_counter()
+        state = {"status": 200, "size": 0}
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                if message["status"] == 200:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"etag", etag.encode("latin-1")),
+                        (b"cache-control", b"no-cache")
+                    ]
+            elif message["type"] == "http.response.body":
+                state["size"] += len(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+        if state["status"] == 200:
+            self.full_count += 1
+            self.bytes_sent += state["size"]
+            self._last_full[key] = (state["size"], (time.perf_counter() - started) * 1000)
+            self._last_full.move_to_end(key)
+            while len(self._last_full) > self.MAX_TRACKED_RESPONSES:
+                self._last_full.popitem(last=False)
+
+    def metrics(self) -> dict:
+        return {
+            "full_responses": self.full_count,
+            "not_modified": self.not_modified_count,
+            "bytes_sent": self.bytes_sent,
+            "bytes_saved_estimate": self.bytes_saved,
+            "handler_ms_saved_estimate": round(self.time_saved_ms, 2)
+        }
+
+# Starlette가 미들웨어를 직접 생성하므로 metrics 조회용으로 인스턴스를 보관
+middleware_instances = []
+
+def etag_metrics() -> dict:
+    return middleware_instances[-1].metrics() if middleware_instances else {}
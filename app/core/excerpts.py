@@ -0,0 +1,47 @@
+# app/core/excerpts.py
+"""
+게시글 목록용 요약(excerpt) 백필
+
+새 게시글은 create_post/update_post에서 excerpt를 저장합니다.
+excerpt가 없는 기존 게시글은 아래 명령으로 채웁니다.
+
+    python -m app.core.excerpts
+"""
+
+from pymongo import UpdateOne
+from app.utils.text import make_excerpt
+import asyncio
+
+# 백필 시 한 번에 전송할 bulk_write 크기
+BACKFILL_BATCH_SIZE = 500
+
+async def backfill_excerpts(db) -> int:
+    """excerpt가 없는 게시글에 excerpt를 채웁니다. 수정한 게시글 수를 반환합니다."""
+    modified = 0
+    operations = []
+    posts_cursor = db["board"].find({"excerpt": {"$exists": False}}, projection={"content": 1})
+
+    async for post in posts_cursor:
+        operations.append(UpdateOne(
+            {"_id": post["_id"]},
+            {"$set": {"excerpt": make_excerpt(post.get("content", ""))}}
+        ))
+
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            result = await db["board"].bulk_write(operations, ordered=False)
+            modified += result.modified_count
+            operations = []
+
+    if operations:
+        result = await db["board"].bulk_write(operations, ordered=False)
+        modified += result.modified_count
+
+    return modified
+
+# 직접 실행 시 백필 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 게시글 요약(excerpt) 백필 시작...")
+    modified_count = asyncio.run(backfill_excerpts(db))
+    print(f"✅ 게시글 요약 백필 완료: {modified_count}개 게시글 수정됨")
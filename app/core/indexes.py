@@ -0,0 +1,134 @@
+# app/core/indexes.py
+"""
+컬렉션별 인덱스 선언 (단일 레지스트리)
+
+각 라우터의 쿼리가 필요로 하는 인덱스를 여기에 모아 둡니다.
+실제 생성/비교는 app/core/database_setup.py 의 reconcile_indexes()가 담당합니다.
+
+인덱스 항목 형식:
+    {"keys": [(필드, 방향), ...], "unique": bool (선택), "expireAfterSeconds": int (선택), ...}
+"keys" 이외의 항목은 create_index 옵션으로 그대로 전달되며, 비교는 INDEX_OPTIONS만 합니다.
+인덱스 이름은 pymongo 기본 규칙(필드_방향_...)으로 생성되어 기존 인덱스와 이름으로 비교됩니다.
+"""
+
+INDEX_REGISTRY = {
+    # board.py - 목록/홈 화면/통합 조회, activity.py - 최근 게시글
+    "board": [
+        # GET /api/board/?category= keyset 페이지네이션
+        {"keys": [("board", 1), ("post_number", -1), ("_id", -1)]},
+        # GET /api/board/ (카테고리 없음) keyset 페이지네이션
+        {"keys": [("post_number", -1), ("_id", -1)]},
+        # /all/by-category 자유게시판
+        {"keys": [("board", 1), ("created_at", -1)]},
+        # /all/by-category 연구 세부 카테고리
+        {"keys": [("board", 1), ("subcategory", 1), ("created_at", -1)]},
+        # /all/recent, /api/activity/recent-posts 날짜 범위 + 정렬
+        {"keys": [("created_at", -1)]},
+    ],
+
+    # board.py - 댓글 목록/카운터, activity.py - 최근 댓글
+    "comments": [
+        # 답글 카운터 재계산 (게시글별 최근 답글)
+        {"keys": [("post_id", 1), ("created_at", 1)]},
+        # 최상위 댓글(root_id=None) / 스레드별 답글 커서 페이지네이션
+        {"keys": [("post_id", 1), ("root_id", 1), ("created_at", 1), ("_id", 1)]},
+        # /api/activity/recent-comments 최근 30일 범위
+        {"keys": [("created_at", -1)]},
+    ],
+
+    # board.py - 좋아요 토글 (사용자당 게시글 하나에 좋아요 하나)
+    "post_likes": [
+        {"keys": [("post_id", 1), ("identifier", 1)], "unique": True},
+    ],
+
+    # board.py - 게시판별 post_number 시퀀스는 _id로만 조회하므로 기본 _id 인덱스로 충분합니다.
+    "counters": [],
+
+    # search.py - 게시글/댓글 bigram 검색 색인 (형태소 분석/불용어 없이 토큰 그대로 색인)
+    "post_search": [
+        {
+            "keys": [("title_terms", "text"), ("content_terms", "text"), ("comment_terms", "text")],
+            "weights": {"title_terms": 10, "content_terms": 3, "comment_terms": 1},
+            "default_language": "none"
+        },
+    ],
+
+    # cascade.py - 게시글 삭제 작업 (대기/만료된 작업 조회, 게시글당 작업 하나)
+    "cascade_jobs": [
+        {"keys": [("status", 1), ("created_at", 1)]},
+        {"keys": [("type", 1), ("post_id", 1)], "unique": True},
+    ],
+
+    # auth.py - 이메일 인증 코드
+    "user_verification": [
+        {"keys": [("email", 1), ("role", 1)]},
+        # 만료된 인증 코드 자동 삭제 (expires_at 시각에 삭제)
+        {"keys": [("expires_at", 1)], "expireAfterSeconds": 0},
+    ],
+
+    # auth.py - 로그인/중복 확인, activity.py - 최근 가입자
+    "users": [
+        {"keys": [("email", 1)], "unique": True},
+        {"keys": [("name", 1)]},
+        {"keys": [("is_active", 1), ("created_at", -1)]},
+    ],
+
+    # chat.py, websocket_native.py - 채팅방
+    "chat_rooms": [
+        # 방 ID 중복 방지
+        {"keys": [("room_id", 1)], "unique": True},
+        # 사용자별 채팅방 목록 (participants 멀티키, 최근 메시지 순 keyset 페이지네이션)
+        {"keys": [("participants", 1), ("last_message_at", -1), ("_id", -1)]},
+        # 최근 메시지 순 정렬
+        {"keys": [("last_message_at", -1)]},
+    ],
+
+    # chat.py, websocket_native.py - 채팅 메시지
+    "chat_messages": [
+        # 채팅방별 메시지 keyset 페이지네이션 (created_at이 같으면 _id 순)
+        {"keys": [("room_id", 1), ("created_at", 1), ("_id", 1)]},
+        # 메시지 생성 시간순 정렬, 보관 대상(오래된 메시지) 채팅방 조회
+        {"keys": [("created_at", -1)]},
+    ],
+
+    # chat_archive.py - 오래된 채팅 메시지 압축 버킷
+    "chat_archive": [
+        # 버킷 중복 저장 방지 (보관 작업 재실행/동시 실행)
+        {"keys": [("room_id", 1), ("first_id", 1)], "unique": True},
+        # 이전 메시지 방향(before) 조회
+        {"keys": [("room_id", 1), ("first_created_at", -1), ("first_id", -1)]},
+        # 이후 메시지 방향(after) 조회, 마지막 버킷 조회
+        {"keys": [("room_id", 1), ("last_created_at", -1), ("last_id", -1)]},
+    ],
+
+    # activity_events.py - /api/activity/* 최근 활동 피드
+    "activity_events": [
+        # 활동 종류별 (created_at, _id) 역순 커서 페이지네이션
+        {"keys": [("type", 1), ("created_at", -1), ("_id", -1)]},
+        # 원본(게시글/댓글이 달린 게시글/사용자)당 활동 하나
+        {"keys": [("type", 1), ("source_id", 1)], "unique": True},
+        # 게시글 수정/삭제 시 관련 활동 갱신
+        {"keys": [("payload.post_id", 1)]},
+        # 보관 기간(ACTIVITY_RETENTION, 30일)이 지난 활동 자동 삭제
+        {"keys": [("created_at", 1)], "expireAfterSeconds": 30 * 24 * 60 * 60},
+    ],
+
+    # attachments.py - 첨부파일 GridFS 버킷
+    "attachments.files": [
+        # GridFS 기본 인덱스
+        {"keys": [("filename", 1), ("uploadDate", 1)]},
+        # 게시글 삭제 시 연결된 첨부파일 정리
+        {"keys": [("metadata.post_id", 1)]},
+    ],
+    "attachments.chunks": [
+        # GridFS 기본 인덱스
+        {"keys": [("files_id", 1), ("n", 1)], "unique": True},
+    ],
+}
+
+def index_name(keys) -> str:
+    """pymongo 기본 인덱스 이름 규칙 (예: room_id_1_created_at_-1)"""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+# 레지스트리에서 비교하는 인덱스 옵션
+INDEX_OPTIONS = ("unique", "expireAfterSeconds")
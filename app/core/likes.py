@@ -0,0 +1,120 @@
+# app/core/likes.py
+"""
+게시글 좋아요 상태 관리
+
+좋아요 기록(post_likes)은 (post_id, identifier) 유니크 인덱스로 보호되며,
+게시글의 likes 카운터는 좋아요 기록이 실제로 추가/삭제된 경우에만 변경됩니다.
+
+유니크 인덱스 생성 전에 기존 중복 기록을 정리하려면 아래 명령을 실행합니다.
+
+    python -m app.core.likes
+"""
+
+from datetime import datetime
+from typing import List, Set
+from bson import ObjectId
+from pymongo import UpdateOne, DeleteOne
+from pymongo.errors import DuplicateKeyError
+from app.core.post_cache import post_cache
+from app.core.etag import collection_versions
+import asyncio
+
+async def toggle_like_record(db, post_oid: ObjectId, post_id: str, user_id: str) -> str:
+    """
+    좋아요를 토글하고 "liked" 또는 "unliked"를 반환합니다.
+    삭제를 먼저 시도하고, 지울 기록이 없을 때만 추가하므로 동시 요청에도 카운터가 어긋나지 않습니다.
+    """
+    like_collection = db["post_likes"]
+    board_collection = db["board"]
+
+    deleted = await like_collection.delete_one({"post_id": post_id, "identifier": user_id})
+    if deleted.deleted_count:
+        await board_collection.update_one({"_id": post_oid, "likes": {"$gt": 0}}, {"$inc": {"likes": -1}})
+        post_cache.adjust(post_id, "likes", -1)
+        collection_versions.bump("board")
+        return "unliked"
+
+    try:
+        await like_collection.insert_one({
+            "post_id": post_id,
+            "identifier": user_id,
+            "liked_at": datetime.utcnow()
+        })
+    except DuplicateKeyError:
+        # 동시에 들어온 다른 요청이 이미 좋아요를 기록함 - 카운터는 그 요청이 반영
+        return "liked"
+
+    await board_collection.update_one({"_id": post_oid}, {"$inc": {"likes": 1}})
+    post_cache.adjust(post_id, "likes", 1)
+    collection_versions.bump("board")
+    return "liked"
+
+async def liked_post_ids(db, post_ids: List[str], user_id: str) -> Set[str]:
+    """주어진 게시글 중 사용자가 좋아요한 게시글 ID를 $in 쿼리 한 번으로 조회합니다."""
+    if not post_ids or not user_id:
+        return set()
+
+    cursor = db["post_likes"].find(
+        {"identifier": user_id, "post_id": {"$in": list(post_ids)}},
+        projection={"post_id": 1, "_id": 0}
+    )
+    return {record["post_id"] async for record in cursor}
+
+async def mark_liked_by_me(db, posts: List[dict], user, loaders=None) -> List[dict]:
+    """
+    응답용 게시글 목록(id 필드 변환 후)에 likedByMe를 표시합니다. 비로그인이면 그대로 반환합니다.
+    loaders(app.core.loaders.RequestLoaders)를 넘기면 같은 요청 안의 조회와 합쳐지고 결과가 재사용됩니다.
+    """
+    if not user or not posts:
+        return posts
+
+    post_ids = [post["id"] for post in posts]
+    if loaders is not None:
+        flags = await loaders.liked_by(user["id"]).load_many(post_ids)
+        liked = {post_id for post_id, flag in zip(post_ids, flags) if flag}
+    else:
+        liked = await liked_post_ids(db, post_ids, user["id"])
+    for post in posts:
+        post["likedByMe"] = post["id"] in liked
+    return posts
+
+async def dedupe_likes(db) -> int:
+    """중복된 좋아요 기록을 정리하고 게시글 likes 카운터를 다시 계산합니다. 삭제한 기록 수를 반환합니다."""
+    pipeline = [
+        {"$group": {
+            "_id": {"post_id": "$post_id", "identifier": "$identifier"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    delete_operations = []
+    async for group in db["post_likes"].aggregate(pipeline):
+        delete_operations.extend(DeleteOne({"_id": oid}) for oid in group["ids"][1:])
+
+    if delete_operations:
+        await db["post_likes"].bulk_write(delete_operations, ordered=False)
+
+    like_counts = {}
+    async for group in db["post_likes"].aggregate([{"$group": {"_id": "$post_id", "count": {"$sum": 1}}}]):
+        like_counts[group["_id"]] = group["count"]
+
+    update_operations = []
+    async for post in db["board"].find({}, projection={"_id": 1}):
+        update_operations.append(UpdateOne(
+            {"_id": post["_id"]},
+            {"$set": {"likes": like_counts.get(str(post["_id"]), 0)}}
+        ))
+    if update_operations:
+        await db["board"].bulk_write(update_operations, ordered=False)
+
+    return len(delete_operations)
+
+# 직접 실행 시 중복 정리 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 좋아요 중복 기록 정리 시작...")
+    removed_count = asyncio.run(dedupe_likes(db))
+    print(f"✅ 중복 좋아요 {removed_count}개 삭제, likes 카운터 재계산 완료")
+    print("이제 인덱스를 생성할 수 있습니다: python -m app.core.database_setup")
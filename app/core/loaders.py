@@ -0,0 +1,130 @@
+# app/core/loaders.py
+"""
+요청 단위 배치 조회 (DataLoader)
+
+같은 이벤트 루프 tick 안에서 들어온 load(key) 호출을 모아 batch_fn 한 번($in 쿼리 한 번)으로 조회하고,
+요청이 끝날 때까지 결과를 기억합니다. 같은 키를 다시 요청하면 DB를 조회하지 않습니다.
+
+라우터에서는 get_loaders 의존성으로 요청마다 새 RequestLoaders를 받아 사용합니다.
+
+    async def endpoint(loaders: RequestLoaders = Depends(get_loaders)):
+        posts = await loaders.posts.load_many(post_ids)
+
+반환되는 문서는 같은 요청 안에서 공유되므로 수정할 때는 복사해서 사용합니다.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+from bson import ObjectId
+from fastapi import Depends
+from app.core.database import get_database
+import asyncio
+
+class DataLoader:
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]):
+        """batch_fn(keys)는 {key: value} dict를 반환합니다. 없는 키는 None으로 처리됩니다."""
+        self.batch_fn = batch_fn
+        self._results: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        # 실행 중인 조회 작업 (GC 방지용 참조)
+        self._dispatching = set()
+
+        # 계측용: 실제로 실행된 batch_fn 호출 수 / 요청된 키 수
+        self.batch_count = 0
+        self.load_count = 0
+
+    def load(self, key: Hashable) -> Awaitable[Any]:
+        self.load_count += 1
+        if key in self._results:
+            return self._results[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._results[key] = future
+        self._queue.append(key)
+        if len(self._queue) == 1:
+            # 현재 tick에 들어오는 load 호출을 모은 뒤 한 번에 조회
+            loop.call_soon(self._schedule_dispatch)
+        return future
+
+    def _schedule_dispatch(self):
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    def prime(self, key: Hashable, value: Any):
+        """이미 읽은 값을 넣어 두어 같은 요청 안의 load(key)가 DB를 조회하지 않게 합니다."""
+        if key not in self._results:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._results[key] = future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        self.batch_count += 1
+        try:
+            results = await self.batch_fn(keys)
+        except BaseException as e:
+            for key in keys:
+                # 실패한 키는 기억하지 않아 다시 요청할 수 있게 함
+                future = self._results.pop(key)
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key in keys:
+            self._results[key].set_result(results.get(key))
+
+def _object_ids(keys: Iterable[str]) -> List[ObjectId]:
+    oids = []
+    for key in keys:
+        try:
+            oids.append(ObjectId(key))
+        except Exception:
+            pass
+    return oids
+
+def post_loader(db, projection: Optional[dict] = None) -> DataLoader:
+    """게시글 ID(str) -> 숨김 처리되지 않은 board 문서"""
+    async def batch(keys):
+        query = {"_id": {"$in": _object_ids(keys)}, "deleted": {"$ne": True}}
+        return {str(post["_id"]): post async for post in db["board"].find(query, projection)}
+    return DataLoader(batch)
+
+def liked_loader(db, user_id: str) -> DataLoader:
+    """게시글 ID(str) -> user_id가 좋아요했는지 여부"""
+    async def batch(keys):
+        cursor = db["post_likes"].find(
+            {"identifier": user_id, "post_id": {"$in": list(keys)}},
+            projection={"post_id": 1, "_id": 0}
+        )
+        liked = {record["post_id"] async for record in cursor}
+        return {key: key in liked for key in keys}
+    return DataLoader(batch)
+
+class RequestLoaders:
+    """요청 하나에서 공유하는 컬렉션별 DataLoader 모음"""
+
+    def __init__(self, db):
+        self.db = db
+        self.posts = post_loader(db)
+        self._liked: Dict[str, DataLoader] = {}
+
+    def liked_by(self, user_id: str) -> DataLoader:
+        if user_id not in self._liked:
+            self._liked[user_id] = liked_loader(self.db, user_id)
+        return self._liked[user_id]
+
+    def stats(self) -> dict:
+        loaders = {"posts": self.posts}
+        loaders.update({f"liked:{user_id}": loader for user_id, loader in self._liked.items()})
+        return {name: {"loads": loader.load_count, "queries": loader.batch_count} for name, loader in loaders.items()}
+
+async def get_loaders(db=Depends(get_database)) -> RequestLoaders:
+    """FastAPI 의존성: 요청마다 새 RequestLoaders (의존성 캐시로 요청 안에서는 하나를 공유)"""
+    return RequestLoaders(db)
@@ -0,0 +1,121 @@
+# app/core/post_cache.py
+"""
+단일 게시글 조회(GET /api/board/{post_id})용 read-through 캐시
+
+- 프로세스 메모리에 최대 POST_CACHE_MAX_ENTRIES개를 LRU로 보관하고 POST_CACHE_TTL_SEC 후 만료됩니다.
+- 같은 게시글의 캐시 미스가 동시에 몰려도 DB 조회는 한 번만 실행됩니다 (single-flight).
+- 게시글 수정/삭제, 댓글 작성/삭제 시 invalidate()로 제거하고,
+  좋아요/조회수 변경은 adjust()로 캐시된 값에 증감만 반영합니다.
+- invalidate()/adjust()마다 세대(generation)를 올려 두고, 그보다 먼저 시작된 DB 조회 결과는 캐시에 저장하지 않습니다.
+  (조회 도중의 변경이 이전 시점 문서로 덮어써지지 않게 함)
+
+프로세스마다 별도 캐시이므로 다른 인스턴스의 변경은 최대 TTL만큼 늦게 반영될 수 있습니다.
+"""
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+import asyncio
+import time
+
+class PostCache:
+    def __init__(self, max_entries: int, ttl_sec: float):
+        self.max_entries = max_entries
+        self.ttl = ttl_sec
+
+        # post_id -> (만료 시각, 응답용 게시글 문서)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # post_id -> 진행 중인 DB 조회
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 변경 세대: invalidate()/adjust()마다 1씩 증가, post_id -> 마지막으로 변경된 세대
+        self._generation = 0
+        self._changed: "OrderedDict[str, int]" = OrderedDict()
+
+        self.hit_count = 0
+        self.miss_count = 0
+        self.coalesced_count = 0
+        self.invalidation_count = 0
+
+    async def get(self, post_id: str, loader: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        """
+        캐시된 게시글을 반환하고, 없으면 loader()로 조회해 저장합니다.
+        호출자가 수정해도 캐시가 바뀌지 않도록 복사본을 반환합니다.
+        """
+        entry = self._entries.get(post_id)
+        if entry and entry[0] > time.monotonic():
+            self.hit_count += 1
+            self._entries.move_to_end(post_id)
+            return dict(entry[1])
+
+        future = self._inflight.get(post_id)
+        if future is not None:
+            self.coalesced_count += 1
+            doc = await asyncio.shield(future)
+            return dict(doc) if doc is not None else None
+
+        self.miss_count += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[post_id] = future
+        started_generation = self._generation
+        try:
+            doc = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 나지 않도록 표시
+            raise
+        finally:
+            if self._inflight.get(post_id) is future:
+                del self._inflight[post_id]
+
+        if not future.done():
+            future.set_result(doc)
+        # 조회 중에 invalidate()/adjust()가 호출되었으면 이전 시점 문서이므로 저장하지 않음
+        if doc is not None and self._changed.get(post_id, -1) <= started_generation:
+            self._store(post_id, doc)
+        return dict(doc) if doc is not None else None
+
+    def _store(self, post_id: str, doc: dict):
+        self._entries[post_id] = (time.monotonic() + self.ttl, doc)
+        self._entries.move_to_end(post_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _mark_changed(self, post_id: str):
+        self._generation += 1
+        self._changed[post_id] = self._generation
+        self._changed.move_to_end(post_id)
+        # 세대 기록은 최근 max_entries개만 보관 (조회 한 번 사이에 그보다 많은 게시글이 바뀌는 경우는 고려하지 않음)
+        while len(self._changed) > self.max_entries:
+            self._changed.popitem(last=False)
+
+    def invalidate(self, post_id: str):
+        self.invalidation_count += 1
+        self._mark_changed(post_id)
+        self._entries.pop(post_id, None)
+        # 이후 요청이 이전 시점 조회에 합류하지 않도록 진행 중인 조회도 목록에서 뺌
+        self._inflight.pop(post_id, None)
+
+    def adjust(self, post_id: str, field: str, delta: int):
+        """캐시된 게시글의 숫자 필드(likes, views)에 증감을 반영합니다. 캐시에 없으면 무시합니다."""
+        self._mark_changed(post_id)
+        entry = self._entries.get(post_id)
+        if entry:
+            doc = entry[1]
+            doc[field] = max(0, doc.get(field, 0) + delta)
+
+    def metrics(self) -> dict:
+        total = self.hit_count + self.miss_count + self.coalesced_count
+        return {
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+            "coalesced": self.coalesced_count,
+            "invalidations": self.invalidation_count,
+            "hit_ratio": round(self.hit_count / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
+
+post_cache = PostCache(
+    max_entries=settings.POST_CACHE_MAX_ENTRIES,
+    ttl_sec=settings.POST_CACHE_TTL_SEC
+)
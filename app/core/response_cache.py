@@ -0,0 +1,141 @@
+# app/core/response_cache.py
+"""
+방문자마다 같은 응답을 돌려주는 목록 API용 짧은 TTL 응답 캐시
+
+    @cached_response(activity_cache, "activity_events", key_params=("event_type", "limit"))
+    async def first_page(db, event_type, limit): ...
+
+- 키는 함수 이름 + key_params 값입니다.
+- 예외는 캐시하지 않습니다 (기다리던 요청에는 같은 예외가 전달됩니다).
+- TTL 동안은 캐시된 응답을 그대로 반환하고, 그 뒤 stale 구간에서는 이전 응답을 바로 반환하면서
+  백그라운드에서 한 번 다시 계산합니다 (stale-while-revalidate).
+- 같은 키의 캐시 미스가 동시에 몰려도 계산은 한 번만 실행됩니다 (single-flight).
+- 관련 컬렉션 버전(app.core.etag.collection_versions)이 바뀌면(활동 기록) stale 구간과 상관없이
+  즉시 무효화되어 다음 요청에서 다시 계산합니다.
+
+캐시된 응답은 요청 간에 공유되므로 엔드포인트는 반환값을 수정하지 않아야 합니다.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Tuple
+from app.core.config import settings
+from app.core.etag import collection_versions
+import asyncio
+import functools
+import inspect
+import time
+
+class ResponseCache:
+    def __init__(self, ttl_sec: float, stale_sec: float, max_entries: int = 256):
+        self.ttl = ttl_sec
+        self.stale = stale_sec
+        self.max_entries = max_entries
+
+        # key -> (fresh_until, stale_until, 컬렉션 버전, 응답)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # (key, 컬렉션 버전) -> 진행 중인 계산
+        self._inflight: Dict[Tuple[tuple, str], asyncio.Future] = {}
+        # 백그라운드 갱신 작업 (GC 방지용 참조)
+        self._refreshing = set()
+
+        self.hit_count = 0
+        self.stale_hit_count = 0
+        self.miss_count = 0
+        self.coalesced_count = 0
+
+    async def get(self, key: tuple, version: str, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[2] == version:
+            fresh_until, stale_until, _, value = entry
+            if now < fresh_until:
+                self.hit_count += 1
+                return value
+            if now < stale_until:
+                self.stale_hit_count += 1
+                if (key, version) not in self._inflight:
+                    # 작업이 시작되기 전에 등록해 두어 같은 tick의 다른 요청이 갱신을 중복 실행하지 않게 함
+                    future = self._register(key, version)
+                    task = asyncio.ensure_future(self._compute(key, version, compute, future))
+                    self._refreshing.add(task)
+                    task.add_done_callback(self._refresh_done)
+                return value
+
+        future = self._inflight.get((key, version))
+        if future is not None:
+            self.coalesced_count += 1
+            return await asyncio.shield(future)
+
+        self.miss_count += 1
+        return await self._compute(key, version, compute, self._register(key, version))
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refreshing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ 응답 캐시 갱신 오류: {task.exception()}")
+
+    def _register(self, key: tuple, version: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(key, version)] = future
+        return future
+
+    async def _compute(self, key: tuple, version: str, compute: Callable[[], Any], future: asyncio.Future) -> Any:
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 나지 않도록 표시
+            raise
+        finally:
+            self._inflight.pop((key, version), None)
+
+        future.set_result(value)
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl, now + self.ttl + self.stale, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def metrics(self) -> dict:
+        total = self.hit_count + self.stale_hit_count + self.miss_count + self.coalesced_count
+        return {
+            "hits": self.hit_count,
+            "stale_hits": self.stale_hit_count,
+            "misses": self.miss_count,
+            "coalesced": self.coalesced_count,
+            "hit_ratio": round((self.hit_count + self.stale_hit_count) / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "ttl_sec": self.ttl,
+            "stale_sec": self.stale
+        }
+
+def cached_response(
+    cache: ResponseCache,
+    *collections: str,
+    key_params: Iterable[str] = ()
+):
+    """
+    엔드포인트(또는 엔드포인트가 호출하는 조회 함수)의 반환값을 cache에 저장하는 데코레이터
+    collections는 무효화 기준 컬렉션입니다.
+    """
+    key_params = tuple(key_params)
+
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key = (endpoint.__name__,) + tuple(arguments.arguments.get(name) for name in key_params)
+            version = collection_versions.tag(collections)
+            return await cache.get(key, version, lambda: endpoint(*args, **kwargs))
+        return wrapper
+    return decorator
+
+# /api/activity/* 응답 캐시
+activity_cache = ResponseCache(
+    ttl_sec=settings.ACTIVITY_CACHE_TTL_SEC,
+    stale_sec=settings.ACTIVITY_CACHE_STALE_SEC
+)
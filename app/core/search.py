@@ -0,0 +1,222 @@
+# app/core/search.py
+"""
+게시글/댓글 검색 색인
+
+post_search 컬렉션에 게시글마다 문서 하나를 두고
+제목/본문/댓글을 bigram + 글자 unigram 토큰(app/utils/text.search_terms)으로 저장합니다.
+(unigram은 "숲"처럼 한 글자 검색어를 위한 것이고, 두 글자 이상 검색어는 bigram으로만 찾습니다.)
+토큰 필드에는 default_language "none" 텍스트 인덱스가 걸려 있어
+검색은 board 컬렉션을 훑지 않고 텍스트 인덱스와 textScore 순위로 처리됩니다.
+
+색인은 create_post/update_post/create_comment/delete_comment에서 갱신되고, 게시글 삭제 시 즉시 제거됩니다.
+댓글 토큰은 comment_term_counts에 토큰별 댓글 수를 함께 두어, 댓글을 삭제할 때 다른 댓글을 훑지 않고
+수가 0이 된 토큰만 comment_terms에서 뺍니다.
+검색어의 모든 토큰을 포함한 게시글만 결과에 포함됩니다.
+색인 형식(SEARCH_INDEX_VERSION)이 바뀌면 서버 시작 시 다시 색인하며, 직접 실행하려면 아래 명령을 사용합니다.
+
+    python -m app.core.search
+"""
+
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from app.utils.text import search_terms
+from app.utils.pagination import encode_cursor, decode_cursor
+import asyncio
+
+# 색인 재구성 시 한 번에 전송할 bulk_write 크기
+REINDEX_BATCH_SIZE = 500
+
+# 텍스트 인덱스가 걸린 토큰 필드
+TERM_FIELDS = ("title_terms", "content_terms", "comment_terms")
+
+# 색인 형식 버전 (토큰화 방식이 바뀌면 올림 - 서버 시작 시 이전 버전 문서가 있으면 다시 색인)
+SEARCH_INDEX_VERSION = 2
+
+# 새 색인 문서의 댓글 색인 초기값
+_EMPTY_COMMENT_INDEX = {"comment_terms": [], "comment_term_counts": {}}
+
+def _post_search_doc(post: dict) -> dict:
+    return {
+        "board": post.get("board"),
+        "subcategory": post.get("subcategory"),
+        "prefix": post.get("prefix", ""),
+        "title_terms": search_terms(post.get("title", ""), unigrams=True),
+        "content_terms": search_terms(post.get("content", ""), unigrams=True),
+        "index_version": SEARCH_INDEX_VERSION
+    }
+
+def _comment_terms(comment: dict) -> List[str]:
+    return search_terms(comment.get("content", ""), unigrams=True)
+
+async def index_post(db, post: dict):
+    """게시글 생성/수정 후 제목/본문 색인을 갱신합니다. (댓글 색인은 유지)"""
+    await db["post_search"].update_one(
+        {"_id": post["_id"]},
+        {"$set": _post_search_doc(post), "$setOnInsert": _EMPTY_COMMENT_INDEX},
+        upsert=True
+    )
+
+async def index_posts(db, posts: List[dict]):
+    """여러 게시글의 색인을 bulk_write로 한 번에 갱신합니다. (일괄 등록용)"""
+    operations = [
+        UpdateOne(
+            {"_id": post["_id"]},
+            {"$set": _post_search_doc(post), "$setOnInsert": _EMPTY_COMMENT_INDEX},
+            upsert=True
+        )
+        for post in posts
+    ]
+    for start in range(0, len(operations), REINDEX_BATCH_SIZE):
+        await db["post_search"].bulk_write(operations[start:start + REINDEX_BATCH_SIZE], ordered=False)
+
+async def index_comment(db, post_id: str, comment: dict):
+    """댓글 내용을 게시글 색인에 추가하고 토큰별 댓글 수를 늘립니다."""
+    terms = _comment_terms(comment)
+    if not terms:
+        return
+    try:
+        post_oid = ObjectId(post_id)
+    except Exception:
+        return
+    await db["post_search"].update_one(
+        {"_id": post_oid},
+        {
+            "$addToSet": {"comment_terms": {"$each": terms}},
+            "$inc": {f"comment_term_counts.{term}": 1 for term in terms}
+        }
+    )
+
+async def remove_comment(db, post_id: str, comment: dict):
+    """
+    삭제된 댓글의 토큰별 댓글 수를 줄이고, 0이 된 토큰만 게시글 색인에서 제거합니다. (댓글 삭제 후 호출)
+    제거는 토큰마다 "수가 0 이하" 조건을 걸어, 그 사이 같은 토큰을 가진 댓글이 달리면 남겨 둡니다.
+    """
+    terms = _comment_terms(comment)
+    if not terms:
+        return
+    try:
+        post_oid = ObjectId(post_id)
+    except Exception:
+        return
+    doc = await db["post_search"].find_one_and_update(
+        {"_id": post_oid},
+        {"$inc": {f"comment_term_counts.{term}": -1 for term in terms}},
+        projection={f"comment_term_counts.{term}": 1 for term in terms},
+        return_document=ReturnDocument.AFTER
+    )
+    if not doc:
+        return
+    counts = doc.get("comment_term_counts") or {}
+    operations = [
+        UpdateOne(
+            {"_id": post_oid, f"comment_term_counts.{term}": {"$lte": 0}},
+            {"$pull": {"comment_terms": term}, "$unset": {f"comment_term_counts.{term}": ""}}
+        )
+        for term in terms
+        if counts.get(term, 0) <= 0
+    ]
+    if operations:
+        await db["post_search"].bulk_write(operations, ordered=False)
+
+async def remove_post(db, post_oid: ObjectId):
+    await db["post_search"].delete_one({"_id": post_oid})
+
+async def search_post_ids(
+    db,
+    query: str,
+    filters: dict,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Tuple[ObjectId, float]], Optional[str]]:
+    """
+    검색어와 일치하는 게시글 ID를 관련도(textScore) 내림차순으로 한 페이지 반환합니다.
+    커서는 마지막 항목의 (점수, _id)입니다.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+
+    # $text는 토큰을 OR로 찾으므로 모든 토큰을 포함한 게시글만 남김 (AND 검색)
+    pipeline = [
+        {"$match": {
+            "$text": {"$search": " ".join(terms)},
+            "$and": [{"$or": [{field: term} for field in TERM_FIELDS]} for term in terms],
+            **filters
+        }},
+        {"$addFields": {"score": {"$meta": "textScore"}}}
+    ]
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            last_score = float(position["s"])
+            last_oid = ObjectId(position["id"])
+        except Exception:
+            raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+        pipeline.append({"$match": {"$or": [
+            {"score": {"$lt": last_score}},
+            {"score": last_score, "_id": {"$lt": last_oid}}
+        ]}})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": {"_id": 1, "score": 1}}
+    ]
+
+    hits = [(doc["_id"], doc["score"]) async for doc in db["post_search"].aggregate(pipeline)]
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor({"s": hits[-1][1], "id": str(hits[-1][0])})
+
+    return hits, next_cursor
+
+async def reindex_all(db) -> int:
+    """board/comments 전체로 post_search 색인을 다시 만듭니다. 색인한 게시글 수를 반환합니다."""
+    comment_term_counts = {}
+    async for comment in db["comments"].find({}, projection={"post_id": 1, "content": 1}):
+        counts = comment_term_counts.setdefault(comment.get("post_id"), {})
+        for term in _comment_terms(comment):
+            counts[term] = counts.get(term, 0) + 1
+
+    indexed = 0
+    operations = []
+    async for post in db["board"].find({"deleted": {"$ne": True}}):
+        counts = comment_term_counts.get(str(post["_id"]), {})
+        doc = _post_search_doc(post)
+        doc["comment_terms"] = list(counts)
+        doc["comment_term_counts"] = counts
+        operations.append(ReplaceOne({"_id": post["_id"]}, doc, upsert=True))
+
+        if len(operations) >= REINDEX_BATCH_SIZE:
+            await db["post_search"].bulk_write(operations, ordered=False)
+            indexed += len(operations)
+            operations = []
+
+    if operations:
+        await db["post_search"].bulk_write(operations, ordered=False)
+        indexed += len(operations)
+
+    return indexed
+
+async def reindex_if_outdated(db=None):
+    """이전 형식(SEARCH_INDEX_VERSION 미만)의 색인 문서가 있으면 다시 색인합니다. 서버 시작 시 백그라운드로 실행됩니다."""
+    if db is None:
+        from app.core.database import db
+
+    try:
+        if await db["post_search"].find_one({"index_version": {"$ne": SEARCH_INDEX_VERSION}}, projection={"_id": 1}):
+            indexed_count = await reindex_all(db)
+            print(f"✅ 검색 색인 재구성: {indexed_count}개 게시글")
+    except Exception as e:
+        print(f"❌ 검색 색인 재구성 오류: {e}")
+
+# 직접 실행 시 재색인 스크립트
+if __name__ == "__main__":
+    from app.core.database import db
+
+    print("🔧 게시글 검색 색인 재구성 시작...")
+    indexed_count = asyncio.run(reindex_all(db))
+    print(f"✅ 검색 색인 재구성 완료: {indexed_count}개 게시글")
@@ -0,0 +1,155 @@
+# app/core/view_buffer.py
+"""
+게시글 조회수 write-behind 버퍼
+
+POST /api/board/{post_id}/view 요청마다 DB에 쓰지 않고
+- 5분 쿨다운 여부는 메모리의 TTL 맵(최대 VIEW_COOLDOWN_MAX_ENTRIES개)으로 판단하고
+- 게시글별 조회수 증가분을 모아 두었다가
+- VIEW_FLUSH_INTERVAL_MS마다 또는 VIEW_FLUSH_MAX_EVENTS개가 쌓이면 bulk_write 한 번으로 기록합니다.
+조회 기록(기존 post_views 컬렉션)은 쿨다운을 메모리에서 판단하면서 읽는 곳이 없어져 더 이상 저장하지 않습니다.
+
+서버 종료 시에도 남은 증가분을 기록합니다. 비정상 종료 시 최대 한 주기 분량의 조회수가 유실될 수 있습니다.
+쿨다운 맵은 프로세스 메모리에만 있으므로 재시작 직후에는 쿨다운이 초기화됩니다.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.core.post_cache import post_cache
+import asyncio
+
+VIEW_COOLDOWN = timedelta(minutes=5)
+
+class ViewAggregator:
+    def __init__(self, cooldown: timedelta, flush_interval_ms: int, flush_max_events: int, max_entries: int):
+        self.cooldown = cooldown
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_events = flush_max_events
+        self.max_entries = max_entries
+
+        # (post_id, identifier) -> 마지막 조회 시간 (오래된 순서 유지)
+        self.last_views: "OrderedDict[Tuple[str, str], datetime]" = OrderedDict()
+        # post_id -> 아직 기록되지 않은 조회수 증가분
+        self.pending_views: Dict[str, int] = {}
+        self.pending_events = 0
+
+        self.buffered_count = 0
+        self.flushed_count = 0
+        self.cooldown_count = 0
+        self.flush_count = 0
+        self.failed_flush_count = 0
+
+        self._flush_requested = asyncio.Event()
+        self._stopping = False
+        self._task = None
+
+    def _expire(self, now: datetime):
+        # 오래된 순서로 정렬되어 있으므로 앞에서부터 쿨다운이 지난 항목을 제거
+        while self.last_views:
+            key, last_view = next(iter(self.last_views.items()))
+            if now - last_view < self.cooldown and len(self.last_views) <= self.max_entries:
+                break
+            self.last_views.popitem(last=False)
+
+    def record_view(self, post_id: str, identifier: str) -> bool:
+        """조회를 버퍼에 기록합니다. 쿨다운 중이면 False를 반환합니다."""
+        now = datetime.utcnow()  # UTC 기준
+        self._expire(now)
+
+        key = (post_id, identifier)
+        last_view = self.last_views.get(key)
+        if last_view and now - last_view < self.cooldown:
+            self.cooldown_count += 1
+            return False
+
+        self.last_views[key] = now
+        self.last_views.move_to_end(key)
+
+        self.pending_views[post_id] = self.pending_views.get(post_id, 0) + 1
+        self.pending_events += 1
+        self.buffered_count += 1
+
+        if self.pending_events >= self.flush_max_events:
+            self._flush_requested.set()
+        return True
+
+    async def flush(self):
+        """모아 둔 조회수 증가분을 bulk_write로 기록합니다."""
+        if not self.pending_views:
+            return
+
+        from app.core.database import db
+
+        # await 이전에 버퍼를 교체하므로 기록 중 들어온 조회는 다음 주기로 넘어갑니다.
+        views, events = self.pending_views, self.pending_events
+        self.pending_views, self.pending_events = {}, 0
+
+        board_operations = []
+        for post_id, delta in views.items():
+            try:
+                board_operations.append(UpdateOne({"_id": ObjectId(post_id)}, {"$inc": {"views": delta}}))
+            except Exception:
+                continue
+
+        try:
+            if board_operations:
+                await db["board"].bulk_write(board_operations, ordered=False)
+                # 캐시된 게시글에도 같은 증가분 반영
+                # (조회수는 자주 바뀌므로 ETag 버전은 올리지 않음 - 304 응답의 조회수는 다음 글/댓글 변경 때까지 늦게 반영됨)
+                for post_id, delta in views.items():
+                    post_cache.adjust(post_id, "views", delta)
+        except Exception as e:
+            # 실패한 증가분은 다음 주기에 다시 시도
+            for post_id, delta in views.items():
+                self.pending_views[post_id] = self.pending_views.get(post_id, 0) + delta
+            self.pending_events += events
+            self.failed_flush_count += 1
+            print(f"❌ 조회수 기록 실패: {e}")
+            return
+
+        self.flushed_count += events
+        self.flush_count += 1
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # 진행 중인 기록이 끊기지 않도록 취소 대신 종료 신호를 보내고 기다립니다.
+        if self._task is not None:
+            self._stopping = True
+            self._flush_requested.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def metrics(self) -> dict:
+        return {
+            "buffered": self.buffered_count,
+            "flushed": self.flushed_count,
+            "pending": self.pending_events,
+            "cooldown_rejected": self.cooldown_count,
+            "flushes": self.flush_count,
+            "failed_flushes": self.failed_flush_count,
+            "tracked_identifiers": len(self.last_views)
+        }
+
+view_aggregator = ViewAggregator(
+    cooldown=VIEW_COOLDOWN,
+    flush_interval_ms=settings.VIEW_FLUSH_INTERVAL_MS,
+    flush_max_events=settings.VIEW_FLUSH_MAX_EVENTS,
+    max_entries=settings.VIEW_COOLDOWN_MAX_ENTRIES
+)
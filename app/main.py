@@ -1,8 +1,10 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, research, board, activity, chat, websocket_native
+from app.routers import auth, research, board, activity, chat, attachments, websocket_native
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.etag import ConditionalGetMiddleware, etag_metrics
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -27,6 +29,20 @@ cors_origins = [
     "https://port-0-youminseok-forest-research-backend-m8qrfco7a6ee3b26.sel4.cloudtype.app",
 ]
 
+# 목록 API 조건부 GET (ETag) - 304 응답에도 CORS 헤더가 붙도록 CORS보다 먼저 등록
+app.add_middleware(
+    ConditionalGetMiddleware,
+    routes={
+        "/api/board/": ("board",),
+        "/api/board/all/recent": ("board",),
+        "/api/board/all/by-category": ("board",),
+        "/api/activity/recent": ("activity_events",),
+        "/api/activity/recent-posts": ("activity_events",),
+        "/api/activity/recent-comments": ("activity_events",),
+        "/api/activity/recent-signups": ("activity_events",),
+    }
+)
+
 # CORS 미들웨어 추가
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Content-Range", "Accept-Ranges", "X-Next-Cursor"],
 )
 
 @app.on_event("startup")
@@ -41,13 +58,60 @@ async def startup_event():
     await connect_to_mongo()
     print("MongoDB 연결 성공!")
 
-    # 채팅 데이터베이스 스키마 설정
-    from app.core.database_setup import setup_chat_database
-    await setup_chat_database()
-    print("채팅 데이터베이스 스키마 설정 완료!")
+    # 인덱스 레지스트리 기준으로 데이터베이스 인덱스 설정
+    from app.core.database_setup import reconcile_indexes
+    await reconcile_indexes()
+    print("데이터베이스 인덱스 설정 완료!")
+
+    # 백그라운드 데이터 마이그레이션 (이미 처리된 문서는 건너뜀)
+    # 1) date 문자열 -> created_at  2) 최근 활동 피드가 비어 있으면 기존 데이터로 채움 (created_at 필요)
+    # 3) 채팅방 participants 배열  4) 채팅 메시지 is_read -> 채팅방 읽음 워터마크
+    # 5) 채팅방 읽지 않은 메시지 카운터가 없으면 재계산 (워터마크 필요)  6) 댓글 스레드 root_id 백필
+    # 7) 검색 색인 형식이 바뀌었으면 다시 색인
+    from app.core.date_migration import migrate_dates
+    from app.core.activity_events import backfill_if_empty
+    from app.core.chat_read_state import migrate_read_flags
+    from app.core.chat_unread import rebuild_if_missing
+    from app.core.chat_inbox import migrate_participants
+    from app.core.comment_threads import backfill_if_missing
+    from app.core.search import reindex_if_outdated
+
+    async def run_data_migrations():
+        await migrate_dates()
+        await backfill_if_empty()
+        await migrate_participants()
+        await migrate_read_flags()
+        await rebuild_if_missing()
+        await backfill_if_missing()
+        await reindex_if_outdated()
+
+    asyncio.create_task(run_data_migrations())
+
+    # 조회수 write-behind 버퍼 시작
+    from app.core.view_buffer import view_aggregator
+    view_aggregator.start()
+
+    # 게시글 삭제 cascade 작업 시작 (중단된 작업도 이어서 처리)
+    from app.core.cascade import cascade_worker
+    cascade_worker.start()
+
+    # 채팅 메시지 group commit 작업 시작
+    from app.core.chat_writer import chat_writer
+    chat_writer.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # 남은 조회수를 기록한 뒤 연결 종료
+    from app.core.view_buffer import view_aggregator
+    await view_aggregator.stop()
+
+    from app.core.cascade import cascade_worker
+    await cascade_worker.stop()
+
+    # 대기 중인 채팅 메시지를 기록한 뒤 종료
+    from app.core.chat_writer import chat_writer
+    await chat_writer.stop()
+
     await close_mongo_connection()
     print("MongoDB 연결 종료!")
 
@@ -57,6 +121,7 @@ app.include_router(research.router, prefix="/api/research", tags=["research"])
 app.include_router(board.router, prefix="/api/board", tags=["board"])
 app.include_router(activity.router, prefix="/api/activity", tags=["activity"])
 app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
+app.include_router(attachments.router, prefix="/api/attachments", tags=["attachments"])
 
 # WebSocket 라우터 등록
 app.include_router(websocket_native.router, tags=["websocket"])
@@ -65,4 +130,8 @@ app.include_router(websocket_native.router, tags=["websocket"])
 async def ping():
     return {"message": "pong"}
 
+@app.get("/metrics/etag")
+async def get_etag_metrics():
+    return etag_metrics()
+
 # 기본 FastAPI 앱 사용 (Socket.IO 제거)
@@ -0,0 +1,98 @@
+# app/routers/attachments.py
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.attachments import MULTIPART_OVERHEAD, store_multipart, get_file, attachment_info, parse_range, open_range
+from app.utils.security import get_current_user
+from urllib.parse import quote
+
+router = APIRouter()
+
+# 첨부파일 내용은 ID별로 바뀌지 않으므로 브라우저/프록시가 오래 캐시해도 됩니다.
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 브라우저에서 바로 보여 줄(inline) 형식. 그 밖의 형식(HTML, SVG 등)은 내려받기로만 제공합니다.
+INLINE_CONTENT_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+
+@router.post("/")
+async def upload_attachment(request: Request, db=Depends(get_database), user=Depends(get_current_user)):
+    """
+    첨부파일 업로드 (multipart/form-data, 필드 이름 file)
+    반환된 id를 게시글/댓글 작성 시 attachments 목록에 넣으면 해당 게시글에 연결됩니다.
+    요청 본문은 임시 파일에 모으지 않고 받는 대로 파싱해 GridFS에 쓰며, 크기 제한도 읽는 도중에 확인합니다.
+    (Content-Length가 있으면 본문을 읽기 전에 먼저 거절합니다.)
+    """
+    try:
+        content_length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Content-Length 헤더가 올바르지 않습니다.")
+    if content_length > settings.ATTACHMENT_MAX_BYTES + MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=413,
+            detail=f"첨부파일은 최대 {settings.ATTACHMENT_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+        )
+
+    return await store_multipart(db, request.stream(), request.headers.get("content-type"), user["id"])
+
+@router.get("/{attachment_id}/info")
+async def get_attachment_info(attachment_id: str, db=Depends(get_database)):
+    file_doc = await get_file(db, attachment_id)
+    if not file_doc:
+        raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
+    return attachment_info(file_doc)
+
+@router.get("/{attachment_id}")
+async def download_attachment(attachment_id: str, request: Request, db=Depends(get_database)):
+    """
+    첨부파일 다운로드
+    - Range 요청(bytes=start-end)이면 206과 해당 구간만 스트리밍합니다.
+    - ETag가 일치하면(If-None-Match) 304를 반환합니다.
+    """
+    file_doc = await get_file(db, attachment_id)
+    if not file_doc:
+        raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
+
+    size = file_doc["length"]
+    metadata = file_doc.get("metadata") or {}
+    content_type = metadata.get("content_type")
+    if content_type in INLINE_CONTENT_TYPES:
+        disposition = "inline"
+    else:
+        # 업로드한 사용자가 정한 형식을 그대로 쓰면 같은 출처에서 HTML/스크립트가 실행될 수 있음
+        disposition, content_type = "attachment", "application/octet-stream"
+    etag = f'"{file_doc["_id"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+        "Content-Disposition": f"{disposition}; filename*=UTF-8''{quote(file_doc.get('filename') or 'attachment')}"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if size == 0:
+        return Response(content=b"", media_type=content_type, headers=headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        open_range(db, file_doc["_id"], start, end),
+        status_code=status_code,
+        media_type=content_type,
+        headers=headers
+    )
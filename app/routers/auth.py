@@ -9,6 +9,7 @@ from app.core.config import settings
 from app.utils.security import get_password_hash, verify_password
 import logging
 from bson import ObjectId
+from app.core.activity_events import record_signup
 
 router = APIRouter()
 logger = logging.getLogger("auth_router")
@@ -116,6 +117,7 @@ async def verify_code(data: dict, response: Response):
     user = await db.users.find_one({"email": email})
     if not user:
         raise HTTPException(status_code=404, detail="사용자 정보를 찾을 수 없습니다.")
+    await record_signup(db, user)
 
     current_time = datetime.utcnow()
     expiry_time = current_time + timedelta(days=30)  # 30일로 대폭 연장
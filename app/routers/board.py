@@ -2,53 +2,76 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from app.core.database import get_database
 from bson import ObjectId
-from datetime import datetime, timedelta
+from datetime import datetime
+import asyncio
 import pytz  # 타임존 처리를 위한 라이브러리
-from app.utils.security import get_current_user
+from app.utils.security import get_current_user, get_optional_user
 from pymongo import ReturnDocument
+from typing import Optional
+from app.utils.text import make_excerpt
+from app.core.config import settings
+from app.core.bulk_import import prepare_post, reserve_post_numbers, parse_import_body, import_posts
+from app.core.activity_events import record_post_created, record_comment_created, update_post_events, refresh_comment_event
+from app.core.attachments import claim_attachments, delete_attachments, externalize_inline_images, externalize_comment_image, referenced_attachment_ids
+from app.utils.pagination import encode_cursor, decode_cursor, clamp_limit
+from app.core.view_buffer import view_aggregator
+from app.core.post_cache import post_cache
+from app.core.etag import collection_versions
+from app.core.search import index_post, index_comment, remove_comment, search_post_ids
+from app.core.cascade import NOT_DELETED, enqueue_post_deletion, get_job
+from app.core.loaders import get_loaders
+from app.core.likes import toggle_like_record, liked_post_ids, mark_liked_by_me
+from app.core.comment_threads import thread_fields, apply_reply_created, apply_reply_deleted, fetch_thread_page, build_thread_tree
+from app.core.comment_counters import (
+    apply_comment_created, apply_comment_deleted, attach_comment_stats, attach_recent_reply_stats
+)
 
 router = APIRouter()
 
 # 서울 타임존 객체 생성
 seoul_tz = pytz.timezone('Asia/Seoul')
 
+# fields=summary 목록 응답에 포함할 필드 (본문 대신 excerpt)
+SUMMARY_FIELDS = [
+    "board", "subcategory", "prefix", "title", "excerpt", "writer", "writer_id", "date",
+    "post_number", "views", "likes", "comment_count", "recent_reply_dates"
+]
+
+# limit/cursor 없이 호출한 기존 댓글 API의 최상위 댓글 수와 답글 수 상한
+LEGACY_ROOT_LIMIT = 100
+LEGACY_REPLY_LIMIT = 1000
+
+def list_projection(fields: Optional[str]):
+    """목록 API의 fields 파라미터에 맞는 projection (full이면 None)"""
+    if fields is None or fields == "full":
+        return None
+    if fields == "summary":
+        return {field: 1 for field in SUMMARY_FIELDS}
+    raise HTTPException(status_code=400, detail="fields는 summary 또는 full만 지원합니다.")
+
 # ===== 게시글 관련 엔드포인트 =====
 
 @router.post("/create")
 async def create_post(post: dict, db=Depends(get_database), user=Depends(get_current_user)):
-    if "board" not in post:
-        raise HTTPException(status_code=400, detail="게시판 유형(board)이 필요합니다.")
-    if "title" not in post or "content" not in post:
-        raise HTTPException(status_code=400, detail="제목과 내용은 필수입니다.")
-
-    post["writer"] = user["name"]
-    post["writer_id"] = user["id"]
-    post["date"] = datetime.now(seoul_tz).isoformat()  # 서울 기준 시간
-    post["views"] = 0
-    post["likes"] = 0
-    post["prefix"] = post.get("prefix", "")
-
-    research_categories = ["연구자료", "제출자료", "제안서"]
-    if post["board"] in research_categories:
-        post["subcategory"] = post["board"]
-        post["board"] = "연구"
-
-    if post["board"] == "연구":
-        counter_key = f"{post['subcategory']}_post_number"
-    else:
-        counter_key = f"{post['board']}_post_number"
+    try:
+        counter_key = prepare_post(post, user, datetime.now(seoul_tz))  # 서울 기준 시간
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    counter = await db["counters"].find_one_and_update(
-        {"_id": counter_key},
-        {"$inc": {"seq": 1}},
-        upsert=True,
-        return_document=ReturnDocument.AFTER
-    )
-    post_number = counter["seq"] if counter else 1
-    post["post_number"] = post_number
+    # 첨부파일을 연결하기 위해 _id를 미리 정함 (본문의 인라인 이미지는 첨부파일로 옮김)
+    post["_id"] = ObjectId()
+    post_id = str(post["_id"])
+    attachment_ids = await claim_attachments(db, post.get("attachments"), user["id"], post_id)
+    post["content"], inline_ids = await externalize_inline_images(db, post["content"], user["id"], post_id)
+    post["attachments"] = attachment_ids + inline_ids
+
+    post["post_number"] = await reserve_post_numbers(db, counter_key, 1)
 
     collection = db["board"]
     result = await collection.insert_one(post)
+    await index_post(db, post)
+    await record_post_created(db, post)
+    collection_versions.bump("board")
     new_post = await collection.find_one({"_id": result.inserted_id})
     if not new_post:
         raise HTTPException(status_code=404, detail="생성된 게시글을 찾을 수 없습니다.")
@@ -57,41 +80,185 @@ async def create_post(post: dict, db=Depends(get_database), user=Depends(get_cur
     del new_post["_id"]
     return new_post
 
+@router.post("/bulk")
+async def bulk_create_posts(request: Request, db=Depends(get_database), user=Depends(get_current_user)):
+    """
+    게시글 일괄 등록 (기존 게시판 이전용)
+    본문은 JSON 배열 또는 NDJSON(Content-Type: application/x-ndjson)이며 각 항목은 create_post와 같은 형식입니다.
+    게시판별 post_number 구간을 한 번에 예약하고 배치로 저장한 뒤, 입력 순서대로 항목별 결과를 반환합니다.
+    항목의 writer/date를 그대로 보존하므로 BULK_IMPORT_USER_IDS에 등록된 이전 담당자만 사용할 수 있습니다.
+    """
+    if user["id"] not in settings.BULK_IMPORT_USER_IDS:
+        raise HTTPException(status_code=403, detail="게시글 일괄 등록 권한이 없습니다.")
+
+    try:
+        items = parse_import_body(await request.body(), request.headers.get("content-type"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="JSON 배열 또는 NDJSON 형식이어야 합니다.")
+    if not items:
+        raise HTTPException(status_code=400, detail="등록할 게시글이 없습니다.")
+    if len(items) > settings.BULK_IMPORT_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {settings.BULK_IMPORT_MAX_ITEMS}개까지 등록할 수 있습니다.")
+
+    result = await import_posts(db, items, user)
+    if result["created"]:
+        collection_versions.bump("board")
+    return result
+
 @router.get("/")
-async def list_posts(category: str = None, db=Depends(get_database)):
+async def list_posts(
+    category: str = None,
+    limit: Optional[int] = None,
+    before_post_number: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db=Depends(get_database),
+    user=Depends(get_optional_user),
+    loaders=Depends(get_loaders)
+):
+    """
+    게시글 목록을 post_number 내림차순으로 조회합니다.
+    - fields=summary이면 본문(content) 대신 요약(excerpt)만 포함한 가벼운 목록을 반환합니다.
+    - limit, before_post_number, cursor 중 하나라도 지정하면 커서 페이지네이션 모드로 동작하며
+      {"posts": [...], "next_cursor": ...} 형태로 반환합니다. 다음 페이지는 next_cursor를 그대로 전달합니다.
+    - 아무것도 지정하지 않으면 기존과 같이 최신 50개 목록을 반환합니다.
+    - 로그인한 경우 각 게시글에 likedByMe가 표시됩니다.
+    """
     collection = db["board"]
-    filter_query = {}
+    projection = list_projection(fields)
+    filter_query = dict(NOT_DELETED)
     if category:
         filter_query["board"] = category
 
-    posts_cursor = collection.find(filter_query).sort("post_number", -1)
-    posts = await posts_cursor.to_list(50)
+    paginated = limit is not None or before_post_number is not None or cursor is not None
+    if not paginated:
+        posts_cursor = collection.find(filter_query, projection).sort("post_number", -1)
+        posts = await posts_cursor.to_list(50)
+
+        for post in posts:
+            post["id"] = str(post["_id"])
+            # 게시글에 저장된 댓글 수 사용
+            attach_comment_stats(post)
+            del post["_id"]
+        return await mark_liked_by_me(db, posts, user, loaders)
+
+    page_size = clamp_limit(limit)
+
+    # (post_number, _id) 기준 keyset 조건 - 연구 게시판은 세부 카테고리끼리 post_number가 겹칠 수 있음
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            last_number = int(position["n"])
+            last_oid = ObjectId(position["id"])
+        except Exception:
+            raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+        filter_query["$or"] = [
+            {"post_number": {"$lt": last_number}},
+            {"post_number": last_number, "_id": {"$lt": last_oid}}
+        ]
+    elif before_post_number is not None:
+        filter_query["post_number"] = {"$lt": before_post_number}
+
+    posts_cursor = collection.find(filter_query, projection).sort([("post_number", -1), ("_id", -1)]).limit(page_size + 1)
+    posts = await posts_cursor.to_list(page_size + 1)
+
+    next_cursor = None
+    if len(posts) > page_size:
+        posts = posts[:page_size]
+        last_post = posts[-1]
+        next_cursor = encode_cursor({"n": last_post["post_number"], "id": str(last_post["_id"])})
 
     for post in posts:
         post["id"] = str(post["_id"])
-        # 댓글 수 동적 계산
-        comment_count = await db["comments"].count_documents({"post_id": post["id"]})
-        post["commentCount"] = comment_count
+        attach_comment_stats(post)
         del post["_id"]
-    return posts
 
-@router.get("/{post_id}")
-async def get_post(post_id: str, db=Depends(get_database)):
-    collection = db["board"]
+    await mark_liked_by_me(db, posts, user, loaders)
+    return {"posts": posts, "next_cursor": next_cursor}
+
+@router.get("/search")
+async def search_posts(
+    q: str,
+    board: Optional[str] = None,
+    subcategory: Optional[str] = None,
+    prefix: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db=Depends(get_database),
+    loaders=Depends(get_loaders)
+):
+    """
+    게시글 제목/본문/댓글 검색 (관련도순)
+    - board, subcategory, prefix로 필터링할 수 있습니다.
+    - {"posts": [...], "next_cursor": ...} 형태로 반환하며 다음 페이지는 next_cursor를 그대로 전달합니다.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="검색어(q)가 필요합니다.")
+
+    filters = {}
+    if board:
+        filters["board"] = board
+    if subcategory:
+        filters["subcategory"] = subcategory
+    if prefix:
+        filters["prefix"] = prefix
+
+    hits, next_cursor = await search_post_ids(db, q, filters, cursor, clamp_limit(limit, default=20))
+    if not hits:
+        return {"posts": [], "next_cursor": None}
+
+    found = await loaders.posts.load_many([str(oid) for oid, _ in hits])
+
+    posts = []
+    for post, (_, score) in zip(found, hits):
+        if not post:
+            continue
+        post = dict(post)
+        post["id"] = str(post["_id"])
+        del post["_id"]
+        post["score"] = score
+        attach_comment_stats(post)
+        posts.append(post)
+
+    return {"posts": posts, "next_cursor": next_cursor}
+
+async def get_cached_post(db, post_id: str, oid: ObjectId) -> Optional[dict]:
+    """숨김 처리되지 않은 게시글 (post_cache 경유, 없으면 None)"""
+    async def load_post():
+        post = await db["board"].find_one({"_id": oid, **NOT_DELETED})
+        if not post:
+            return None
+
+        post["id"] = str(post["_id"])
+        del post["_id"]
+
+        # 게시글에 저장된 댓글 수 사용
+        attach_comment_stats(post)
+        return post
+
+    return await post_cache.get(post_id, load_post)
+
+async def require_visible_post(db, post_id: str) -> dict:
+    """숨김 처리되지 않은 게시글을 반환하고, 없으면 404를 발생시킵니다. (댓글 조회 등 하위 리소스용)"""
     try:
         oid = ObjectId(post_id)
     except Exception:
         raise HTTPException(status_code=400, detail="유효하지 않은 post_id입니다.")
-    post = await collection.find_one({"_id": oid})
+    post = await get_cached_post(db, post_id, oid)
     if not post:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+    return post
 
-    post["id"] = str(post["_id"])
-    del post["_id"]
+@router.get("/{post_id}")
+async def get_post(post_id: str, db=Depends(get_database)):
+    try:
+        oid = ObjectId(post_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 post_id입니다.")
 
-    # 댓글 수 동적 계산
-    comment_count = await db["comments"].count_documents({"post_id": post_id})
-    post["commentCount"] = comment_count
+    post = await get_cached_post(db, post_id, oid)
+    if not post:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
     return post
 
@@ -102,89 +269,110 @@ async def update_post(post_id: str, update_data: dict, db=Depends(get_database),
         oid = ObjectId(post_id)
     except Exception:
         raise HTTPException(status_code=400, detail="유효하지 않은 post_id입니다.")
-    post = await collection.find_one({"_id": oid})
+    post = await collection.find_one({"_id": oid, **NOT_DELETED})
     if not post:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
     if post.get("writer_id") != user["id"]:
         raise HTTPException(status_code=403, detail="작성자만 수정할 수 있습니다.")
 
-    await collection.update_one({"_id": oid}, {"$set": update_data})
+    update = {"$set": update_data}
+    if "attachments" in update_data:
+        update_data["attachments"] = await claim_attachments(db, update_data["attachments"], user["id"], post_id)
+    if "content" in update_data:
+        update_data["content"], inline_ids = await externalize_inline_images(db, update_data["content"], user["id"], post_id)
+        update_data["excerpt"] = make_excerpt(update_data["content"])
+        if inline_ids and "attachments" in update_data:
+            update_data["attachments"] += inline_ids
+        elif inline_ids:
+            update["$addToSet"] = {"attachments": {"$each": inline_ids}}
+
+    updated_post = await collection.find_one_and_update(
+        {"_id": oid},
+        update,
+        return_document=ReturnDocument.AFTER
+    )
+    post_cache.invalidate(post_id)
+    collection_versions.bump("board")
+    if updated_post:
+        if "attachments" in update_data:
+            # 목록에서 빠진 첨부파일은 GridFS에서도 삭제 (본문에 아직 링크된 인라인 이미지는 남김)
+            removed_ids = set(post.get("attachments") or []) - set(update_data["attachments"])
+            removed_ids -= referenced_attachment_ids(updated_post.get("content"))
+            await delete_attachments(db, list(removed_ids))
+        await index_post(db, updated_post)
+        if {"title", "prefix", "board", "subcategory"} & update_data.keys():
+            await update_post_events(db, updated_post)
     return {"message": "게시글이 수정되었습니다."}
 
 @router.delete("/{post_id}")
 async def delete_post(post_id: str, db=Depends(get_database), user=Depends(get_current_user)):
+    """
+    게시글을 즉시 숨기고, 댓글/좋아요/첨부파일 삭제는 백그라운드 작업으로 처리합니다.
+    진행 상황은 GET /api/board/jobs/{job_id}로 확인할 수 있습니다.
+    """
     collection = db["board"]
     try:
         oid = ObjectId(post_id)
     except Exception:
         raise HTTPException(status_code=400, detail="유효하지 않은 post_id입니다.")
-    post = await collection.find_one({"_id": oid})
+    post = await collection.find_one({"_id": oid, **NOT_DELETED})
     if not post:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
     if post.get("writer_id") != user["id"]:
         raise HTTPException(status_code=403, detail="작성자만 삭제할 수 있습니다.")
 
-    # 게시글과 관련된 데이터들을 함께 삭제
-    await collection.delete_one({"_id": oid})
-
-    # 해당 게시글의 모든 댓글 삭제
-    comments_collection = db["comments"]
-    deleted_comments = await comments_collection.delete_many({"post_id": post_id})
-
-    # 해당 게시글의 모든 좋아요 삭제
-    likes_collection = db["post_likes"]
-    deleted_likes = await likes_collection.delete_many({"post_id": post_id})
-
-    # 해당 게시글의 모든 조회수 기록 삭제
-    views_collection = db["post_views"]
-    deleted_views = await views_collection.delete_many({"post_id": post_id})
-
-    # 삭제된 데이터 개수 로그
-    print(f"게시글 삭제 완료 - post_id: {post_id}, 댓글: {deleted_comments.deleted_count}개, 좋아요: {deleted_likes.deleted_count}개, 조회수기록: {deleted_views.deleted_count}개")
+    job_id = await enqueue_post_deletion(db, oid, post_id)
+    post_cache.invalidate(post_id)
+    collection_versions.bump("board")
 
     return {
-        "message": "게시글과 관련 데이터가 모두 삭제되었습니다.",
-        "deleted_counts": {
-            "comments": deleted_comments.deleted_count,
-            "likes": deleted_likes.deleted_count,
-            "views": deleted_views.deleted_count
-        }
+        "message": "게시글이 삭제되었습니다. 관련 데이터는 순차적으로 삭제됩니다.",
+        "job_id": job_id
     }
 
-# ===== 조회수 및 좋아요 엔드포인트 =====
+@router.get("/jobs/{job_id}")
+async def get_delete_job(job_id: str, db=Depends(get_database)):
+    """게시글 삭제 작업 상태와 지금까지 삭제된 데이터 개수를 조회합니다."""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
 
-VIEW_COOLDOWN = timedelta(minutes=5)
+# ===== 조회수 및 좋아요 엔드포인트 =====
 
 @router.post("/{post_id}/view")
 async def increment_view(post_id: str, request: Request, db=Depends(get_database)):
+    """
+    조회수를 증가시킵니다.
+    같은 사용자(또는 IP)의 5분 내 재조회는 무시되며, 증가분은 view_aggregator가 모아서 주기적으로 기록합니다.
+    없거나 삭제된 게시글은 404입니다. (존재 확인은 post_cache 사용)
+    """
     try:
         oid = ObjectId(post_id)
     except Exception:
         raise HTTPException(status_code=400, detail="유효하지 않은 post_id입니다.")
 
+    if not await get_cached_post(db, post_id, oid):
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+
     user_id = None
     if hasattr(request.state, "user") and request.state.user:
         user_id = request.state.user.get("id")
     identifier = user_id or request.client.host
 
-    now = datetime.utcnow()  # UTC 기준
-    view_collection = db["post_views"]
-    view_record = await view_collection.find_one({"post_id": post_id, "identifier": identifier})
+    if not view_aggregator.record_view(post_id, identifier):
+        return {"success": False, "reason": "cooldown"}
+    return {"success": True}
 
-    if view_record:
-        last_view = view_record.get("last_view")
-        if now - last_view < VIEW_COOLDOWN:
-            return {"success": False, "reason": "cooldown"}
-        else:
-            await view_collection.update_one({"_id": view_record["_id"]}, {"$set": {"last_view": now}})
-    else:
-        await view_collection.insert_one({"post_id": post_id, "identifier": identifier, "last_view": now})
+@router.get("/metrics/views")
+async def get_view_metrics():
+    """조회수 버퍼 상태 (버퍼링/기록된 조회 수 등)"""
+    return view_aggregator.metrics()
 
-    board_collection = db["board"]
-    result = await board_collection.update_one({"_id": oid}, {"$inc": {"views": 1}})
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
-    return {"success": True}
+@router.get("/metrics/cache")
+async def get_cache_metrics():
+    """단일 게시글 캐시 상태 (hit/miss 등)"""
+    return post_cache.metrics()
 
 @router.post("/{post_id}/like")
 async def toggle_like(post_id: str, request: Request, db=Depends(get_database), user=Depends(get_current_user)):
@@ -196,121 +384,203 @@ async def toggle_like(post_id: str, request: Request, db=Depends(get_database),
     user_id = user.get("id")
     if not user_id:
         raise HTTPException(status_code=400, detail="사용자 정보가 올바르지 않습니다.")
-    now = datetime.utcnow()
 
-    like_collection = db["post_likes"]
-    like_record = await like_collection.find_one({"post_id": post_id, "identifier": user_id})
+    if not await get_cached_post(db, post_id, oid):
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-    board_collection = db["board"]
-    if like_record:
-        await like_collection.delete_one({"_id": like_record["_id"]})
-        await board_collection.update_one({"_id": oid}, {"$inc": {"likes": -1}})
-        return {"likeStatus": "unliked"}
-    else:
-        await like_collection.insert_one({
-            "post_id": post_id,
-            "identifier": user_id,
-            "liked_at": now
-        })
-        await board_collection.update_one({"_id": oid}, {"$inc": {"likes": 1}})
-        return {"likeStatus": "liked"}
+    like_status = await toggle_like_record(db, oid, post_id, user_id)
+    return {"likeStatus": like_status}
+
+@router.get("/likes/me")
+async def get_my_likes(post_ids: str, db=Depends(get_database), user=Depends(get_current_user)):
+    """
+    쉼표로 구분된 게시글 ID 중 로그인한 사용자가 좋아요한 게시글 ID 목록을 반환합니다.
+    예: /api/board/likes/me?post_ids=id1,id2,id3
+    """
+    ids = [post_id.strip() for post_id in post_ids.split(",") if post_id.strip()]
+    liked = await liked_post_ids(db, ids, user["id"])
+    return {"liked_post_ids": [post_id for post_id in ids if post_id in liked]}
 
 # ===== 댓글 관련 엔드포인트 (게시판에 통합) =====
 
 @router.post("/{post_id}/comments/create")
-async def create_comment(post_id: str, comment: dict, db=Depends(get_database), user=Depends(get_current_user)):
+async def create_comment(
+    post_id: str,
+    comment: dict,
+    db=Depends(get_database),
+    user=Depends(get_current_user),
+    loaders=Depends(get_loaders)
+):
     """
     댓글/답글 작성 엔드포인트
-    - URL 파라미터로 게시글 ID를 받고, 요청 바디에는 'content' (필수) 및 선택적 'image', 'parent_comment_id' 필드를 포함합니다.
+    - URL 파라미터로 게시글 ID를 받고, 요청 바디에는 'content' (필수) 및 선택적 'attachments', 'parent_comment_id' 필드를 포함합니다.
+    - attachments는 /api/attachments/로 업로드한 첨부파일 ID 목록입니다. (base64 'image'는 첨부파일로 옮겨 저장)
     - parent_comment_id가 있으면 답글로 처리됩니다.
     - 로그인한 사용자의 이름과 ID를 댓글 작성자로 기록합니다.
     """
     if "content" not in comment or not comment["content"].strip():
         raise HTTPException(status_code=400, detail="댓글 내용(content)이 필요합니다.")
 
+    try:
+        post_oid = ObjectId(post_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 post_id입니다.")
+    post = await get_cached_post(db, post_id, post_oid)
+    if not post:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+    # 댓글 활동 기록 시 게시글을 다시 조회하지 않도록 요청 로더에 넣어 둠
+    loaders.posts.prime(post_id, post)
+
     # 답글인 경우 부모 댓글 존재 확인
+    parent_comment = None
     if "parent_comment_id" in comment and comment["parent_comment_id"]:
         try:
             parent_oid = ObjectId(comment["parent_comment_id"])
-            parent_comment = await db["comments"].find_one({"_id": parent_oid, "post_id": post_id})
-            if not parent_comment:
-                raise HTTPException(status_code=404, detail="부모 댓글을 찾을 수 없습니다.")
         except Exception:
             raise HTTPException(status_code=400, detail="유효하지 않은 parent_comment_id입니다.")
+        parent_comment = await db["comments"].find_one({"_id": parent_oid, "post_id": post_id})
+        if not parent_comment:
+            raise HTTPException(status_code=404, detail="부모 댓글을 찾을 수 없습니다.")
 
     comment["post_id"] = post_id
     comment["writer"] = user["name"]
     comment["writer_id"] = user["id"]
-    comment["date"] = datetime.now(seoul_tz).isoformat()
+    now = datetime.now(seoul_tz)
+    comment["date"] = now.isoformat()  # 응답 호환용 문자열
+    comment["created_at"] = now  # 조회/정렬용 BSON datetime
     comment["parent_comment_id"] = comment.get("parent_comment_id", None)
+    comment.update(thread_fields(parent_comment))
+    attachment_ids = await claim_attachments(db, comment.get("attachments"), user["id"], post_id)
+    comment["attachments"] = attachment_ids + await externalize_comment_image(db, comment, user["id"], post_id)
 
     result = await db["comments"].insert_one(comment)
+    await apply_comment_created(db, post_id, comment)
+    await apply_reply_created(db, comment)
+    await index_comment(db, post_id, comment)
+    await record_comment_created(db, comment, loaders)
+    post_cache.invalidate(post_id)
+    collection_versions.bump("board")
     new_comment = await db["comments"].find_one({"_id": result.inserted_id})
     new_comment["id"] = str(new_comment["_id"])
     del new_comment["_id"]
     return new_comment
 
 @router.get("/{post_id}/comments")
-async def get_comments(post_id: str, db=Depends(get_database)):
+async def get_comments(
+    post_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db=Depends(get_database)
+):
     """
     특정 게시글(post_id)의 댓글 목록을 조회합니다.
-    댓글은 작성 시간(date) 기준 오름차순으로 정렬되며, 답글도 함께 반환됩니다.
+    댓글은 작성 시간(date) 기준 오름차순으로 정렬됩니다.
+    - limit 또는 cursor를 지정하면 최상위 댓글만 페이지 단위로 반환합니다.
+      {"comments": [...], "next_cursor": ...} 형태이며, 답글은 /comments/{comment_id}/replies로 조회합니다.
+    - 지정하지 않으면 기존과 같이 최상위 댓글 100개와 그 답글(최대 1000개)을 트리 구조로 반환합니다.
+    - 게시글이 없거나 숨김 처리되었으면 404를 반환합니다.
+    """
+    await require_visible_post(db, post_id)
+    root_query = {"post_id": post_id, "root_id": None, "parent_comment_id": None}
+
+    if limit is not None or cursor is not None:
+        roots, next_cursor = await fetch_thread_page(db, root_query, cursor, clamp_limit(limit))
+        return {"comments": roots, "next_cursor": next_cursor}
+
+    roots, _ = await fetch_thread_page(db, root_query, None, LEGACY_ROOT_LIMIT)
+    if not roots:
+        return []
+
+    # 스레드별 답글을 $in 쿼리 한 번으로 조회
+    replies_cursor = db["comments"].find({
+        "post_id": post_id,
+        "root_id": {"$in": [root["id"] for root in roots]}
+    }).sort([("created_at", 1), ("_id", 1)]).limit(LEGACY_REPLY_LIMIT)
+    replies = await replies_cursor.to_list(LEGACY_REPLY_LIMIT)
+    for reply in replies:
+        reply["id"] = str(reply["_id"])
+        del reply["_id"]
+
+    return build_thread_tree(roots, replies)
+
+@router.get("/{post_id}/comments/{comment_id}/replies")
+async def get_comment_replies(
+    post_id: str,
+    comment_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db=Depends(get_database)
+):
     """
-    comments_cursor = db["comments"].find({"post_id": post_id}).sort("date", 1)
-    comments = await comments_cursor.to_list(length=100)
-
-    # 댓글들을 트리 구조로 정리
-    comment_dict = {}
-    root_comments = []
-
-    for comment in comments:
-        comment["id"] = str(comment["_id"])
-        del comment["_id"]
-        comment["replies"] = []
-        comment_dict[comment["id"]] = comment
-
-        # 기존 댓글과의 호환성을 위해 get() 사용
-        parent_comment_id = comment.get("parent_comment_id", None)
-        if parent_comment_id:
-            # 답글인 경우 부모 댓글의 replies에 추가
-            if parent_comment_id in comment_dict:
-                comment_dict[parent_comment_id]["replies"].append(comment)
-        else:
-            # 최상위 댓글인 경우
-            root_comments.append(comment)
-
-    return root_comments
+    최상위 댓글(comment_id) 스레드의 답글을 작성 시간 오름차순으로 페이지 단위 조회합니다.
+    답글은 평탄한 목록이며 parent_comment_id와 depth로 중첩 관계를 표현합니다.
+    게시글이 없거나 숨김 처리되었으면 404를 반환합니다.
+    """
+    await require_visible_post(db, post_id)
+    replies, next_cursor = await fetch_thread_page(
+        db,
+        {"post_id": post_id, "root_id": comment_id},
+        cursor,
+        clamp_limit(limit)
+    )
+    return {"replies": replies, "next_cursor": next_cursor}
 
 # ===== 통합 게시판 조회 API =====
 
 @router.get("/all/recent")
-async def get_all_recent_posts(limit: int = 50, db=Depends(get_database)):
+async def get_all_recent_posts(
+    limit: int = 50,
+    fields: Optional[str] = None,
+    db=Depends(get_database),
+    user=Depends(get_optional_user),
+    loaders=Depends(get_loaders)
+):
     """
     모든 게시판의 최근 게시글들을 통합하여 조회합니다.
     각 게시판별로 최신순으로 정렬하여 반환합니다.
+    fields=summary이면 본문(content) 대신 요약(excerpt)만 포함합니다.
+    로그인한 경우 각 게시글에 likedByMe가 표시됩니다.
     """
     collection = db["board"]
+    projection = list_projection(fields)
 
     # 모든 게시글을 최신순으로 조회
-    posts_cursor = collection.find({}).sort("date", -1).limit(limit)
+    posts_cursor = collection.find(NOT_DELETED, projection).sort("created_at", -1).limit(limit)
     posts = await posts_cursor.to_list(limit)
 
     for post in posts:
         post["id"] = str(post["_id"])
         del post["_id"]
 
-        # 댓글 수 계산
-        comment_count = await db["comments"].count_documents({"post_id": post["id"]})
-        post["commentCount"] = comment_count
+    # 댓글 수 및 최근 답글 여부 (최근 3일 내 답글이 있는지)
+    await attach_recent_reply_stats(db, posts)
+
+    return await mark_liked_by_me(db, posts, user, loaders)
+
+# 홈 화면 카테고리 -> 게시판 유형
+HOME_CATEGORIES = {
+    "자유": "자유",
+    "연구자료": "연구",
+    "제출자료": "연구",
+    "제안서": "연구"
+}
+
+async def _fetch_category_posts(collection, category_name: str, board_type: str, limit: int):
+    if board_type == "연구":
+        # 연구 게시판의 경우 subcategory로 필터링
+        query = {"board": board_type, "subcategory": category_name, **NOT_DELETED}
+    else:
+        # 자유게시판의 경우
+        query = {"board": board_type, **NOT_DELETED}
+
+    posts = await collection.find(query).sort("created_at", -1).limit(limit).to_list(limit)
+
+    for post in posts:
+        post["id"] = str(post["_id"])
+        del post["_id"]
 
-        # 최근 답글 여부 확인 (최근 3일 내 답글이 있는지)
-        recent_reply_count = await db["comments"].count_documents({
-            "post_id": post["id"],
-            "parent_comment_id": {"$exists": True, "$ne": None},
-            "date": {"$gte": (datetime.now(seoul_tz) - timedelta(days=3)).isoformat()}
-        })
-        post["hasRecentReplies"] = recent_reply_count > 0
-        post["recentReplyCount"] = recent_reply_count
+    # 댓글 수 및 최근 답글 여부 (게시글에 저장된 카운터 사용)
+    await attach_recent_reply_stats(collection.database, posts)
 
     return posts
 
@@ -319,49 +589,16 @@ async def get_posts_by_category(db=Depends(get_database)):
     """
     카테고리별로 게시글들을 분류하여 반환합니다.
     각 카테고리별로 최신 10개씩 반환합니다.
+    네 카테고리 쿼리는 (board, subcategory, created_at) 인덱스를 타며 동시에 실행됩니다.
     """
     collection = db["board"]
 
-    # 카테고리별 게시글 조회
-    categories = {
-        "자유": "자유",
-        "연구자료": "연구",
-        "제출자료": "연구",
-        "제안서": "연구"
-    }
-
-    result = {}
-
-    for category_name, board_type in categories.items():
-        if board_type == "연구":
-            # 연구 게시판의 경우 subcategory로 필터링
-            query = {"board": board_type, "subcategory": category_name}
-        else:
-            # 자유게시판의 경우
-            query = {"board": board_type}
-
-        posts_cursor = collection.find(query).sort("date", -1).limit(10)
-        posts = await posts_cursor.to_list(10)
-
-        for post in posts:
-            post["id"] = str(post["_id"])
-            del post["_id"]
-
-            # 댓글 수 계산
-            comment_count = await db["comments"].count_documents({"post_id": post["id"]})
-            post["commentCount"] = comment_count
+    buckets = await asyncio.gather(*[
+        _fetch_category_posts(collection, category_name, board_type, 10)
+        for category_name, board_type in HOME_CATEGORIES.items()
+    ])
 
-            # 최근 답글 여부 확인
-            recent_reply_count = await db["comments"].count_documents({
-                "post_id": post["id"],
-                "parent_comment_id": {"$exists": True, "$ne": None},
-                "date": {"$gte": (datetime.now(seoul_tz) - timedelta(days=3)).isoformat()}
-            })
-            post["hasRecentReplies"] = recent_reply_count > 0
-
-        result[category_name] = posts
-
-    return result
+    return dict(zip(HOME_CATEGORIES.keys(), buckets))
 
 # ===== 댓글 삭제 엔드포인트 =====
 
@@ -383,5 +620,13 @@ async def delete_comment(post_id: str, comment_id: str, db=Depends(get_database)
     if comment.get("writer_id") != user["id"]:
         raise HTTPException(status_code=403, detail="작성자만 삭제할 수 있습니다.")
 
-    await db["comments"].delete_one({"_id": comment_oid})
+    result = await db["comments"].delete_one({"_id": comment_oid})
+    if result.deleted_count:
+        await apply_comment_deleted(db, post_id, comment)
+        await apply_reply_deleted(db, comment)
+        await delete_attachments(db, comment.get("attachments"))
+        await remove_comment(db, post_id, comment)
+        await refresh_comment_event(db, post_id, comment_id)
+        post_cache.invalidate(post_id)
+        collection_versions.bump("board")
     return {"message": "댓글이 삭제되었습니다."}
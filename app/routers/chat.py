@@ -1,11 +1,19 @@
 # app/routers/chat.py
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from app.core.database import get_database
 from app.models.chat import ChatRoomCreate, ChatRoom, ChatMessageCreate, ChatMessage, ChatRoomResponse
 from app.utils.security import get_current_user
+from app.core.chat_writer import chat_writer
+from app.core.chat_inbox import fetch_inbox, room_participants
+from app.core.chat_history import DESCENDING_ORDER, fetch_messages, serialize_message
+from app.utils.pagination import clamp_limit
+from app.core.chat_read_state import attach_read_flags, serialize_read_state
+from app.core.chat_unread import (
+    initial_unread_fields, mark_room_read, unread_count, total_unread
+)
 from bson import ObjectId
 from datetime import datetime
-from typing import List
+from typing import Optional
 import pytz
 
 router = APIRouter()
@@ -57,9 +65,11 @@ async def create_or_get_chat_room(
             "user2_id": max(current_user_id, target_user_id),
             "user1_name": current_user_name if current_user_id < target_user_id else target_user_name,
             "user2_name": target_user_name if current_user_id < target_user_id else current_user_name,
+            "participants": room_participants(current_user_id, target_user_id),
             "created_at": datetime.now(seoul_tz),
             "last_message": None,
-            "last_message_at": None
+            "last_message_at": None,
+            **initial_unread_fields(current_user_id, target_user_id)
         }
 
         result = await db["chat_rooms"].insert_one(chat_room_data)
@@ -77,63 +87,88 @@ async def create_or_get_chat_room(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"채팅방 생성 실패: {str(e)}")
 
+def _room_response(room: dict, user_id: str) -> ChatRoomResponse:
+    # 상대방 정보 결정
+    if room["user1_id"] == user_id:
+        other_user_id = room["user2_id"]
+        other_user_name = room["user2_name"]
+    else:
+        other_user_id = room["user1_id"]
+        other_user_name = room["user1_name"]
+
+    return ChatRoomResponse(
+        room_id=room["room_id"],
+        other_user_id=other_user_id,
+        other_user_name=other_user_name,
+        last_message=room.get("last_message"),
+        last_message_at=room.get("last_message_at"),
+        unread_count=unread_count(room, user_id)
+    )
+
 @router.get("/rooms")
 async def get_user_chat_rooms(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
     db=Depends(get_database),
     current_user=Depends(get_current_user)
-) -> List[ChatRoomResponse]:
-    """사용자의 채팅방 목록 조회"""
+):
+    """
+    사용자의 채팅방 목록 조회 (최근 메시지 순)
+    - cursor를 지정하면(첫 페이지는 빈 값) 한 번에 최대 limit개(기본 50개, 최대 100개)를
+      {"rooms": [...], "next_cursor": ...} 형태로 반환합니다.
+    - cursor 없이 limit만 지정하면 목록만 반환하고 채팅방이 더 있으면 다음 커서를 X-Next-Cursor 헤더로 알려 줍니다.
+    - 둘 다 지정하지 않으면 기존과 같이 전체 목록을 반환합니다.
+    """
     try:
         user_id = current_user["id"]
 
-        # 사용자가 참여한 채팅방 조회
-        rooms = await db["chat_rooms"].find({
-            "$or": [
-                {"user1_id": user_id},
-                {"user2_id": user_id}
-            ]
-        }).sort("last_message_at", -1).to_list(length=None)
-
-        room_responses = []
-        for room in rooms:
-            # 상대방 정보 결정
-            if room["user1_id"] == user_id:
-                other_user_id = room["user2_id"]
-                other_user_name = room["user2_name"]
-            else:
-                other_user_id = room["user1_id"]
-                other_user_name = room["user1_name"]
-
-            # 읽지 않은 메시지 수 조회
-            unread_count = await db["chat_messages"].count_documents({
-                "room_id": room["room_id"],
-                "sender_id": {"$ne": user_id},
-                "is_read": False
-            })
-
-            room_responses.append(ChatRoomResponse(
-                room_id=room["room_id"],
-                other_user_id=other_user_id,
-                other_user_name=other_user_name,
-                last_message=room.get("last_message"),
-                last_message_at=room.get("last_message_at"),
-                unread_count=unread_count
-            ))
-
-        return room_responses
+        # participants 멀티키 인덱스로 사용자가 참여한 채팅방 조회
+        page_limit = None if cursor is None and limit is None else clamp_limit(limit)
+        rooms, next_cursor = await fetch_inbox(db, user_id, cursor, page_limit)
+        room_responses = [_room_response(room, user_id) for room in rooms]
+
+        if cursor is None:
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return room_responses
+        return {"rooms": room_responses, "next_cursor": next_cursor}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"채팅방 목록 조회 실패: {str(e)}")
 
+@router.get("/unread/total")
+async def get_total_unread(
+    db=Depends(get_database),
+    current_user=Depends(get_current_user)
+):
+    """전체 읽지 않은 메시지 수 (배지용)"""
+    try:
+        return {"unread_count": await total_unread(db, current_user["id"])}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"읽지 않은 메시지 수 조회 실패: {str(e)}")
+
+@router.get("/metrics/writer")
+async def get_chat_writer_metrics():
+    return chat_writer.metrics()
+
 @router.get("/room/{room_id}/messages")
 async def get_chat_messages(
     room_id: str,
     skip: int = 0,
     limit: int = 50,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
     db=Depends(get_database),
     current_user=Depends(get_current_user)
 ):
-    """채팅방의 메시지 조회"""
+    """
+    채팅방의 메시지 조회 (오래된 것부터)
+    before/after(메시지 ID)를 지정하면 keyset 페이지네이션으로 {"messages": [...], "has_more": ..., "read_state": ...}를 반환하고,
+    지정하지 않으면 기존과 같이 최신 메시지 목록만 반환합니다. (skip은 이전 클라이언트 호환용)
+    """
     try:
         user_id = current_user["id"]
 
@@ -145,33 +180,34 @@ async def get_chat_messages(
         if user_id not in [room["user1_id"], room["user2_id"]]:
             raise HTTPException(status_code=403, detail="이 채팅방에 접근할 권한이 없습니다.")
 
-        # 메시지 조회 (최신순)
-        messages = await db["chat_messages"].find({
-            "room_id": room_id
-        }).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+        limit = clamp_limit(limit)
+        if skip and not (before or after):
+            # 이전 클라이언트 호환: skip은 건너뛴 만큼 인덱스를 읽고 보관된 메시지는 읽지 않으므로 before 커서 사용 권장
+            messages = await db["chat_messages"].find({
+                "room_id": room_id
+            }).sort(DESCENDING_ORDER).skip(skip).limit(limit).to_list(length=None)
+            messages.reverse()
+            messages = [serialize_message(message) for message in messages]
+            has_more = None
+        else:
+            messages, has_more = await fetch_messages(db, room_id, limit, before=before, after=after)
 
         print(f"📥 메시지 조회: {room_id} -> {len(messages)}개 메시지 발견")
 
-        # 시간순으로 정렬 (오래된 것부터)
-        messages.reverse()
-
-        # 메시지를 읽음으로 표시 (상대방이 보낸 메시지만)
-        await db["chat_messages"].update_many(
-            {
-                "room_id": room_id,
-                "sender_id": {"$ne": user_id},
-                "is_read": False
-            },
-            {"$set": {"is_read": True}}
-        )
+        # is_read는 조회 시점의 읽음 워터마크로 계산
+        attach_read_flags(messages, room)
 
-        # ObjectId를 문자열로 변환
-        for message in messages:
-            if "_id" in message:
-                message["_id"] = str(message["_id"])
+        # 최신 메시지까지 조회했으면 읽음 워터마크를 마지막 메시지로 이동 (채팅방 문서 update 한 번)
+        # (최신 페이지의 has_more는 이전 메시지 여부, after 페이지의 has_more는 이후 메시지 여부)
+        if messages and not skip and not before and not (after and has_more):
+            await mark_room_read(db, room_id, user_id, messages[-1])
 
-        return messages
+        if before is None and after is None:
+            return messages
+        return {"messages": messages, "has_more": has_more, "read_state": serialize_read_state(room)}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"메시지 조회 실패: {str(e)}")
 
@@ -199,30 +235,9 @@ async def send_message(
         if user_id not in [room["user1_id"], room["user2_id"]]:
             raise HTTPException(status_code=403, detail="이 채팅방에 접근할 권한이 없습니다.")
 
-        # 메시지 저장
-        message_doc = {
-            "room_id": room_id,
-            "sender_id": user_id,
-            "sender_name": user_name,
-            "message": message,
-            "created_at": datetime.now(seoul_tz),
-            "is_read": False
-        }
-
-        result = await db["chat_messages"].insert_one(message_doc)
-
-        # 채팅방의 마지막 메시지 업데이트
-        await db["chat_rooms"].update_one(
-            {"room_id": room_id},
-            {
-                "$set": {
-                    "last_message": message,
-                    "last_message_at": datetime.now(seoul_tz)
-                }
-            }
-        )
-
-        message_doc["_id"] = str(result.inserted_id)
+        # 메시지 저장 (group commit: 다른 메시지와 함께 기록된 뒤 반환)
+        message_doc = serialize_message(await chat_writer.submit(room, user_id, user_name, message))
+        message_doc["is_read"] = False
 
         return message_doc
 
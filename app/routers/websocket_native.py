@@ -1,18 +1,22 @@
 # app/routers/websocket_native.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
 from typing import Dict, List
 import json
 import jwt
-from datetime import datetime
-import pytz
 from app.core.database import db
 from app.core.config import settings
+from app.core.activity_events import fetch_first_page
+from app.core.activity_stream import activity_stream
+from app.core.chat_unread import mark_room_read
+from app.core.chat_writer import chat_writer
+from app.core.chat_read_state import attach_read_flags, serialize_read_state
+from bson import ObjectId
+from app.core.chat_history import fetch_messages, serialize_message
+from app.core.chat_archive import find_archived_message
+from app.utils.pagination import clamp_limit
 
 router = APIRouter()
 
-# 서울 타임존
-seoul_tz = pytz.timezone('Asia/Seoul')
-
 # 연결된 클라이언트들 관리
 class ConnectionManager:
     def __init__(self):
@@ -137,7 +141,13 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
             message_type = message_data.get("type")
 
             if message_type == "send_message":
-                await handle_send_message(room_id, user_info, message_data)
+                await handle_send_message(room, user_info, message_data)
+
+            elif message_type == "sync":
+                await handle_sync(websocket, room_id, message_data)
+
+            elif message_type == "read":
+                await handle_read(room_id, user_info, message_data)
 
             elif message_type == "typing_start":
                 await manager.send_typing_status(room_id, websocket, {
@@ -164,47 +174,104 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
             "user_name": user_info["name"]
         })
 
-async def handle_send_message(room_id: str, user_info: dict, message_data: dict):
+async def handle_send_message(room: dict, user_info: dict, message_data: dict):
     """메시지 전송 처리"""
+    room_id = room["room_id"]
     message_text = message_data.get("message", "").strip()
 
     if not message_text:
         return
 
-    # 데이터베이스에 메시지 저장
-    message_doc = {
-        "room_id": room_id,
-        "sender_id": user_info["id"],
-        "sender_name": user_info["name"],
-        "message": message_text,
-        "created_at": datetime.now(seoul_tz),
-        "is_read": False
-    }
-
-    result = await db["chat_messages"].insert_one(message_doc)
-    message_doc["_id"] = str(result.inserted_id)
+    # 데이터베이스에 메시지 저장 (group commit: 다른 메시지와 함께 기록된 뒤 반환)
+    message_doc = await chat_writer.submit(room, user_info["id"], user_info["name"], message_text)
 
     print(f"💬 메시지 저장: {user_info['name']} -> {room_id}: {message_text}")
 
-    # 채팅방의 마지막 메시지 업데이트
-    await db["chat_rooms"].update_one(
-        {"room_id": room_id},
-        {
-            "$set": {
-                "last_message": message_text,
-                "last_message_at": datetime.now(seoul_tz)
-            }
-        }
-    )
-
-    # 채팅방의 모든 사용자에게 메시지 전송
+    # 채팅방의 모든 사용자에게 메시지 전송 (sync/REST 조회와 같은 형식, _id는 after 커서로 사용)
+    # id는 기존 클라이언트 호환용 (_id와 같은 값)
+    message = serialize_message(message_doc)
     await manager.send_to_room(room_id, {
         "type": "new_message",
-        "id": message_doc["_id"],
-        "room_id": room_id,
-        "sender_id": user_info["id"],
-        "sender_name": user_info["name"],
-        "message": message_text,
-        "created_at": message_doc["created_at"].isoformat(),
+        "id": message["_id"],
+        **message,
         "is_read": False
     })
+
+async def handle_sync(websocket: WebSocket, room_id: str, message_data: dict):
+    """
+    재연결 후 놓친 메시지 따라잡기 / 이전 메시지 조회 (요청한 연결에만 응답)
+    {"type": "sync", "after": <message_id>} 또는 {"type": "sync", "before": <message_id>}
+    응답은 REST 메시지 조회와 같은 {"messages", "has_more"} 형식입니다.
+    """
+    limit = message_data.get("limit")
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool)):
+        await websocket.send_text(json.dumps({"type": "error", "detail": "limit은 정수여야 합니다."}, ensure_ascii=False))
+        return
+
+    try:
+        messages, has_more = await fetch_messages(
+            db, room_id, clamp_limit(limit),
+            before=message_data.get("before"), after=message_data.get("after")
+        )
+    except HTTPException as e:
+        await websocket.send_text(json.dumps({"type": "error", "detail": e.detail}, ensure_ascii=False))
+        return
+
+    room = await db["chat_rooms"].find_one({"room_id": room_id}, projection={"user1_id": 1, "user2_id": 1, "read_state": 1})
+    attach_read_flags(messages, room)
+    await websocket.send_text(json.dumps({
+        "type": "sync",
+        "messages": messages,
+        "has_more": has_more,
+        "read_state": serialize_read_state(room)
+    }, ensure_ascii=False))
+
+async def handle_read(room_id: str, user_info: dict, message_data: dict):
+    """
+    읽음 처리 {"type": "read", "message_id": <마지막으로 본 메시지 ID>}
+    읽음 워터마크를 옮기고 채팅방에 읽음 표시 {"type": "read_receipt", "user_id", "message_id"}를 보냅니다.
+    """
+    try:
+        oid = ObjectId(message_data.get("message_id"))
+    except Exception:
+        return
+
+    message = await db["chat_messages"].find_one({"_id": oid, "room_id": room_id}, projection={"created_at": 1})
+    if not message:
+        # 오래된 메시지는 보관 영역(chat_archive)에 있음
+        message = await find_archived_message(db, room_id, oid)
+    if not message:
+        return
+
+    await mark_room_read(db, room_id, user_info["id"], message)
+    await manager.send_to_room(room_id, {
+        "type": "read_receipt",
+        "user_id": user_info["id"],
+        "message_id": str(oid)
+    })
+
+@router.websocket("/ws/activity")
+async def activity_websocket(websocket: WebSocket, limit: int = 10):
+    """
+    최근 활동 실시간 구독 (로그인 불필요, /api/activity/* 폴링 대체)
+    연결 직후 현재 목록(snapshot)을 보내고, 이후 새 활동이 기록될 때마다 전송합니다.
+    """
+    await websocket.accept()
+    limit = max(1, min(limit, 100))
+
+    async def load_snapshot():
+        recent, _ = await fetch_first_page(db, None, limit)
+        comments, _ = await fetch_first_page(db, "comment", limit)
+        return {"type": "snapshot", "recent": recent, "comments": comments}
+
+    try:
+        await activity_stream.subscribe(websocket, load_snapshot)
+        while True:
+            # 클라이언트 메시지는 사용하지 않음 (연결 종료 감지용, ping에는 pong으로 응답)
+            data = await websocket.receive_text()
+            if data == "ping":
+                await websocket.send_text("pong")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        activity_stream.unsubscribe(websocket)
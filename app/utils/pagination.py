@@ -0,0 +1,33 @@
+# app/utils/pagination.py
+"""
+커서(keyset) 페이지네이션 공통 유틸리티
+
+커서는 마지막 항목의 정렬 키를 JSON으로 담아 base64url로 인코딩한 불투명 문자열입니다.
+클라이언트는 내용을 해석하지 않고 next_cursor 값을 그대로 다시 보내면 됩니다.
+"""
+
+import base64
+import json
+from fastapi import HTTPException
+
+# 한 페이지 최대 크기
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+    return data
+
+def clamp_limit(limit: int, default: int = 50) -> int:
+    if limit is None:
+        return default
+    return max(1, min(limit, MAX_PAGE_SIZE))
@@ -31,3 +31,14 @@ def get_current_user(access_token: str = Cookie(None)):
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
 
     return {"id": user_id, "name": user_name}
+
+def get_optional_user(access_token: str = Cookie(None)):
+    """
+    로그인하지 않아도 되는 엔드포인트용. 토큰이 없거나 유효하지 않으면 None을 반환합니다.
+    """
+    if not access_token:
+        return None
+    try:
+        return get_current_user(access_token)
+    except HTTPException:
+        return None
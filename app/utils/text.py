@@ -0,0 +1,60 @@
+# app/utils/text.py
+"""
+게시글/댓글 텍스트 처리 유틸리티 (마크업 제거, 검색용 토큰화)
+"""
+
+import html
+import re
+import unicodedata
+from typing import List
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_DATA_URI_RE = re.compile(r"data:[^\s\"')]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[가-힣]+|[0-9A-Za-zÀ-ɏ]+|[぀-ヿ一-鿿]+")
+_HANGUL_RE = re.compile(r"[가-힣぀-ヿ一-鿿]")
+
+def strip_markup(text: str) -> str:
+    """HTML 태그, 인라인 이미지(data URI), 엔티티를 제거하고 공백을 정리합니다."""
+    if not text:
+        return ""
+    text = _DATA_URI_RE.sub(" ", str(text))
+    text = _TAG_RE.sub(" ", text)
+    text = html.unescape(text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+def search_terms(text: str, unigrams: bool = False) -> List[str]:
+    """
+    검색용 토큰 목록을 만듭니다.
+    - 한글(및 한자/가나) 구간은 글자 bigram으로 나눕니다 (예: 연구자료 -> 연구, 구자, 자료).
+      한 글자 구간은 그대로 사용합니다.
+    - unigrams=True(색인용)이면 글자 하나씩도 함께 넣어 한 글자 검색어(예: 숲)가 긴 단어 안에서도 찾아지게 합니다.
+    - 영문/숫자 구간은 소문자 단어 그대로 사용합니다.
+    중복은 제거하되 처음 등장한 순서를 유지합니다.
+    """
+    text = unicodedata.normalize("NFKC", strip_markup(text)).lower()
+    terms = []
+    seen = set()
+
+    for token in _TOKEN_RE.findall(text):
+        if _HANGUL_RE.match(token):
+            grams = [token] if len(token) == 1 else [token[i:i + 2] for i in range(len(token) - 1)]
+            if unigrams and len(token) > 1:
+                grams += list(token)
+        else:
+            grams = [token]
+
+        for gram in grams:
+            if gram not in seen:
+                seen.add(gram)
+                terms.append(gram)
+
+    return terms
+
+# 목록용 본문 요약 길이
+EXCERPT_LENGTH = 150
+
+def make_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    """마크업을 제거한 본문 앞부분 (목록 표시용)"""
+    text = strip_markup(content)
+    return text[:length] + "..." if len(text) > length else text
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+게시글 일괄 등록 처리량 벤치마크
+
+기존 방식(게시글마다 카운터 증가 + insert_one + 재조회)과
+일괄 등록(게시판별 post_number 구간 예약 + ordered insert_many 배치)의 초당 처리 건수를 비교합니다.
+
+별도의 벤치마크 데이터베이스(<DATABASE_NAME>_bench)에 데이터를 만들고 끝나면 삭제합니다.
+
+    python -m benchmarks.bench_bulk_import --posts 10000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.core.database_setup import reconcile_indexes
+from app.core.bulk_import import prepare_post, reserve_post_numbers, import_posts, seoul_tz
+from app.core.search import index_post
+
+BENCH_USER = {"id": "bench", "name": "bench"}
+BOARDS = ["자유", "연구자료", "제출자료", "제안서"]
+
+def make_items(count: int):
+    return [
+        {
+            "board": BOARDS[i % len(BOARDS)],
+            "title": f"이전 게시글 {i}",
+            "content": "<p>기존 게시판에서 옮겨 온 내용입니다.</p> " * 20
+        }
+        for i in range(count)
+    ]
+
+async def legacy_import(db, items):
+    """게시글마다 create_post와 같은 순서로 저장 (비교용)"""
+    for item in items:
+        post = dict(item)
+        counter_key = prepare_post(post, BENCH_USER, datetime.now(seoul_tz))
+        post["post_number"] = await reserve_post_numbers(db, counter_key, 1)
+        result = await db["board"].insert_one(post)
+        await index_post(db, post)
+        await db["board"].find_one({"_id": result.inserted_id})
+
+async def bulk_import(db, items):
+    result = await import_posts(db, [(dict(item), None) for item in items], BENCH_USER)
+    assert result["created"] == len(items), result["failed"]
+
+async def measure(name: str, func, db, items):
+    await db["board"].delete_many({})
+    await db["post_search"].delete_many({})
+    start = time.perf_counter()
+    await func(db, items)
+    elapsed = time.perf_counter() - start
+    rate = len(items) / elapsed
+    print(f"📊 {name:<10} {elapsed:8.2f} s | {rate:10.1f} posts/s")
+    return rate
+
+async def main(args):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    bench_name = f"{settings.DATABASE_NAME}_bench"
+    await client.drop_database(bench_name)
+    db = client[bench_name]
+
+    try:
+        await reconcile_indexes(db)
+        items = make_items(args.posts)
+        print(f"🧪 게시글 {args.posts}개 등록 (배치 크기 {settings.BULK_IMPORT_BATCH_SIZE})")
+
+        legacy = await measure("legacy", legacy_import, db, items)
+        current = await measure("bulk", bulk_import, db, items)
+        print(f"🚀 처리량 기준 {current / legacy:.1f}배 빠름")
+    finally:
+        await client.drop_database(bench_name)
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 일괄 등록 벤치마크")
+    parser.add_argument("--posts", type=int, default=10000)
+    asyncio.run(main(parser.parse_args()))
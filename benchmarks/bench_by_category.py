@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+/api/board/all/by-category 벤치마크
+
+기존 구현(카테고리별 순차 쿼리 + 게시글마다 count_documents 2회)과
+현재 구현(카테고리 쿼리 동시 실행 + 게시글에 저장된 댓글 카운터)을 비교합니다.
+
+별도의 벤치마크 데이터베이스(<DATABASE_NAME>_bench)에 데이터를 만들고 끝나면 삭제합니다.
+
+    python -m benchmarks.bench_by_category --posts 5000 --comments 20 --rounds 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.core.comment_counters import rebuild_comment_counters
+from app.core.database_setup import reconcile_indexes
+from app.routers.board import get_posts_by_category, HOME_CATEGORIES, seoul_tz
+
+async def legacy_posts_by_category(db):
+    """변경 전 구현 (비교용)"""
+    collection = db["board"]
+    result = {}
+
+    for category_name, board_type in HOME_CATEGORIES.items():
+        if board_type == "연구":
+            query = {"board": board_type, "subcategory": category_name}
+        else:
+            query = {"board": board_type}
+
+        posts = await collection.find(query).sort("date", -1).limit(10).to_list(10)
+
+        for post in posts:
+            post["id"] = str(post["_id"])
+            del post["_id"]
+            post["commentCount"] = await db["comments"].count_documents({"post_id": post["id"]})
+            recent_reply_count = await db["comments"].count_documents({
+                "post_id": post["id"],
+                "parent_comment_id": {"$exists": True, "$ne": None},
+                "date": {"$gte": (datetime.now(seoul_tz) - timedelta(days=3)).isoformat()}
+            })
+            post["hasRecentReplies"] = recent_reply_count > 0
+
+        result[category_name] = posts
+
+    return result
+
+async def seed(db, post_count: int, comments_per_post: int):
+    print(f"🧪 데이터 생성: 게시글 {post_count}개, 게시글당 댓글 최대 {comments_per_post}개")
+    now = datetime.now(seoul_tz)
+    categories = list(HOME_CATEGORIES.items())
+
+    posts = []
+    for i in range(post_count):
+        category_name, board_type = categories[i % len(categories)]
+        post = {
+            "board": board_type,
+            "title": f"벤치마크 게시글 {i}",
+            "content": "내용 " * 50,
+            "writer": "bench",
+            "writer_id": "bench",
+            "date": (now - timedelta(minutes=i)).isoformat(),
+            "created_at": now - timedelta(minutes=i),
+            "post_number": i + 1,
+            "views": 0,
+            "likes": 0,
+            "prefix": ""
+        }
+        if board_type == "연구":
+            post["subcategory"] = category_name
+        posts.append(post)
+    result = await db["board"].insert_many(posts)
+
+    comments = []
+    for post_oid in result.inserted_ids:
+        for j in range(random.randint(0, comments_per_post)):
+            created_at = now - timedelta(minutes=random.randint(0, 10000))
+            comments.append({
+                "post_id": str(post_oid),
+                "content": "댓글",
+                "writer": "bench",
+                "writer_id": "bench",
+                "date": created_at.isoformat(),
+                "created_at": created_at,
+                "parent_comment_id": "bench" if j % 3 == 0 else None
+            })
+    if comments:
+        await db["comments"].insert_many(comments)
+
+    await rebuild_comment_counters(db)
+
+async def measure(name: str, func, db, rounds: int):
+    await func(db)  # 워밍업
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func(db)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"📊 {name:<10} p50 {p50:8.2f} ms | p99 {p99:8.2f} ms")
+    return p50
+
+async def main(args):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    bench_name = f"{settings.DATABASE_NAME}_bench"
+    await client.drop_database(bench_name)
+    db = client[bench_name]
+
+    try:
+        await reconcile_indexes(db)
+        await seed(db, args.posts, args.comments)
+
+        legacy = await measure("legacy", legacy_posts_by_category, db, args.rounds)
+        current = await measure("current", get_posts_by_category, db, args.rounds)
+        print(f"🚀 p50 기준 {legacy / current:.1f}배 빠름")
+    finally:
+        await client.drop_database(bench_name)
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="by-category 엔드포인트 벤치마크")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+채팅 메시지 쓰기 처리량 벤치마크
+
+일정한 속도(기본 1,000 msgs/s)로 여러 채팅방에 메시지를 보내면서
+기존 방식(메시지마다 insert_one + chat_rooms.update_one + 배지 합계 update_one)과
+app.core.chat_writer.ChatWriteBatcher(group commit)의 처리량, 응답 지연, DB 명령 수를 비교합니다.
+
+별도의 벤치마크 데이터베이스(<DATABASE_NAME>_bench)에 데이터를 만들고 끝나면 삭제합니다.
+
+    python -m benchmarks.bench_chat_writes --rate 1000 --seconds 5 --rooms 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime
+from pymongo import monitoring
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.core.chat_inbox import room_participants
+from app.core.chat_unread import initial_unread_fields, unread_increment
+from app.core.chat_writer import ChatWriteBatcher, seoul_tz
+
+class WriteCounter(monitoring.CommandListener):
+    """insert/update 명령 수 (bulk_write/insert_many도 명령 하나로 셈)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in ("insert", "update"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+async def seed_rooms(db, room_count: int):
+    rooms = []
+    for i in range(room_count):
+        user1_id, user2_id = room_participants(f"user{i:05d}a", f"user{i:05d}b")
+        rooms.append({
+            "room_id": f"{user1_id}_{user2_id}",
+            "user1_id": user1_id,
+            "user2_id": user2_id,
+            "user1_name": user1_id,
+            "user2_name": user2_id,
+            "participants": [user1_id, user2_id],
+            "created_at": datetime.now(seoul_tz),
+            "last_message": None,
+            "last_message_at": None,
+            **initial_unread_fields(user1_id, user2_id)
+        })
+    await db["chat_rooms"].insert_many(rooms)
+    return rooms
+
+async def legacy_send(db, room: dict, sender_id: str, message: str):
+    """변경 전 방식: 메시지마다 순서대로 기록 (비교용)"""
+    message_doc = {
+        "room_id": room["room_id"],
+        "sender_id": sender_id,
+        "sender_name": sender_id,
+        "message": message,
+        "created_at": datetime.now(seoul_tz)
+    }
+    result = await db["chat_messages"].insert_one(message_doc)
+    await db["chat_rooms"].update_one(
+        {"room_id": room["room_id"]},
+        {
+            "$set": {
+                "last_message": message,
+                "last_message_at": message_doc["created_at"],
+                "last_message_id": result.inserted_id
+            },
+            "$inc": unread_increment(room, sender_id)
+        }
+    )
+    for field in unread_increment(room, sender_id):
+        await db["chat_unread_totals"].update_one(
+            {"_id": field.split(".", 1)[1]}, {"$inc": {"total": 1}}, upsert=True
+        )
+
+async def run_load(name: str, send, rooms, rate: int, seconds: float, counter: WriteCounter):
+    """rate msgs/s로 메시지를 보내고(응답을 기다리지 않고 다음 메시지 전송) 모든 응답이 올 때까지 기다립니다."""
+    total = int(rate * seconds)
+    latencies = []
+
+    async def one(i: int):
+        room = random.choice(rooms)
+        sender_id = random.choice([room["user1_id"], room["user2_id"]])
+        start = time.perf_counter()
+        await send(room, sender_id, f"메시지 {i}")
+        latencies.append(time.perf_counter() - start)
+
+    counter.count = 0
+    tasks = []
+    started = time.perf_counter()
+    for i in range(total):
+        # 예정 시각까지 대기 (open-loop 부하)
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"📊 {name:<8} {total / elapsed:9.1f} msgs/s | p50 {p50:7.2f} ms | p99 {p99:8.2f} ms | "
+        f"DB 쓰기 명령 {counter.count:6d}회 ({counter.count / total:.2f}/msg)"
+    )
+    return total / elapsed
+
+async def verify(db, rooms, expected_messages: int, check_last_message: bool):
+    assert await db["chat_messages"].count_documents({}) == expected_messages, "저장된 메시지 수가 다릅니다."
+    for room in random.sample(rooms, min(len(rooms), 20)):
+        latest = await db["chat_messages"].find_one(
+            {"room_id": room["room_id"]}, sort=[("created_at", -1), ("_id", -1)]
+        )
+        stored = await db["chat_rooms"].find_one({"room_id": room["room_id"]})
+        # 기존 방식은 동시 전송 시 update 순서가 뒤바뀌어 last_message가 이전 메시지로 남을 수 있음
+        if latest and check_last_message:
+            assert stored["last_message_id"] == latest["_id"], f"{room['room_id']} last_message 불일치"
+        unread = sum((stored.get("unread_counts") or {}).values())
+        assert unread == await db["chat_messages"].count_documents({"room_id": room["room_id"]}), "읽지 않은 수 불일치"
+
+async def main(args):
+    counter = WriteCounter()
+    client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=[counter])
+    bench_name = f"{settings.DATABASE_NAME}_bench"
+    total = int(args.rate * args.seconds)
+
+    try:
+        print(f"🧪 채팅방 {args.rooms}개, {args.rate} msgs/s x {args.seconds}s ({total}개 메시지)")
+
+        await client.drop_database(bench_name)
+        db = client[bench_name]
+        rooms = await seed_rooms(db, args.rooms)
+        legacy_rate = await run_load(
+            "legacy", lambda room, sender_id, message: legacy_send(db, room, sender_id, message),
+            rooms, args.rate, args.seconds, counter
+        )
+        await verify(db, rooms, total, check_last_message=False)
+
+        await client.drop_database(bench_name)
+        db = client[bench_name]
+        rooms = await seed_rooms(db, args.rooms)
+        writer = ChatWriteBatcher(flush_interval_ms=args.flush_ms, max_batch=args.max_batch, db=db)
+        writer.start()
+        try:
+            batched_rate = await run_load(
+                "batched", lambda room, sender_id, message: writer.submit(room, sender_id, sender_id, message),
+                rooms, args.rate, args.seconds, counter
+            )
+        finally:
+            await writer.stop()
+        await verify(db, rooms, total, check_last_message=True)
+        print(f"📊 batched  {writer.metrics()}")
+
+        print(f"✅ 처리량 {batched_rate / legacy_rate:.2f}배 (목표 {args.rate} msgs/s)")
+    finally:
+        await client.drop_database(bench_name)
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채팅 메시지 쓰기 처리량 벤치마크")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--rate", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--flush-ms", type=int, default=settings.CHAT_WRITE_FLUSH_INTERVAL_MS)
+    parser.add_argument("--max-batch", type=int, default=settings.CHAT_WRITE_MAX_BATCH)
+    asyncio.run(main(parser.parse_args()))
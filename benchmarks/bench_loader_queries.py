@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+DataLoader 쿼리 수 계측
+
+pymongo 명령 모니터링으로 board 컬렉션에 실제로 전송된 find 명령 수를 세어
+기존 방식(댓글마다 게시글 find_one)과 app.core.loaders.DataLoader($in 한 번 + 요청 내 재사용)를 비교합니다.
+
+별도의 벤치마크 데이터베이스(<DATABASE_NAME>_bench)에 데이터를 만들고 끝나면 삭제합니다.
+
+    python -m benchmarks.bench_loader_queries --posts 50 --comments 200
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime
+from pymongo import monitoring
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.core.loaders import RequestLoaders
+
+class FindCounter(monitoring.CommandListener):
+    """board 컬렉션에 대한 find 명령 수"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name == "find" and event.command.get("find") == "board":
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+async def seed(db, post_count: int, comment_count: int):
+    now = datetime.utcnow()
+    result = await db["board"].insert_many([
+        {"board": "자유", "title": f"게시글 {i}", "prefix": "", "created_at": now}
+        for i in range(post_count)
+    ])
+    post_ids = [str(oid) for oid in result.inserted_ids]
+    return [{"post_id": random.choice(post_ids), "content": "댓글"} for _ in range(comment_count)]
+
+async def legacy_titles(db, comments):
+    """변경 전 방식: 댓글마다 게시글 find_one"""
+    from bson import ObjectId
+    titles = []
+    for comment in comments:
+        post = await db["board"].find_one({"_id": ObjectId(comment["post_id"]), "deleted": {"$ne": True}})
+        titles.append(post.get("title") if post else None)
+    return titles
+
+async def loader_titles(loaders: RequestLoaders, comments):
+    posts = await loaders.posts.load_many([comment["post_id"] for comment in comments])
+    return [post.get("title") if post else None for post in posts]
+
+async def main(args):
+    counter = FindCounter()
+    client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=[counter])
+    bench_name = f"{settings.DATABASE_NAME}_bench"
+    await client.drop_database(bench_name)
+    db = client[bench_name]
+
+    try:
+        comments = await seed(db, args.posts, args.comments)
+        print(f"🧪 댓글 {args.comments}개 (게시글 {args.posts}개)의 게시글 정보 조회")
+
+        counter.count = 0
+        legacy = await legacy_titles(db, comments)
+        legacy_queries = counter.count
+
+        loaders = RequestLoaders(db)
+        counter.count = 0
+        # 같은 요청 안에서 두 번 조회: 두 번째는 메모이즈된 결과를 사용
+        current = await loader_titles(loaders, comments)
+        await loader_titles(loaders, comments[: len(comments) // 2])
+        loader_queries = counter.count
+
+        assert legacy == current, "조회 결과가 다릅니다."
+        print(f"📊 legacy     board find 명령 {legacy_queries}회")
+        print(f"📊 DataLoader board find 명령 {loader_queries}회 {loaders.stats()['posts']}")
+        assert loader_queries == 1, f"DataLoader는 find 한 번이어야 합니다: {loader_queries}"
+        print("✅ 쿼리 수 확인 완료")
+    finally:
+        await client.drop_database(bench_name)
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataLoader 쿼리 수 계측")
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--comments", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,214 @@
+# tests/fakes.py
+"""
+테스트용 메모리 컬렉션
+
+motor 컬렉션 중 app.core 모듈이 쓰는 메서드와 조건만 흉내 냅니다.
+(같음, $exists, $type "string", $ne, $gt/$gte/$lt/$lte, $in, $or / $set, $inc, $unset)
+"""
+
+from types import SimpleNamespace
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+_MISSING = object()
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+def _compare(value, condition):
+    if not isinstance(condition, dict) or not any(key.startswith("$") for key in condition):
+        if isinstance(value, list) and not isinstance(condition, list):
+            return condition in value
+        return value == condition
+
+    for operator, operand in condition.items():
+        if operator == "$exists":
+            if (value is not _MISSING) != operand:
+                return False
+        elif operator == "$ne":
+            if _compare(value, operand):
+                return False
+        elif operator == "$type":
+            values = value if isinstance(value, list) else [value]
+            if operand != "string" or not any(isinstance(item, str) for item in values):
+                return False
+        elif operator == "$in":
+            values = value if isinstance(value, list) else [value]
+            if not any(item in operand for item in values):
+                return False
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            if value is _MISSING or value is None:
+                return False
+            if not {
+                "$gt": value > operand, "$gte": value >= operand,
+                "$lt": value < operand, "$lte": value <= operand
+            }[operator]:
+                return False
+        else:
+            raise NotImplementedError(operator)
+    return True
+
+def matches(doc, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub_query) for sub_query in condition):
+                return False
+        elif not _compare(_get(doc, key), condition):
+            return False
+    return True
+
+def apply_update(doc, update):
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            *parents, last = path.split(".")
+            target = doc
+            for part in parents:
+                target = target.setdefault(part, {})
+            if operator == "$set":
+                target[last] = value
+            elif operator == "$inc":
+                target[last] = target.get(last, 0) + value
+            elif operator == "$unset":
+                target.pop(last, None)
+            else:
+                raise NotImplementedError(operator)
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=None):
+        keys = [(key, direction)] if isinstance(key, str) else key
+        for field, order in reversed(keys):
+            self.docs.sort(key=lambda doc: (_get(doc, field) is _MISSING, _get(doc, field)), reverse=order == -1)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:length] if length else list(self.docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+def _project(doc, projection):
+    if not projection:
+        return dict(doc)
+    projected = {key: doc[key] for key, include in projection.items() if include and key in doc}
+    if projection.get("_id", 1) and "_id" in doc:
+        projected["_id"] = doc["_id"]
+    return projected
+
+class FakeCollection:
+    def __init__(self, docs=None, unique=None):
+        self.docs = [dict(doc) for doc in docs or []]
+        # 유니크 인덱스 필드 (예: ("post_id", "identifier"))
+        self.unique = unique
+        self.calls = []
+
+    def _key(self, doc):
+        return tuple(doc.get(field) for field in self.unique)
+
+    def find(self, query=None, projection=None):
+        self.calls.append("find")
+        return FakeCursor([_project(doc, projection) for doc in self.docs if matches(doc, query or {})])
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        self.calls.append("find_one")
+        cursor = FakeCursor([doc for doc in self.docs if matches(doc, query or {})])
+        if sort:
+            cursor.sort(sort)
+        return _project(cursor.docs[0], projection) if cursor.docs else None
+
+    async def insert_one(self, doc):
+        self.calls.append("insert_one")
+        if self.unique and any(self._key(existing) == self._key(doc) for existing in self.docs):
+            raise DuplicateKeyError("duplicate key")
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(dict(doc))
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls.append("insert_many")
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+            self.docs.append(dict(doc))
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs])
+
+    async def update_one(self, query, update, upsert=False):
+        self.calls.append("update_one")
+        return SimpleNamespace(modified_count=self._update(query, update, upsert))
+
+    async def delete_one(self, query):
+        self.calls.append("delete_one")
+        for index, doc in enumerate(self.docs):
+            if matches(doc, query):
+                del self.docs[index]
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    def _update(self, query, update, upsert=False):
+        for doc in self.docs:
+            if matches(doc, query):
+                apply_update(doc, update)
+                return 1
+        if upsert:
+            doc = {key: value for key, value in query.items() if not key.startswith("$")}
+            apply_update(doc, update)
+            self.docs.append(doc)
+        return 0
+
+    async def bulk_write(self, operations, ordered=True):
+        self.calls.append("bulk_write")
+        modified = 0
+        for operation in operations:
+            if hasattr(operation, "_doc"):
+                modified += self._update(operation._filter, operation._doc, operation._upsert)
+            else:
+                index = next((index for index, doc in enumerate(self.docs) if matches(doc, operation._filter)), None)
+                if index is not None:
+                    del self.docs[index]
+        return SimpleNamespace(modified_count=modified)
+
+    def aggregate(self, pipeline):
+        """$group(_id: "$필드" 또는 {이름: "$필드"}, $sum: 1, $push: "$필드")과 $match만 지원"""
+        docs = list(self.docs)
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [doc for doc in docs if matches(doc, stage["$match"])]
+            elif "$group" in stage:
+                spec = dict(stage["$group"])
+                id_spec = spec.pop("_id")
+                groups = {}
+                for doc in docs:
+                    if isinstance(id_spec, dict):
+                        group_id = {name: doc.get(field[1:]) for name, field in id_spec.items()}
+                    else:
+                        group_id = doc.get(id_spec[1:])
+                    key = repr(group_id)
+                    group = groups.setdefault(key, {"_id": group_id})
+                    for name, accumulator in spec.items():
+                        if "$sum" in accumulator:
+                            group[name] = group.get(name, 0) + accumulator["$sum"]
+                        elif "$push" in accumulator:
+                            group.setdefault(name, []).append(doc.get(accumulator["$push"][1:]))
+                docs = list(groups.values())
+            else:
+                raise NotImplementedError(stage)
+        return FakeCursor(docs)
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
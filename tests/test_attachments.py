@@ -0,0 +1,83 @@
+# tests/test_attachments.py
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.core import attachments
+from app.core.attachments import parse_range, referenced_attachment_ids, store_multipart
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("items=0-1", None),
+    ("bytes=0-1,4-5", None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-", (10, 999)),
+    ("bytes=990-2000", (990, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5-3", "bytes=-0", "bytes=a-b", "bytes=-"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 1000)
+
+def test_referenced_attachment_ids():
+    content = '<img src="/api/attachments/65a1b2c3d4e5f60718293a4b"> /api/attachments/not-an-id'
+    assert referenced_attachment_ids(content) == {"65a1b2c3d4e5f60718293a4b"}
+    assert referenced_attachment_ids(None) == set()
+
+BOUNDARY = "test-boundary"
+
+def multipart_body(file_content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"자료.png\"\r\n"
+        "Content-Type: image/png\r\n\r\n"
+    ).encode("utf-8") + file_content + f"\r\n--{BOUNDARY}--\r\n".encode("ascii")
+
+async def chunked(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+@pytest.fixture
+def stored(monkeypatch):
+    """GridFS 대신 받은 청크를 모으는 store_stream"""
+    result = {}
+
+    async def fake_store_stream(db, chunks, filename, content_type, owner_id, post_id=None):
+        result.update(
+            data=b"".join([chunk async for chunk in chunks]),
+            filename=filename,
+            content_type=content_type,
+            owner_id=owner_id
+        )
+        return result
+
+    monkeypatch.setattr(attachments, "store_stream", fake_store_stream)
+    return result
+
+def test_store_multipart_streams_file_field(stored):
+    content = bytes(range(256)) * 40
+    asyncio.run(store_multipart(None, chunked(multipart_body(content)), f"multipart/form-data; boundary={BOUNDARY}", "user-1"))
+    assert stored == {"data": content, "filename": "자료.png", "content_type": "image/png", "owner_id": "user-1"}
+
+def test_store_multipart_rejects_oversized_body(stored, monkeypatch):
+    monkeypatch.setattr(attachments.settings, "ATTACHMENT_MAX_BYTES", 1024)
+    monkeypatch.setattr(attachments, "MULTIPART_OVERHEAD", 256)
+    body = multipart_body(b"x" * 4096)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store_multipart(None, chunked(body), f"multipart/form-data; boundary={BOUNDARY}", "user-1"))
+    assert error.value.status_code == 413
+
+@pytest.mark.parametrize("body, content_type", [
+    (multipart_body(b"data"), "application/json"),
+    (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n--{BOUNDARY}--\r\n".encode(), None),
+])
+def test_store_multipart_requires_file(stored, body, content_type):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store_multipart(None, chunked(body), content_type or f"multipart/form-data; boundary={BOUNDARY}", "user-1"))
+    assert error.value.status_code == 400
+    assert stored == {}
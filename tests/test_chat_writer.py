@@ -0,0 +1,114 @@
+# tests/test_chat_writer.py
+import asyncio
+import pytest
+from pymongo.errors import BulkWriteError
+from app.core import chat_writer as chat_writer_module
+from app.core.chat_writer import ChatWriteBatcher
+from tests.fakes import FakeCollection, FakeDatabase
+
+ROOMS = [
+    {"room_id": "a_b", "user1_id": "a", "user2_id": "b"},
+    {"room_id": "a_c", "user1_id": "a", "user2_id": "c"},
+]
+
+def make_db():
+    db = FakeDatabase()
+    db["chat_rooms"] = FakeCollection([dict(room, unread_counts={}) for room in ROOMS])
+    return db
+
+async def send_batch(writer, messages):
+    """writer를 시작해 messages[(채팅방, 보낸 사람, 내용)]를 한 배치로 보내고 각 결과(문서 또는 예외)를 반환합니다."""
+    writer.start()
+    try:
+        return await asyncio.gather(
+            *[writer.submit(room, sender, sender, text) for room, sender, text in messages],
+            return_exceptions=True
+        )
+    finally:
+        await writer.stop()
+
+MESSAGES = [(ROOMS[0], "a", "첫 메시지"), (ROOMS[0], "b", "답장"), (ROOMS[1], "a", "다른 방")]
+
+def test_batch_is_written_with_one_call_per_collection():
+    db = make_db()
+    writer = ChatWriteBatcher(flush_interval_ms=10, max_batch=100, db=db)
+
+    results = asyncio.run(send_batch(writer, MESSAGES))
+
+    assert [result["message"] for result in results] == ["첫 메시지", "답장", "다른 방"]
+    assert db["chat_messages"].calls == ["insert_many"]
+    assert db["chat_rooms"].calls == ["bulk_write"]
+    assert db["chat_unread_totals"].calls == ["bulk_write"]
+    room_ab, room_ac = db["chat_rooms"].docs
+    assert room_ab["last_message"] == "답장"
+    assert room_ab["unread_counts"] == {"a": 1, "b": 1}
+    assert room_ac["unread_counts"] == {"c": 1}
+    assert {total["_id"]: total["total"] for total in db["chat_unread_totals"].docs} == {"a": 1, "b": 1, "c": 1}
+    assert writer.metrics()["written"] == 3
+
+def test_failed_insert_rejects_only_failed_messages():
+    db = make_db()
+
+    async def insert_with_error(docs, ordered=True):
+        await FakeCollection.insert_many(db["chat_messages"], [docs[0], docs[2]])
+        raise BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "duplicate key"}]})
+
+    db["chat_messages"].insert_many = insert_with_error
+    writer = ChatWriteBatcher(flush_interval_ms=10, max_batch=100, db=db)
+
+    results = asyncio.run(send_batch(writer, MESSAGES))
+
+    assert isinstance(results[1], Exception) and str(results[1]) == "duplicate key"
+    assert results[0]["message"] == "첫 메시지" and results[2]["message"] == "다른 방"
+    # 실패한 답장은 채팅방/카운터에 반영되지 않음
+    assert db["chat_rooms"].docs[0]["last_message"] == "첫 메시지"
+    assert db["chat_rooms"].docs[0]["unread_counts"] == {"b": 1}
+    assert writer.metrics()["failed"] == 1
+
+def test_room_update_failure_still_succeeds_and_repairs(monkeypatch):
+    db = make_db()
+    repaired = []
+
+    async def failing_bulk_write(operations, ordered=True):
+        raise RuntimeError("chat_rooms unavailable")
+
+    async def fake_repair_rooms(db, room_ids):
+        repaired.append(set(room_ids))
+        return len(room_ids)
+
+    db["chat_rooms"].bulk_write = failing_bulk_write
+    monkeypatch.setattr(chat_writer_module, "repair_rooms", fake_repair_rooms)
+    writer = ChatWriteBatcher(flush_interval_ms=10, max_batch=100, db=db)
+
+    results = asyncio.run(send_batch(writer, MESSAGES))
+
+    assert all(isinstance(result, dict) for result in results)
+    assert repaired == [{"a_b", "a_c"}]
+    # 복구는 chat_messages의 마지막 메시지로 채팅방을 다시 맞춤
+    assert db["chat_rooms"].docs[0]["last_message"] == "답장"
+    assert writer.metrics()["rooms_repaired"] == 2
+    assert writer.metrics()["pending_repairs"] == 0
+
+def test_cancelled_flush_resolves_every_future():
+    db = make_db()
+
+    async def cancelled_insert(docs, ordered=True):
+        raise asyncio.CancelledError()
+
+    db["chat_messages"].insert_many = cancelled_insert
+    writer = ChatWriteBatcher(flush_interval_ms=10, max_batch=100, db=db)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in MESSAGES]
+        writer.pending = [
+            ({"_id": index, "room_id": room["room_id"], "sender_id": sender, "message": text}, room, future)
+            for index, ((room, sender, text), future) in enumerate(zip(MESSAGES, futures))
+        ]
+        with pytest.raises(asyncio.CancelledError):
+            await writer.flush()
+        return futures
+
+    futures = asyncio.run(scenario())
+    assert all(future.done() and isinstance(future.exception(), Exception) for future in futures)
+    assert writer.metrics()["failed"] == 3
@@ -0,0 +1,60 @@
+# tests/test_date_migration.py
+import asyncio
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from app.core import date_migration
+from app.core.date_migration import created_since, migrate_dates, to_utc_naive
+from tests.fakes import FakeCollection, FakeDatabase
+
+@pytest.fixture(autouse=True)
+def reset_migration_flag(monkeypatch):
+    monkeypatch.setattr(date_migration, "_migration_complete", False)
+
+def test_to_utc_naive():
+    assert to_utc_naive("2025-03-01T09:00:00+09:00") == datetime(2025, 3, 1, 0, 0)
+    assert to_utc_naive(datetime(2025, 3, 1, 0, 0)) == datetime(2025, 3, 1, 0, 0)
+    assert to_utc_naive("어제") is None
+    assert to_utc_naive(None) is None
+
+def test_migrates_mixed_string_and_datetime_values():
+    post_oid, comment_oid, broken_oid = ObjectId(), ObjectId(), ObjectId()
+    already = datetime(2025, 2, 1, 12, 0)
+    db = FakeDatabase()
+    db["board"] = FakeCollection([
+        {
+            "_id": post_oid,
+            "date": "2025-03-01T09:00:00+09:00",
+            "last_reply_at": "2025-03-02T10:00:00+09:00",
+            "recent_reply_dates": [already, "2025-03-02T10:00:00+09:00"]
+        },
+        {"_id": ObjectId(), "date": "2025-01-01T09:00:00+09:00", "created_at": already, "last_reply_at": already},
+        {"_id": broken_oid, "date": "알 수 없음", "last_reply_at": "알 수 없음", "recent_reply_dates": []}
+    ])
+    db["comments"] = FakeCollection([
+        {"_id": comment_oid, "post_id": str(post_oid), "date": "2025-03-02T10:00:00+09:00"},
+        {"_id": ObjectId(), "post_id": str(broken_oid), "parent_comment_id": "root", "created_at": already}
+    ])
+
+    result = asyncio.run(migrate_dates(db))
+
+    assert result == {"board": 2, "comments": 1, "reply_counters": 2}
+    post, untouched, broken = db["board"].docs
+    assert post["created_at"] == datetime(2025, 3, 1, 0, 0)
+    assert post["last_reply_at"] == datetime(2025, 3, 2, 1, 0)
+    assert post["recent_reply_dates"] == [already, datetime(2025, 3, 2, 1, 0)]
+    assert untouched["created_at"] == already
+    # 해석할 수 없는 값: created_at은 _id 생성 시각, last_reply_at은 가장 최근 답글 시간
+    assert broken["created_at"] == broken_oid.generation_time.replace(tzinfo=None)
+    assert broken["date"] == "알 수 없음"
+    assert broken["last_reply_at"] == already
+    assert db["comments"].docs[0]["created_at"] == datetime(2025, 3, 2, 1, 0)
+
+    # 다시 실행해도 바뀌는 문서가 없음
+    assert asyncio.run(migrate_dates(db)) == {"board": 0, "comments": 0, "reply_counters": 0}
+
+def test_created_since_includes_unmigrated_dates_until_complete():
+    cutoff = datetime(2025, 3, 1, 0, 0)
+    assert created_since(cutoff)["$or"][1]["date"] == {"$gte": "2025-03-01T09:00:00+09:00"}
+    asyncio.run(migrate_dates(FakeDatabase()))
+    assert created_since(cutoff) == {"created_at": {"$gte": cutoff}}
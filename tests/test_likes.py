@@ -0,0 +1,71 @@
+# tests/test_likes.py
+import asyncio
+from bson import ObjectId
+from app.core.likes import dedupe_likes, liked_post_ids, toggle_like_record
+from tests.fakes import FakeCollection, FakeDatabase
+
+def make_db(likes=0):
+    post_oid = ObjectId()
+    db = FakeDatabase()
+    db["board"] = FakeCollection([{"_id": post_oid, "likes": likes}])
+    db["post_likes"] = FakeCollection(unique=("post_id", "identifier"))
+    return db, post_oid, str(post_oid)
+
+def test_toggle_like_and_unlike():
+    db, post_oid, post_id = make_db()
+
+    async def toggle_twice():
+        first = await toggle_like_record(db, post_oid, post_id, "user-1")
+        liked = db["board"].docs[0]["likes"], len(db["post_likes"].docs)
+        second = await toggle_like_record(db, post_oid, post_id, "user-1")
+        return first, liked, second
+
+    first, liked, second = asyncio.run(toggle_twice())
+    assert (first, liked) == ("liked", (1, 1))
+    assert second == "unliked"
+    assert db["board"].docs[0]["likes"] == 0
+    assert db["post_likes"].docs == []
+
+def test_duplicate_insert_does_not_double_count():
+    db, post_oid, post_id = make_db(likes=1)
+    # 동시에 들어온 다른 요청이 삭제 이후 먼저 기록한 상황
+    original_delete = db["post_likes"].delete_one
+
+    async def delete_then_race(query):
+        result = await original_delete(query)
+        db["post_likes"].docs.append({"_id": ObjectId(), "post_id": post_id, "identifier": "user-1"})
+        return result
+
+    db["post_likes"].delete_one = delete_then_race
+    assert asyncio.run(toggle_like_record(db, post_oid, post_id, "user-1")) == "liked"
+    assert db["board"].docs[0]["likes"] == 1
+    assert len(db["post_likes"].docs) == 1
+
+def test_unlike_never_goes_negative():
+    db, post_oid, post_id = make_db(likes=0)
+    db["post_likes"].docs.append({"_id": ObjectId(), "post_id": post_id, "identifier": "user-1"})
+    assert asyncio.run(toggle_like_record(db, post_oid, post_id, "user-1")) == "unliked"
+    assert db["board"].docs[0]["likes"] == 0
+
+def test_liked_post_ids():
+    db, _, post_id = make_db()
+    db["post_likes"].docs.append({"_id": ObjectId(), "post_id": post_id, "identifier": "user-1"})
+    assert asyncio.run(liked_post_ids(db, [post_id, "other"], "user-1")) == {post_id}
+    assert asyncio.run(liked_post_ids(db, [], "user-1")) == set()
+
+def test_dedupe_likes_removes_duplicates_and_recounts():
+    first_oid, second_oid = ObjectId(), ObjectId()
+    db = FakeDatabase()
+    db["board"] = FakeCollection([{"_id": first_oid, "likes": 5}, {"_id": second_oid, "likes": 3}])
+    db["post_likes"] = FakeCollection([
+        {"_id": ObjectId(), "post_id": str(first_oid), "identifier": "user-1"},
+        {"_id": ObjectId(), "post_id": str(first_oid), "identifier": "user-1"},
+        {"_id": ObjectId(), "post_id": str(first_oid), "identifier": "user-1"},
+        {"_id": ObjectId(), "post_id": str(first_oid), "identifier": "user-2"},
+    ])
+
+    assert asyncio.run(dedupe_likes(db)) == 2
+    assert sorted((like["post_id"], like["identifier"]) for like in db["post_likes"].docs) == [
+        (str(first_oid), "user-1"), (str(first_oid), "user-2")
+    ]
+    assert [post["likes"] for post in db["board"].docs] == [2, 0]
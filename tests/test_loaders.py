@@ -0,0 +1,107 @@
+# tests/test_loaders.py
+import asyncio
+from bson import ObjectId
+from app.core.loaders import DataLoader, RequestLoaders
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+class FakeCollection:
+    """find 호출 수를 세는 컬렉션 ($in / deleted / identifier 조건만 지원)"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.find_count = 0
+
+    def find(self, query, projection=None):
+        self.find_count += 1
+        matched = []
+        for document in self.documents:
+            if "deleted" in query and document.get("deleted"):
+                continue
+            if "identifier" in query and document.get("identifier") != query["identifier"]:
+                continue
+            key = "_id" if "_id" in query else "post_id"
+            if document.get(key) in query[key]["$in"]:
+                matched.append(document)
+        return FakeCursor(matched)
+
+class FakeDatabase(dict):
+    def __getitem__(self, name):
+        return self.setdefault(name, FakeCollection([]))
+
+def make_db(post_count=5):
+    posts = [{"_id": ObjectId(), "title": f"글 {index}"} for index in range(post_count)]
+    posts[-1]["deleted"] = True
+    db = FakeDatabase()
+    db["board"] = FakeCollection(posts)
+    db["post_likes"] = FakeCollection([{"post_id": str(posts[0]["_id"]), "identifier": "user-1"}])
+    return db, [str(post["_id"]) for post in posts]
+
+def test_loads_in_same_tick_share_one_query():
+    db, post_ids = make_db()
+
+    async def handler():
+        loaders = RequestLoaders(db)
+        posts = await asyncio.gather(*[loaders.posts.load(post_id) for post_id in post_ids])
+        again = await loaders.posts.load_many(post_ids[:2])
+        return loaders, posts, again
+
+    loaders, posts, again = asyncio.run(handler())
+    assert db["board"].find_count == 1
+    assert [post["title"] for post in posts[:-1]] == ["글 0", "글 1", "글 2", "글 3"]
+    assert posts[-1] is None  # 숨김 처리된 게시글
+    assert again == posts[:2]
+    assert loaders.stats()["posts"] == {"loads": 7, "queries": 1}
+
+def test_liked_by_batches_per_user():
+    db, post_ids = make_db()
+
+    async def handler():
+        loaders = RequestLoaders(db)
+        first = await loaders.liked_by("user-1").load_many(post_ids)
+        second = await loaders.liked_by("user-1").load_many(post_ids)
+        return first, second
+
+    first, second = asyncio.run(handler())
+    assert db["post_likes"].find_count == 1
+    assert first == second == [True, False, False, False, False]
+
+def test_primed_key_skips_query():
+    db, post_ids = make_db()
+
+    async def handler():
+        loaders = RequestLoaders(db)
+        loaders.posts.prime(post_ids[0], {"title": "캐시"})
+        return await loaders.posts.load(post_ids[0])
+
+    assert asyncio.run(handler()) == {"title": "캐시"}
+    assert db["board"].find_count == 0
+
+def test_failed_batch_is_retried():
+    calls = []
+
+    async def batch(keys):
+        calls.append(list(keys))
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+        return {key: key * 2 for key in keys}
+
+    async def handler():
+        loader = DataLoader(batch)
+        try:
+            await loader.load_many([1, 2])
+        except RuntimeError:
+            pass
+        return await loader.load_many([1, 2])
+
+    assert asyncio.run(handler()) == [2, 4]
+    assert calls == [[1, 2], [1, 2]]
@@ -0,0 +1,23 @@
+# tests/test_pagination.py
+import pytest
+from fastapi import HTTPException
+from app.utils.pagination import MAX_PAGE_SIZE, clamp_limit, decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    position = {"n": 1234, "d": "2025-03-01T09:00:00+09:00", "id": "65a1b2c3d4e5f60718293a4b", "t": "연구"}
+    cursor = encode_cursor(position)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor({"a": 1})[:-3] + "%%%", "WzEsMl0"])
+def test_invalid_cursor_is_400(cursor):
+    # 마지막 값은 dict가 아닌 JSON 배열([1,2])
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+def test_clamp_limit():
+    assert clamp_limit(None) == 50
+    assert clamp_limit(None, default=10) == 10
+    assert clamp_limit(0) == 1
+    assert clamp_limit(500) == MAX_PAGE_SIZE
@@ -0,0 +1,46 @@
+# tests/test_post_cache.py
+import asyncio
+from app.core.post_cache import PostCache
+
+def run_with_change(change):
+    """조회가 진행 중일 때 change(cache)를 호출하고 (반환값, 캐시 저장 여부)를 돌려줍니다."""
+    async def scenario():
+        cache = PostCache(max_entries=10, ttl_sec=60)
+        gate = asyncio.Event()
+
+        async def slow_loader():
+            await gate.wait()
+            return {"likes": 1}
+
+        task = asyncio.create_task(cache.get("post", slow_loader))
+        await asyncio.sleep(0)
+        change(cache)
+        gate.set()
+        return await task, "post" in cache._entries
+
+    return asyncio.run(scenario())
+
+def test_load_is_stored_without_changes():
+    assert run_with_change(lambda cache: None) == ({"likes": 1}, True)
+
+def test_adjust_during_load_drops_stale_result():
+    assert run_with_change(lambda cache: cache.adjust("post", "likes", 1)) == ({"likes": 1}, False)
+
+def test_invalidate_during_load_drops_stale_result():
+    assert run_with_change(lambda cache: cache.invalidate("post")) == ({"likes": 1}, False)
+
+def test_change_to_other_post_keeps_result():
+    assert run_with_change(lambda cache: cache.invalidate("other")) == ({"likes": 1}, True)
+
+def test_load_after_change_is_stored():
+    async def scenario():
+        cache = PostCache(max_entries=10, ttl_sec=60)
+        cache.invalidate("post")
+
+        async def loader():
+            return {"likes": 2}
+
+        await cache.get("post", loader)
+        return cache.metrics()["entries"]
+
+    assert asyncio.run(scenario()) == 1